@@ -1,11 +1,34 @@
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from vivia_v4.solver_profiles import SolverProfile
+
 
 class Settings(BaseSettings):
     admin_secret: str = "vivia-admin-secret"
     
     data_dir: str = "data"
     users_file: str = "users.json"
+
+    # Solver profiles: extra or overriding profiles on top of the built-in ones, the profile used
+    # when a request names none, and caps applied to every tenant unless their user record
+    # carries its own max_solve_time_in_seconds / max_solver_workers
+    solver_profiles: dict[str, SolverProfile] = {}
+    default_solver_profile: str = "interactive"
+    max_solve_time_in_seconds: float | None = 30.0
+    max_solver_workers: int | None = 8
+
+    # Solve result cache, stored under data_dir
+    solve_cache_dir: str = "solve_cache"
+    solve_cache_entries: int = 256
+    solve_cache_disk_entries: int = 4096
+
+    # Last solved schedule per user, stored under data_dir; /tasks/insert places new tasks into it
+    schedules_dir: str = "schedules"
+
+    # Compiled CP model cache, stored under data_dir; entries are larger, so fewer are kept
+    model_cache_dir: str = "model_cache"
+    model_cache_entries: int = 32
+    model_cache_disk_entries: int = 512
     
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8", extra="ignore")
 
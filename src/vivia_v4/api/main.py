@@ -5,8 +5,12 @@ from pydantic import BaseModel, Field
 
 from vivia_v4.templates import ALLTASKTEMPLATES, ScheduleInterval
 from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.insertion import StoredSchedule, insert_task
+from ortools.sat.python import cp_model
+from vivia_v4.solver_profiles import SOLVER_PROFILES, SolverProfile, get_solver_profile
+from vivia_v4.api.config import settings
 from vivia_v4.api.auth import router as auth_router, get_current_user
-from vivia_v4.api.manager import PoolManager
+from vivia_v4.api.manager import MODEL_CACHE, SOLVE_CACHE, PoolManager, ScheduleManager
 
 app = FastAPI(
     title="ViviaScheduler API",
@@ -22,16 +26,33 @@ def get_current_user_pool(user: dict = Depends(get_current_user)):
     user_id = user["user_id"]
     return PoolManager.load_pool(user_id)
 
+def resolve_solver_profile(name: str | None, user: dict) -> SolverProfile:
+    """The requested (or server default) profile, capped by the tenant's limits"""
+    try:
+        profile = get_solver_profile(name or settings.default_solver_profile, settings.solver_profiles)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return profile.capped(
+        max_time_in_seconds=user.get("max_solve_time_in_seconds", settings.max_solve_time_in_seconds),
+        max_workers=user.get("max_solver_workers", settings.max_solver_workers),
+    )
+
 # --- Models ---
 
 class SolveRequest(BaseModel):
     start: DT.datetime
     end: DT.datetime
+    explain: bool = Field(default=False, description="Name the conflicting mandatory tasks if infeasible")
+    profile: str | None = Field(default=None, description="Solver profile name, e.g. interactive, batch, deterministic")
 
 class SolveResponse(BaseModel):
     status: str
     intervals: dict[str, list[ScheduleInterval]]  # task_id -> intervals
 
+class InsertResponse(BaseModel):
+    method: str  # greedy or local_solve
+    intervals: dict[str, list[ScheduleInterval]]  # task_id -> intervals, only tasks that were (re)placed
+
 # --- Endpoints ---
 
 @app.post("/tasks/create", tags=["Tasks"])
@@ -68,6 +89,41 @@ async def create_tasks_batch(
     PoolManager.save_pool(user_id, pool)
     return {"message": f"{len(tasks)} tasks added successfully"}
 
+@app.post("/tasks/insert", tags=["Tasks"], response_model=InsertResponse)
+async def insert_task_into_schedule(
+    task: ALLTASKTEMPLATES,
+    user: dict = Depends(get_current_user)
+):
+    """
+    Add a single task to the user's pool and place it into the last solved schedule, without a
+    full solve: into free gaps when it fits, else by re-solving only the task's neighbourhood.
+    """
+    user_id = user["user_id"]
+    stored = ScheduleManager.load_schedule(user_id)
+    if stored is None:
+        raise HTTPException(status_code=409, detail="No solved schedule yet, call /scheduler/solve first")
+    pool = PoolManager.load_pool(user_id)
+    pool.add_task(task)
+
+    result = insert_task(pool, task, stored, solver_profile=resolve_solver_profile(None, user))
+    if result.schedule is None:
+        raise HTTPException(status_code=409, detail={
+            "message": "The task does not fit into the current schedule, a full solve is needed",
+            "task_id": str(task.id),
+        })
+    # Pool and schedule are stored together, so a rejected task leaves neither changed
+    PoolManager.save_pool(user_id, pool)
+    ScheduleManager.save_schedule(user_id, result.schedule)
+    return InsertResponse(method=result.method, intervals=result.intervals)
+
+@app.get("/scheduler/profiles", tags=["Scheduler"])
+async def list_solver_profiles(user: dict = Depends(get_current_user)):
+    """
+    List the solver profiles a solve request can name, as capped for the current user.
+    """
+    names = {**SOLVER_PROFILES, **settings.solver_profiles}
+    return {name: resolve_solver_profile(name, user) for name in names}
+
 @app.post("/scheduler/solve", tags=["Scheduler"], response_model=SolveResponse)
 async def solve_schedule(
     request: SolveRequest,
@@ -84,29 +140,50 @@ async def solve_schedule(
 
     scheduler = ViviaScheduler(
         task_pool=pool,
-        schedule_range=(request.start, request.end)
+        schedule_range=(request.start, request.end),
+        explain=request.explain,
+        solver_profile=resolve_solver_profile(request.profile, user),
+        result_cache=SOLVE_CACHE,
+        model_cache=MODEL_CACHE,
     )
     
     try:
         scheduler.build_model()
+        conflict = scheduler.overload_conflict
+        if conflict is not None:
+            raise HTTPException(status_code=422, detail={
+                "message": "Mandatory tasks do not fit into their window",
+                "conflict": conflict.model_dump(mode="json"),
+            })
         # Capture output or check status (scheduler.solve prints to stdout currently)
         # We need to adapt scheduler.solve to return status or inspect context after solve
         # Since scheduler.solve() prints, we trust it modifies the intervals in-place
         
         # We can modify scheduler.py later to return status, but for now we run it
         # and check context
-        scheduler.solve()
+        status = scheduler.solve()
+        if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            ScheduleManager.save_schedule(user_id, StoredSchedule(
+                schedule_range=scheduler.schedule_range, unit_length=scheduler.unit_length,
+                assignment=scheduler._current_assignment()))
+        if scheduler.explanation is not None:
+            raise HTTPException(status_code=422, detail={
+                "message": "Mandatory tasks conflict with each other",
+                "explanation": scheduler.explanation.model_dump(mode="json"),
+            })
         
         # Check if we have results (mapped to actual intervals)
         # We will group by task ID for the response
         result = {}
-        for task_id, intervals in scheduler._ctx._interval_map.items():
+        for task_id, intervals in scheduler.interval_map.items():
             # Only include intervals that are assigned (presence=1) or meaningful
             # For now, we return all, as interprete_cp_model_vars handles setting them
             result[str(task_id)] = intervals
             
         return SolveResponse(status="Solved", intervals=result)
         
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
@@ -2,12 +2,27 @@ import json
 import os
 import uuid
 from vivia_v4.task_pool import ViviaTaskPool
+from vivia_v4.solve_cache import SolveCache
+from vivia_v4.model_cache import ModelCache
+from vivia_v4.insertion import StoredSchedule
 from vivia_v4.api.config import settings
 
 def ensure_data_dir():
     if not os.path.exists(settings.data_dir):
         os.makedirs(settings.data_dir)
 
+# Shared by all requests; PoolManager.save_pool drops a pool's entries of both whenever it changes
+SOLVE_CACHE = SolveCache(
+    directory=os.path.join(settings.data_dir, settings.solve_cache_dir),
+    max_entries=settings.solve_cache_entries,
+    max_disk_entries=settings.solve_cache_disk_entries,
+)
+MODEL_CACHE = ModelCache(
+    directory=os.path.join(settings.data_dir, settings.model_cache_dir),
+    max_entries=settings.model_cache_entries,
+    max_disk_entries=settings.model_cache_disk_entries,
+)
+
 class PoolManager:
     """
     Manages loading and saving ViviaTaskPool instances for users.
@@ -40,6 +55,33 @@ class PoolManager:
         filename = PoolManager.get_pool_filename(user_id)
         with open(filename, 'w', encoding='utf-8') as f:
             f.write(pool.model_dump_json(indent=2))
+        SOLVE_CACHE.invalidate(pool.id)
+        MODEL_CACHE.invalidate(pool.id)
+
+class ScheduleManager:
+    """
+    Keeps the last solved schedule of each user in a {user_id}.json file under schedules_dir.
+    """
+
+    @staticmethod
+    def get_schedule_filename(user_id: str) -> str:
+        directory = os.path.join(settings.data_dir, settings.schedules_dir)
+        os.makedirs(directory, exist_ok=True)
+        return os.path.join(directory, f"{user_id}.json")
+
+    @staticmethod
+    def load_schedule(user_id: str) -> StoredSchedule | None:
+        filename = ScheduleManager.get_schedule_filename(user_id)
+        if not os.path.exists(filename):
+            return None
+        with open(filename, 'r', encoding='utf-8') as f:
+            return StoredSchedule.model_validate_json(f.read())
+
+    @staticmethod
+    def save_schedule(user_id: str, schedule: StoredSchedule) -> None:
+        filename = ScheduleManager.get_schedule_filename(user_id)
+        with open(filename, 'w', encoding='utf-8') as f:
+            f.write(schedule.model_dump_json())
 
 class UserManager:
     """
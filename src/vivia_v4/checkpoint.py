@@ -0,0 +1,116 @@
+import os
+import threading
+import time
+from collections.abc import Sequence
+
+from ortools.sat.python import cp_model
+from pydantic import BaseModel, Field
+
+
+class Checkpoint(BaseModel):
+    """
+    The best incumbent of an interrupted or running solve, in the same compact form as cached
+    results: interval key -> (start, end) in scheduler units, None for absent intervals.
+    """
+    model_key: str = Field(
+        description="Model hash of the scheduler that wrote it; other models ignore it")
+    objective: float | None = None
+    assignment: dict[str, tuple[int, int] | None] = Field(default_factory=dict)
+
+
+def load_checkpoint(path: str, model_key: str) -> Checkpoint | None:
+    """The checkpoint at path if it was written for the same model, else None"""
+    try:
+        with open(path, encoding='utf-8') as f:
+            checkpoint = Checkpoint.model_validate_json(f.read())
+    except (OSError, ValueError):
+        return None
+    return checkpoint if checkpoint.model_key == model_key else None
+
+
+class CheckpointWriter:
+    """
+    Records improving solutions from a solution callback and persists the latest one at most every
+    interval_seconds. The first incumbent is written at once; a later one arriving too soon is
+    written by a timer when the interval is up, so a stagnant search still reaches disk. Recording
+    only copies the raw solution values; the assignment is decoded when a checkpoint is written,
+    and close() writes whatever is still pending once the search ends.
+    """
+
+    def __init__(self, path: str, model_key: str, variables: dict[str, tuple[int, int, int]],
+                 interval_seconds: float = 30.0) -> None:
+        self.path = path
+        self.model_key = model_key
+        self.variables = variables
+        self.interval_seconds = interval_seconds
+        self.write_count = 0
+        self._pending: tuple[list[int], float | None] | None = None
+        self._last_write = float("-inf")
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        # Held for a whole write, so a newer checkpoint is never overwritten by an older one
+        self._write_lock = threading.Lock()
+
+    def record(self, solution: Sequence[int], objective: float | None) -> None:
+        with self._lock:
+            self._pending = (list(solution), objective)
+            wait = self._last_write + self.interval_seconds - time.monotonic()
+            if wait > 0 and self._timer is None:
+                self._timer = threading.Timer(wait, self.flush)
+                self._timer.daemon = True
+                self._timer.start()
+        if wait <= 0:
+            self.flush()
+
+    def close(self) -> None:
+        """Stops the pending timer and writes the last recorded solution"""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        self.flush()
+
+    def flush(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                self._timer = None
+                pending, self._pending = self._pending, None
+                if pending is None:
+                    return
+                self._last_write = time.monotonic()
+            self._write(pending)
+
+    def _write(self, pending: tuple[list[int], float | None]) -> None:
+        values, objective = pending
+        assignment: dict[str, tuple[int, int] | None] = {}
+        for key, (start, end, presence) in self.variables.items():
+            assignment[key] = (values[start], values[end]) if values[presence] else None
+        checkpoint = Checkpoint(model_key=self.model_key, objective=objective,
+                                assignment=assignment)
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        # Write next to the target and rename, so a crash never leaves a truncated checkpoint
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(checkpoint.model_dump_json())
+        os.replace(tmp_path, self.path)
+        self.write_count += 1
+
+
+def add_checkpoint_hints(
+    model: cp_model.CpModel, checkpoint: Checkpoint,
+    variables: dict[str, tuple[cp_model.IntVar, cp_model.IntVar, cp_model.IntVar]],
+) -> int:
+    """Hints every variable the checkpoint covers; returns how many intervals were hinted"""
+    hinted = 0
+    for key, (start, end, presence) in variables.items():
+        if key not in checkpoint.assignment:
+            continue
+        units = checkpoint.assignment[key]
+        model.AddHint(presence, units is not None)
+        if units is not None:
+            model.AddHint(start, units[0])
+            model.AddHint(end, units[1])
+        hinted += 1
+    return hinted
@@ -1,16 +1,42 @@
+import datetime as DT
 from abc import ABC, abstractmethod
-from typing import Annotated, Literal, TYPE_CHECKING
-from pydantic import BaseModel, Field, model_validator
+from collections.abc import Sequence
+from math import ceil
+from typing import Annotated, Any, Literal, TYPE_CHECKING
+from pydantic import AwareDatetime, BaseModel, Field, model_validator
 from ortools.sat.python import cp_model
 
+from vivia_v4.model_definitions import TimeDelta
+from vivia_v4.utils import Period
+
 if TYPE_CHECKING:
     from vivia_v4.scheduling_context import SchedulingContext
+    from vivia_v4.templates import ScheduleInterval
 
 class BaseConstraint(BaseModel, ABC):
+    @abstractmethod
+    def get_target_intervals(self, ctx: "SchedulingContext") -> list["ScheduleInterval"]:
+        pass
+
     @abstractmethod
     def apply(self, ctx: "SchedulingContext"):
         pass
 
+
+def collect_target_intervals(ctx: "SchedulingContext", group_name: str | None,
+                             label: str | None) -> list["ScheduleInterval"]:
+    """Resolves the intervals addressed by a group name and/or a label, without duplicates"""
+    intervals = []
+    if group_name:
+        intervals.extend(ctx.get_intervals_by_group_name(group_name))
+    if label:
+        intervals.extend(ctx.get_intervals_by_label(label))
+
+    # Deduplicate if both group and label provided overlapping results
+    if group_name and label:
+        intervals = list({i.id: i for i in intervals}.values())
+    return intervals
+
 class NoOverlapConstraint(BaseConstraint):
     constraint_type: Literal["no_overlap"] = Field(default="no_overlap", frozen=True)
     group_name: str | None = None
@@ -22,22 +48,354 @@ class NoOverlapConstraint(BaseConstraint):
             raise ValueError("Either group_name or label must be provided")
         return self
     
+    def get_target_intervals(self, ctx: "SchedulingContext") -> list["ScheduleInterval"]:
+        return collect_target_intervals(ctx, self.group_name, self.label)
+
     def apply(self, ctx: "SchedulingContext"):
-        intervals = []
-        if self.group_name:
-            intervals.extend(ctx.get_intervals_by_group_name(self.group_name))
-        if self.label:
-            intervals.extend(ctx.get_intervals_by_label(self.label))
-            
-        # Deduplicate if both group and label provided overlapping results
-        if self.group_name and self.label:
-            intervals = list({i.id: i for i in intervals}.values())
-            
+        intervals = self.get_target_intervals(ctx)
         cp_intervals = [i._cp_model_vars.interval for i in intervals if i._cp_model_vars.interval]
         if cp_intervals:
+            # Pinned intervals only matter next to intervals that can still move
+            cp_intervals.extend(ctx.pinned_interval(i) for i in ctx.pinned_targets(intervals))
             ctx.model.AddNoOverlap(cp_intervals)
 
-ALL_CONSTRAINTS = Annotated[NoOverlapConstraint, Field(discriminator='constraint_type')]
+class TransitionTime(BaseModel):
+    """Extra rest time required when an interval labelled from_label is followed by one labelled to_label"""
+    from_label: str
+    to_label: str
+    gap: TimeDelta
+
+
+class GapNoOverlapConstraint(BaseConstraint):
+    """
+    No-overlap with a minimum gap between consecutive intervals of the target.
+
+    The uniform min_gap is encoded by stretching every interval by the gap and posting a single
+    AddNoOverlap over the stretched intervals, so the model stays linear in the number of intervals.
+    A transition from a label to itself is encoded the same way, over that label's intervals.
+    Transitions between two different labels fall back to pairwise disjunctions, emitted only for
+    pairs of those labels whose variable domains allow them to come closer than the transition.
+    Transitions are enforced between any two ordered intervals, not only direct neighbours: an
+    interval of a third label in between does not lift the gap. The disjunctions are capped at
+    max_transition_pairs, as wide windows can let most pairs meet.
+    Pinned intervals take part as constants wherever they meet an interval that can move.
+    """
+    constraint_type: Literal["gap_no_overlap"] = Field(default="gap_no_overlap", frozen=True)
+    group_name: str | None = None
+    label: str | None = None
+    min_gap: TimeDelta = Field(description="Minimum rest time between consecutive intervals", default=DT.timedelta(0))
+    transitions: list[TransitionTime] = Field(description="Label-pair dependent transition times", default_factory=list)
+    max_transition_pairs: int = Field(
+        description="Most interval pairs that may get a transition disjunction", default=10_000, ge=0)
+
+    @model_validator(mode='after')
+    def validate_target(self):
+        if self.group_name is None and self.label is None:
+            raise ValueError("Either group_name or label must be provided")
+        if self.min_gap < DT.timedelta(0) or any(t.gap < DT.timedelta(0) for t in self.transitions):
+            raise ValueError("Gaps can not be negative")
+        return self
+
+    def get_target_intervals(self, ctx: "SchedulingContext") -> list["ScheduleInterval"]:
+        return collect_target_intervals(ctx, self.group_name, self.label)
+
+    def transition_gap(self, before: "ScheduleInterval", after: "ScheduleInterval") -> DT.timedelta:
+        """The rest time required when `after` follows `before`"""
+        gap = self.min_gap
+        for t in self.transitions:
+            if t.from_label in before.labels and t.to_label in after.labels:
+                gap = max(gap, t.gap)
+        return gap
+
+    def apply(self, ctx: "SchedulingContext"):
+        targets = self.get_target_intervals(ctx)
+        intervals = [i for i in targets if i._cp_model_vars.interval is not None]
+        if not intervals:
+            return
+        pinned = ctx.pinned_targets(targets)
+        gap_units = ctx.to_units(self.min_gap)
+        self._add_stretched_no_overlap(ctx, intervals, pinned, gap_units)
+        if self.transitions:
+            self._apply_transitions(ctx, intervals, pinned, gap_units)
+
+    @staticmethod
+    def _add_stretched_no_overlap(ctx: "SchedulingContext", intervals: list["ScheduleInterval"],
+                                  pinned: list["ScheduleInterval"], gap_units: int):
+        """One AddNoOverlap over the intervals stretched by gap_units, which keeps every two of them gap_units apart"""
+        if not intervals:
+            return
+        stretched = [ctx.pinned_interval(i, gap_units) for i in pinned]
+        for i in intervals:
+            iv = i._cp_model_vars.interval
+            if gap_units == 0:
+                stretched.append(iv)
+                continue
+            stretched.append(ctx.model.NewOptionalIntervalVar(
+                iv.StartExpr(), iv.SizeExpr() + gap_units, iv.EndExpr() + gap_units,
+                i._cp_model_vars.presence, ctx.var_name(i.name, "_gap_interval_var")
+            ))
+        if len(stretched) > 1:
+            ctx.model.AddNoOverlap(stretched)
+
+    def _apply_transitions(self, ctx: "SchedulingContext", intervals: list["ScheduleInterval"],
+                           pinned: list["ScheduleInterval"], gap_units: int):
+        # A same-label transition is symmetric, so it is one more stretched no-overlap over that label
+        same_label: dict[str, int] = {}
+        for t in self.transitions:
+            if t.from_label == t.to_label and ctx.to_units(t.gap) > gap_units:
+                same_label[t.from_label] = max(same_label.get(t.from_label, 0), ctx.to_units(t.gap))
+        for label, units in same_label.items():
+            self._add_stretched_no_overlap(ctx, [i for i in intervals if label in i.labels],
+                                           [i for i in pinned if label in i.labels], units)
+        cross = [t for t in self.transitions if t.from_label != t.to_label and ctx.to_units(t.gap) > gap_units]
+        if not cross:
+            return
+
+        def covered(a: "ScheduleInterval", c: "ScheduleInterval") -> int:
+            """The gap the stretched no-overlaps already keep between a and c, in both orders"""
+            return max([gap_units] + [units for label, units in same_label.items() if label in a.labels and label in c.labels])
+
+        def in_cross(i: "ScheduleInterval") -> bool:
+            return any(t.from_label in i.labels or t.to_label in i.labels for t in cross)
+
+        # (interval, start lb, start ub, end lb, end ub, start, end, presences); pinned ones are constants
+        bounds = []
+        for i in intervals:
+            if in_cross(i):
+                cp_vars = i._cp_model_vars
+                bounds.append((i, *ctx.var_bounds(cp_vars.start), *ctx.var_bounds(cp_vars.end),
+                               cp_vars.start, cp_vars.end, [cp_vars.presence]))
+        if not bounds:
+            return
+        for i in pinned:
+            if in_cross(i):
+                start, end = ctx.pinned[i.id]
+                bounds.append((i, start, start, end, end, start, end, []))
+        labelled = sorted(bounds, key=lambda b: b[1])
+        reach = max(ctx.to_units(t.gap) for t in cross)
+
+        def can_violate(before: tuple, after: tuple, gap: int) -> bool:
+            """Whether `after` can start at or after `before` ends, yet less than gap units later"""
+            return after[2] >= before[3] and after[1] < before[4] + gap
+
+        # Sweep by earliest start: once a later interval starts after a's latest start and end plus
+        # the longest transition, neither it nor anything after it can come too close to a
+        pairs = []
+        for k, a_b in enumerate(labelled):
+            a = a_b[0]
+            a_hi = max(a_b[2], a_b[4])
+            for c_b in labelled[k + 1:]:
+                if c_b[1] >= a_hi + reach:
+                    break
+                c = c_b[0]
+                if not a_b[7] and not c_b[7]:
+                    continue
+                done = covered(a, c)
+                ac = max(done, ctx.to_units(self.transition_gap(a, c)))
+                ca = max(done, ctx.to_units(self.transition_gap(c, a)))
+                if (ac > done and can_violate(a_b, c_b, ac)) or (ca > done and can_violate(c_b, a_b, ca)):
+                    pairs.append((a_b, c_b, ac, ca))
+        if len(pairs) > self.max_transition_pairs:
+            raise ValueError(f"Transitions of {self.group_name or self.label} need {len(pairs)} pairwise "
+                             f"disjunctions, more than max_transition_pairs={self.max_transition_pairs}")
+        for a_b, c_b, ac, ca in pairs:
+            both = a_b[7] + c_b[7]
+            a_first = ctx.model.NewBoolVar(ctx.var_name(a_b[0].name, "_before_", c_b[0].name))
+            ctx.model.Add(c_b[5] >= a_b[6] + ac).OnlyEnforceIf([a_first, *both])
+            ctx.model.Add(a_b[5] >= c_b[6] + ca).OnlyEnforceIf([a_first.Not(), *both])
+
+
+class PeriodCapConstraint(BaseConstraint):
+    """
+    Caps how many target intervals (max_count) and how much of their duration (max_duration)
+    fall into each period, e.g. at most 2 workouts per day or 8 hours of work per week.
+
+    An interval belongs to the period in which it starts. Intervals are bucketed once by the
+    periods their start window can touch, so each period gets one linear constraint over the
+    few intervals that can land in it. Intervals whose start window spans several periods get
+    one literal per touched period, exactly one of which is true when the interval is present.
+    Pinned intervals lower the caps of the periods they start in.
+    """
+    constraint_type: Literal["period_cap"] = Field(default="period_cap", frozen=True)
+    group_name: str | None = None
+    label: str | None = None
+    anchor_date: AwareDatetime = Field(description="The start of any one period")
+    period_length: TimeDelta = Field(description="The length of a period")
+    max_count: int | None = Field(description="Maximum number of intervals per period", default=None, ge=0)
+    max_duration: TimeDelta | None = Field(description="Maximum total duration per period", default=None)
+
+    @model_validator(mode='after')
+    def validate_target(self):
+        if self.group_name is None and self.label is None:
+            raise ValueError("Either group_name or label must be provided")
+        if self.max_count is None and self.max_duration is None:
+            raise ValueError("Either max_count or max_duration must be provided")
+        if self.period_length <= DT.timedelta(0):
+            raise ValueError("period_length must be positive")
+        return self
+
+    def get_target_intervals(self, ctx: "SchedulingContext") -> list["ScheduleInterval"]:
+        return collect_target_intervals(ctx, self.group_name, self.label)
+
+    def bucket_intervals(self, ctx: "SchedulingContext",
+                         intervals: list["ScheduleInterval"]) -> dict[DT.datetime, list[tuple["ScheduleInterval", Any]]]:
+        """Maps each period start to (interval, literal) pairs, the literal being true iff the interval starts there"""
+        period = Period(self.anchor_date, self.period_length)
+        schedule_start = ctx.schedule_range[0]
+        buckets: dict[DT.datetime, list[tuple["ScheduleInterval", Any]]] = {}
+        for i in intervals:
+            cp_vars = i._cp_model_vars
+            # The periods the start variable can take, not its raw window, which may be finer than a unit
+            start_lb, start_ub = ctx.var_bounds(cp_vars.start)
+            first, _ = period.get_period(schedule_start + start_lb * ctx.unit_length)
+            last, _ = period.get_period(schedule_start + start_ub * ctx.unit_length)
+            if first == last:
+                buckets.setdefault(first, []).append((i, cp_vars.presence))
+                continue
+            literals = []
+            p_start = first
+            while p_start <= last:
+                p_end = p_start + self.period_length
+                lo = max(start_lb, ceil((p_start - schedule_start) / ctx.unit_length))
+                hi = min(start_ub, ceil((p_end - schedule_start) / ctx.unit_length) - 1)
+                if lo <= hi:
+                    lit = ctx.model.NewBoolVar(ctx.var_name(i.name, "_in_period_", p_start))
+                    ctx.model.Add(cp_vars.start >= lo).OnlyEnforceIf(lit)
+                    ctx.model.Add(cp_vars.start <= hi).OnlyEnforceIf(lit)
+                    literals.append(lit)
+                    buckets.setdefault(p_start, []).append((i, lit))
+                p_start = p_end
+            ctx.model.Add(cp_model.LinearExpr.Sum(literals) == cp_vars.presence)
+        return buckets
+
+    def pinned_load(self, ctx: "SchedulingContext",
+                    intervals: list["ScheduleInterval"]) -> dict[DT.datetime, tuple[int, int]]:
+        """Maps each period start to the count and units of the pinned intervals starting in it"""
+        period = Period(self.anchor_date, self.period_length)
+        load: dict[DT.datetime, tuple[int, int]] = {}
+        for i in ctx.pinned_targets(intervals):
+            start, end = ctx.pinned[i.id]
+            p_start, _ = period.get_period(ctx.schedule_range[0] + start * ctx.unit_length)
+            count, units = load.get(p_start, (0, 0))
+            load[p_start] = (count + 1, units + end - start)
+        return load
+
+    def apply(self, ctx: "SchedulingContext"):
+        targets = self.get_target_intervals(ctx)
+        intervals = [i for i in targets if i._cp_model_vars.interval is not None]
+        if not intervals:
+            return
+        pinned_load = self.pinned_load(ctx, targets)
+        max_units = None if self.max_duration is None else self.max_duration // ctx.unit_length
+        for p_start, members in self.bucket_intervals(ctx, intervals).items():
+            pinned_count, pinned_units = pinned_load.get(p_start, (0, 0))
+            literals = [lit for _, lit in members]
+            if self.max_count is not None and len(literals) > self.max_count - pinned_count:
+                ctx.model.Add(cp_model.LinearExpr.Sum(literals) <= self.max_count - pinned_count)
+            if max_units is None:
+                continue
+            sizes = [ctx.var_bounds(i._cp_model_vars.interval.SizeExpr()) for i, _ in members]
+            if sum(size_ub for _, size_ub in sizes) <= max_units - pinned_units:
+                continue
+            terms, coeffs = [], []
+            for (i, lit), (size_lb, size_ub) in zip(members, sizes):
+                if size_lb == size_ub:
+                    terms.append(lit)
+                    coeffs.append(size_ub)
+                    continue
+                # duration counted in this period: equals the size when the literal holds, else 0
+                counted = ctx.model.NewIntVar(0, size_ub, ctx.var_name(i.name, "_duration_in_period_", p_start))
+                ctx.model.Add(counted == i._cp_model_vars.interval.SizeExpr()).OnlyEnforceIf(lit)
+                ctx.model.Add(counted == 0).OnlyEnforceIf(lit.Not())
+                terms.append(counted)
+                coeffs.append(1)
+            ctx.model.Add(cp_model.LinearExpr.WeightedSum(terms, coeffs) <= max_units - pinned_units)
+
+
+ALL_CONSTRAINTS = Annotated[NoOverlapConstraint | GapNoOverlapConstraint | PeriodCapConstraint,
+                            Field(discriminator='constraint_type')]
+
+class RemovedConstraint(BaseModel):
+    constraint: ALL_CONSTRAINTS
+    reason: Literal["trivial", "duplicate", "subsumed"]
+    interval_count: int = Field(description="How many intervals the constraint targeted")
+
+
+class ConstraintNormalizationReport(BaseModel):
+    removed: list[RemovedConstraint] = Field(default_factory=list)
+
+    @property
+    def removed_count(self) -> int:
+        return len(self.removed)
+
+
+def _implies_no_overlap(stronger: BaseConstraint, weaker: BaseConstraint) -> bool:
+    """Whether stronger, posted on a superset of weaker's intervals, already enforces weaker"""
+    if isinstance(weaker, NoOverlapConstraint):
+        return isinstance(stronger, (NoOverlapConstraint, GapNoOverlapConstraint))
+    if isinstance(weaker, GapNoOverlapConstraint) and isinstance(stronger, GapNoOverlapConstraint):
+        return stronger.min_gap >= weaker.min_gap and stronger.transitions == weaker.transitions
+    return False
+
+
+def normalize_constraints(
+    ctx: "SchedulingContext", constraints: Sequence[BaseConstraint]
+) -> tuple[list[BaseConstraint], ConstraintNormalizationReport]:
+    """
+    Drops constraints that would not change the model: constraints without an interval that can
+    move, no-overlaps over fewer than two intervals, constraints identical to an earlier one on
+    the same intervals, and no-overlaps whose intervals are a subset of another no-overlap that is
+    at least as strict. Runs on resolved interval sets, so a group and a label covering the same
+    intervals are recognised as duplicates.
+    """
+    report = ConstraintNormalizationReport()
+    targets: dict[int, frozenset] = {}
+    movable: set[int] = set()
+    for c in constraints:
+        intervals = c.get_target_intervals(ctx)
+        free = [i.id for i in intervals if i._cp_model_vars.interval is not None]
+        if free:
+            movable.add(id(c))
+        targets[id(c)] = frozenset(free + [i.id for i in ctx.pinned_targets(intervals)])
+
+    def remove(c: BaseConstraint, reason: str) -> None:
+        report.removed.append(RemovedConstraint(constraint=c, reason=reason, interval_count=len(targets[id(c)])))
+
+    kept: list[BaseConstraint] = []
+    seen: set = set()
+    for c in constraints:
+        ids = targets[id(c)]
+        disjunctive = isinstance(c, (NoOverlapConstraint, GapNoOverlapConstraint))
+        if id(c) not in movable or (disjunctive and len(ids) < 2):
+            remove(c, "trivial")
+            continue
+        key = (ids, c.model_dump_json(exclude={"group_name", "label"}))
+        if key in seen:
+            remove(c, "duplicate")
+            continue
+        seen.add(key)
+        kept.append(c)
+
+    # Largest interval sets first, and the strictest constraint first among equal sets, so every
+    # constraint is checked against all of its potential subsumers
+    def strictness(c: BaseConstraint) -> tuple:
+        gap = c.min_gap if isinstance(c, GapNoOverlapConstraint) else DT.timedelta(-1)
+        return (len(targets[id(c)]), gap)
+    disjunctive_kept = sorted(
+        (c for c in kept if isinstance(c, (NoOverlapConstraint, GapNoOverlapConstraint))),
+        key=strictness, reverse=True,
+    )
+    subsumed: set[int] = set()
+    survivors: list[BaseConstraint] = []
+    for c in disjunctive_kept:
+        ids = targets[id(c)]
+        if any(ids <= targets[id(o)] and _implies_no_overlap(o, c) for o in survivors):
+            subsumed.add(id(c))
+            remove(c, "subsumed")
+        else:
+            survivors.append(c)
+    return [c for c in kept if id(c) not in subsumed], report
+
 
 class constraint(BaseModel, ABC):
     @abstractmethod
@@ -0,0 +1,141 @@
+import uuid
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+from ortools.sat.python import cp_model
+from pydantic import AwareDatetime, BaseModel, Field
+
+from vivia_v4.constraints import BaseConstraint, GapNoOverlapConstraint, NoOverlapConstraint
+from vivia_v4.model_definitions import TimeDelta
+
+if TYPE_CHECKING:
+    from vivia_v4.scheduling_context import SchedulingContext
+    from vivia_v4.templates import ScheduleInterval
+
+
+class OverloadConflict(BaseModel):
+    """A window that must hold more mandatory work than it is long"""
+    group_name: str | None = None
+    label: str | None = None
+    window: tuple[AwareDatetime, AwareDatetime]
+    interval_ids: list[uuid.UUID] = Field(description="The mandatory intervals forced inside the window")
+    interval_names: list[str]
+    required: TimeDelta = Field(description="Minimum work (and gaps) the intervals need inside the window")
+    available: TimeDelta = Field(description="The length of the window")
+
+
+def _overloaded_window(starts: np.ndarray, ends: np.ndarray, durations: np.ndarray,
+                       gap: int) -> tuple[int, int, np.ndarray] | None:
+    """
+    Energetic check of one disjunctive resource, all values in units. For every candidate window
+    [a, b], with a an earliest start and b a latest end, the intervals that must lie entirely
+    inside it need at least the sum of their minimum durations (plus a gap between each two of
+    them). Returns (a, b, member mask) of the first window where that exceeds b - a.
+    """
+    order = np.argsort(ends, kind="stable")
+    starts, ends, durations = starts[order], ends[order], durations[order]
+    # Suffix sums over the intervals sorted by earliest start give, for each a, the total load
+    # and count of all intervals starting at or after a. A window can only be overloaded if it
+    # is shorter than that, which bounds the latest ends worth scanning for each a.
+    by_start = np.sort(starts)
+    suffix_load = np.cumsum(durations[np.argsort(starts, kind="stable")][::-1])[::-1]
+    for a in np.unique(starts):
+        k = np.searchsorted(by_start, a, side="left")
+        bound = a + suffix_load[k] + gap * (len(by_start) - k - 1)
+        lo = np.searchsorted(ends, a, side="left")
+        hi = np.searchsorted(ends, bound, side="left")
+        inside = starts[lo:hi] >= a
+        load = np.cumsum(np.where(inside, durations[lo:hi], 0))
+        count = np.cumsum(inside)
+        required = load + gap * np.maximum(count - 1, 0)
+        violated = np.flatnonzero(inside & (required > ends[lo:hi] - a))
+        if violated.size:
+            j = lo + violated[0]
+            members = np.zeros(len(order), dtype=bool)
+            members[order[lo: j + 1][inside[: j + 1 - lo]]] = True
+            return int(a), int(ends[j]), members
+    return None
+
+
+def find_mandatory_overload(ctx: "SchedulingContext",
+                            constraints: Sequence[BaseConstraint]) -> OverloadConflict | None:
+    """
+    Cheap pre-solve screening: runs the energetic check on the mandatory intervals of every
+    no-overlap constraint, using the same discretization as the CP model, and returns the first
+    overloaded window found. A conflict proves the model infeasible; None proves nothing. Pinned
+    intervals are left out, so a repair only screens the intervals it may move.
+    """
+    schedule_start = ctx.schedule_range[0]
+    unit = ctx.unit_length
+    for c in constraints:
+        if not isinstance(c, (NoOverlapConstraint, GapNoOverlapConstraint)):
+            continue
+        mandatory = [i for i in c.get_target_intervals(ctx) if i.mandatory and i.id not in ctx.pinned]
+        if not mandatory:
+            continue
+        bounds = np.array([ctx.unit_bounds(i) for i in mandatory], dtype=np.int64).reshape(-1, 6)
+        starts, ends, durations = bounds[:, 0], bounds[:, 3], bounds[:, 4]
+        gap = ctx.to_units(c.min_gap) if isinstance(c, GapNoOverlapConstraint) else 0
+        found = _overloaded_window(starts, ends, durations, gap)
+        if found is None:
+            continue
+        a, b, members = found
+        culprits = [i for i, m in zip(mandatory, members) if m]
+        required = int(durations[members].sum()) + gap * (len(culprits) - 1)
+        return OverloadConflict(
+            group_name=c.group_name,
+            label=c.label,
+            window=(schedule_start + a * unit, schedule_start + b * unit),
+            interval_ids=[i.id for i in culprits],
+            interval_names=[i.name for i in culprits],
+            required=required * unit,
+            available=max(b - a, 0) * unit,
+        )
+    return None
+
+
+class ConflictEntry(BaseModel):
+    interval_id: uuid.UUID
+    interval_name: str
+    task_id: uuid.UUID | None = None
+    task_name: str | None = None
+
+
+class InfeasibilityExplanation(BaseModel):
+    """Mandatory intervals that can not all be scheduled together"""
+    conflicts: list[ConflictEntry] = Field(default_factory=list)
+    minimal: bool = Field(description="Whether dropping any single entry makes the rest feasible", default=False)
+
+
+def explain_infeasibility(ctx: "SchedulingContext", solver: cp_model.CpSolver,
+                          assumptions: dict[int, "ScheduleInterval"],
+                          minimize: bool = True) -> InfeasibilityExplanation:
+    """
+    Maps the assumption core of the last (infeasible) solve back to tasks. The mandatory
+    presences must have been posted as assumptions, keyed here by literal index. With minimize,
+    the core is shrunk by deletion on a copy of the model: each member is dropped in turn and stays
+    out if the remaining assumptions are still infeasible, which leaves a minimal conflict set.
+    """
+    core = [lit for lit in solver.SufficientAssumptionsForInfeasibility() if lit in assumptions]
+    if minimize and len(core) > 1:
+        model = ctx.model.Clone()
+        model.ClearObjective()
+        for lit in list(core):
+            candidate = [x for x in core if x != lit]
+            model.ClearAssumptions()
+            model.AddAssumptions([model.GetBoolVarFromProtoIndex(x) for x in candidate])
+            if solver.Solve(model) == cp_model.INFEASIBLE:
+                core = candidate
+    conflicts = []
+    for lit in core:
+        interval = assumptions[lit]
+        task_id = ctx.task_id_of(interval)
+        task = ctx.get_task(task_id)
+        conflicts.append(ConflictEntry(
+            interval_id=interval.id,
+            interval_name=interval.name,
+            task_id=task_id,
+            task_name=None if task is None else task.name,
+        ))
+    return InfeasibilityExplanation(conflicts=conflicts, minimal=minimize)
@@ -0,0 +1,163 @@
+import uuid
+from bisect import bisect_left, insort
+from typing import Literal
+
+from ortools.sat.python import cp_model
+from pydantic import AwareDatetime, BaseModel, Field
+
+import vivia_v4.model_definitions as MD
+from vivia_v4.constraints import GapNoOverlapConstraint, NoOverlapConstraint
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.scheduling_context import SchedulingContext
+from vivia_v4.solver_profiles import SolverProfile
+from vivia_v4.task_pool import ViviaTaskPool
+from vivia_v4.templates import ALLTASKTEMPLATES, ScheduleInterval
+
+
+class StoredSchedule(BaseModel):
+    """The last solved schedule of a pool: placements by interval key, in units of the solve"""
+    schedule_range: tuple[AwareDatetime, AwareDatetime]
+    unit_length: MD.TimeDelta
+    assignment: dict[str, tuple[int, int] | None] = Field(default_factory=dict)
+
+
+class InsertResult(BaseModel):
+    method: Literal["greedy", "local_solve", "failed"]
+    schedule: StoredSchedule | None = Field(description="The updated schedule, None when insertion failed",
+                                            default=None)
+    intervals: dict[str, list[ScheduleInterval]] = Field(
+        description="task id -> intervals of every task whose placement changed", default_factory=dict)
+
+
+class _Occupancy:
+    """Busy (start, end) unit spans of one no-overlap target set, sorted and pairwise disjoint"""
+
+    def __init__(self, spans: list[tuple[int, int]], gap: int):
+        self.spans = sorted(spans)
+        self.starts = [s for s, _ in self.spans]
+        self.gap = gap
+
+    def blocking_end(self, start: int, end: int) -> int | None:
+        """End of the span that keeps [start, end) from fitting, None if it fits"""
+        idx = bisect_left(self.starts, end + self.gap) - 1
+        if idx >= 0 and self.spans[idx][1] + self.gap > start:
+            return self.spans[idx][1]
+        return None
+
+    def add(self, span: tuple[int, int]) -> None:
+        insort(self.spans, span)
+        self.starts = [s for s, _ in self.spans]
+
+
+def _greedy_place(ctx: SchedulingContext, interval: ScheduleInterval,
+                  occupancies: list[_Occupancy]) -> tuple[int, int] | None:
+    """The earliest placement free in every occupancy, jumping past each blocking span"""
+    s_lo, s_hi, e_lo, e_hi, d_lo, d_hi = ctx.unit_bounds(interval)
+    start, latest = max(s_lo, e_lo - d_hi), min(s_hi, e_hi - d_lo)
+    while start <= latest:
+        end = start + max(d_lo, e_lo - start)
+        blocked = [b + o.gap for o in occupancies if (b := o.blocking_end(start, end)) is not None]
+        if not blocked:
+            return start, end
+        start = max(blocked)
+    return None
+
+
+def _context(pool: ViviaTaskPool, stored: StoredSchedule) -> SchedulingContext:
+    return SchedulingContext(model=cp_model.CpModel(), task_pool=pool,
+                             interval_map=pool.get_intervals(*stored.schedule_range),
+                             schedule_range=stored.schedule_range, unit_length=stored.unit_length)
+
+
+def greedy_insert(ctx: SchedulingContext, task_id: uuid.UUID,
+                  stored: StoredSchedule) -> dict[str, tuple[int, int] | None] | None:
+    """
+    Fits the intervals of a new task into the gaps of a stored schedule, leaving every other
+    interval where it is. Each (gap) no-overlap targeting a new interval contributes the placed
+    intervals of its other targets as busy spans, padded by its largest gap. Only intervals that
+    are mandatory or have a positive priority are placed, the rest stay absent. Returns the
+    placements of the new intervals, or None when a constraint of another kind targets them or an
+    interval that should be present does not fit.
+    """
+    new_intervals = ctx.get_intervals_by_task_id(task_id)
+    new_ids = {i.id for i in new_intervals}
+    occupancies: dict[uuid.UUID, list[_Occupancy]] = {i.id: [] for i in new_intervals}
+    for c in ctx.task_pool.constraints:
+        targets = c.get_target_intervals(ctx)
+        if not any(i.id in new_ids for i in targets):
+            continue
+        if not isinstance(c, (NoOverlapConstraint, GapNoOverlapConstraint)):
+            return None
+        gap = 0
+        if isinstance(c, GapNoOverlapConstraint):
+            gap = ctx.to_units(max([c.min_gap] + [t.gap for t in c.transitions]))
+        spans = [stored.assignment[k] for i in targets
+                 if i.id not in new_ids and (k := ctx.interval_key(i)) in stored.assignment and stored.assignment[k]]
+        occupancy = _Occupancy(spans, gap)
+        for i in targets:
+            if i.id in new_ids:
+                occupancies[i.id].append(occupancy)
+    for i in new_intervals:
+        if i.allowed_windows is not None:
+            # The holes between the windows block the interval like busy spans
+            windows = i.window_units(ctx.schedule_range[0], ctx.unit_length)
+            occupancies[i.id].append(_Occupancy([(a[1], b[0]) for a, b in zip(windows, windows[1:])], 0))
+    placements: dict[str, tuple[int, int] | None] = {}
+    for i in new_intervals:
+        if not i.mandatory and i.priority <= 0:
+            # Presence earns the solve nothing, so the interval stays absent
+            placements[ctx.interval_key(i)] = None
+            continue
+        placement = _greedy_place(ctx, i, occupancies[i.id])
+        if placement is None:
+            return None
+        for occupancy in occupancies[i.id]:
+            occupancy.add(placement)
+        placements[ctx.interval_key(i)] = placement
+    return placements
+
+
+def local_resolve(ctx: SchedulingContext, task_id: uuid.UUID, stored: StoredSchedule,
+                  solver_profile: SolverProfile | None = None) -> dict[str, tuple[int, int] | None] | None:
+    """
+    Repairs the stored schedule around a new task with ViviaScheduler.repair, which moves only
+    the task's neighbourhood. Returns the full assignment, or None when no round found a
+    feasible schedule.
+    """
+    sched = ViviaScheduler(task_pool=ctx.task_pool, schedule_range=stored.schedule_range,
+                           unit_length=stored.unit_length, solver_profile=solver_profile)
+    if sched.repair([task_id], previous=stored.assignment) not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+        return None
+    return sched._current_assignment()
+
+
+def insert_task(pool: ViviaTaskPool, task: ALLTASKTEMPLATES, stored: StoredSchedule,
+                solver_profile: SolverProfile | None = None) -> InsertResult:
+    """
+    Places a task that was just added to the pool into a stored schedule: greedily when it fits
+    into free gaps, else by repairing the schedule around the task's windows.
+    """
+    ctx = _context(pool, stored)
+    assignment = dict(stored.assignment)
+    placements = greedy_insert(ctx, task.id, stored)
+    method = "greedy"
+    if placements is not None:
+        assignment.update(placements)
+    else:
+        method = "local_solve"
+        assignment = local_resolve(ctx, task.id, stored, solver_profile)
+        if assignment is None:
+            return InsertResult(method="failed")
+    schedule_start, unit = stored.schedule_range[0], stored.unit_length
+    changed: dict[str, list[ScheduleInterval]] = {}
+    for task_id, intervals in ctx._interval_map.items():
+        keys = [ctx.interval_key(i) for i in intervals]
+        if task_id != task.id and all(stored.assignment.get(k) == assignment.get(k) for k in keys):
+            continue
+        for i, key in zip(intervals, keys):
+            units = assignment.get(key)
+            i.actual_interval = i.actual_interval.clear_interval() if units is None else \
+                i.actual_interval.set_interval(schedule_start + units[0] * unit, schedule_start + units[1] * unit)
+        changed[str(task_id)] = intervals
+    schedule = stored.model_copy(update={"assignment": assignment})
+    return InsertResult(method=method, schedule=schedule, intervals=changed)
@@ -0,0 +1,84 @@
+import uuid
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+import numpy as np
+
+from vivia_v4.constraints import BaseConstraint, GapNoOverlapConstraint, NoOverlapConstraint
+from vivia_v4.objectives import BaseObjective
+from vivia_v4.utils import IntervalUtil
+
+if TYPE_CHECKING:
+    from vivia_v4.scheduling_context import SchedulingContext
+    from vivia_v4.templates import ScheduleInterval
+
+
+def earliest_placement(ctx: "SchedulingContext", interval: "ScheduleInterval") -> tuple[int, int] | None:
+    """The earliest (start, end) in units the interval can take on its own, None if it has none"""
+    s_lo, s_hi, e_lo, e_hi, d_lo, d_hi = ctx.unit_bounds(interval)
+    start = max(s_lo, e_lo - d_hi)
+    if start > min(s_hi, e_hi - d_lo):
+        return None
+    return start, start + max(d_lo, e_lo - start)
+
+
+def _colliding(windows: np.ndarray) -> np.ndarray:
+    """
+    Which of the half-open [lo, hi) windows meet another one. After sorting by lo, a window
+    collides with an earlier one iff its lo is below the running max of earlier his, and with a
+    later one iff the next lo is below its own hi.
+    """
+    order = np.argsort(windows[:, 0], kind="stable")
+    lo, hi = windows[order, 0], windows[order, 1]
+    hit = np.zeros(len(lo), dtype=bool)
+    if len(lo) > 1:
+        running_hi = np.maximum.accumulate(hi)
+        hit[1:] |= lo[1:] < running_hi[:-1]
+        hit[:-1] |= lo[1:] < hi[:-1]
+    result = np.empty_like(hit)
+    result[order] = hit
+    return result
+
+
+def find_isolated_intervals(ctx: "SchedulingContext", constraints: Sequence[BaseConstraint],
+                            objectives: Sequence[BaseObjective]) -> dict[uuid.UUID, tuple[int, int]]:
+    """
+    Intervals the solver has nothing to decide about, by id, with their placement. An interval
+    qualifies when it wants to be present (mandatory or priority > 0), every constraint targeting
+    it is a (gap) no-overlap in which no other interval's window comes within the gap of its own,
+    and every weighted objective targeting it is minimized by its earliest placement. Such an
+    interval is present at its earliest feasible start in every optimal schedule. Pinned
+    intervals keep their placement and never qualify.
+    """
+    # Intervals reaching outside the schedule are left to create_cp_model_vars, which rejects them
+    # Multi-window intervals are left to the solver too, as their earliest start may fall between windows
+    candidates = {
+        i.id: i for i in ctx.all_intervals
+        if (i.mandatory or i.priority > 0) and i.allowed_windows is None and i.id not in ctx.pinned
+        and IntervalUtil.is_contained((i.start_interval[0], i.end_interval[1]), ctx.schedule_range)
+    }
+    for o in objectives:
+        if o.weight > 0 and not o.prefers_earliest():
+            for i in o.select_intervals(ctx):
+                candidates.pop(i.id, None)
+    for c in constraints:
+        targets = c.get_target_intervals(ctx)
+        if not isinstance(c, (NoOverlapConstraint, GapNoOverlapConstraint)):
+            for i in targets:
+                candidates.pop(i.id, None)
+            continue
+        if len(targets) < 2 or not any(i.id in candidates for i in targets):
+            continue
+        reach = 0
+        if isinstance(c, GapNoOverlapConstraint):
+            reach = ctx.to_units(max([c.min_gap] + [t.gap for t in c.transitions]))
+        windows = np.array([(b[0], b[3] + reach) for b in (ctx.unit_bounds(i) for i in targets)])
+        for i, hit in zip(targets, _colliding(windows)):
+            if hit:
+                candidates.pop(i.id, None)
+    isolated = {}
+    for i in candidates.values():
+        placement = earliest_placement(ctx, i)
+        if placement is not None:
+            isolated[i.id] = placement
+    return isolated
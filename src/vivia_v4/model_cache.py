@@ -0,0 +1,111 @@
+import zlib
+
+from ortools.sat.python import cp_model
+from pydantic import BaseModel, Field, PrivateAttr
+
+from vivia_v4.constraints import ConstraintNormalizationReport
+from vivia_v4.solve_cache import BoundedCache
+from vivia_v4.templates import CPVarHandle
+
+
+class CompiledModel(BaseModel):
+    """
+    A built CP model and the index of every interval's variables in it, so an unchanged pool can
+    skip build_model. Variables are addressed by proto index and intervals by their deterministic
+    interval key; the secondary cost is kept as the proto terms of its linear expression. The
+    model itself is kept as a built CpModel and only turned into proto text to be written to disk.
+    """
+    proto_text: str | None = Field(
+        description="The CpModelProto in text format, set when stored on disk", default=None)
+    variables: dict[str, tuple[int, int, int, int] | None] = Field(
+        description="interval key -> proto indexes of (start, end, presence, interval)",
+        default_factory=dict)
+    secondary_terms: list[tuple[int, int]] | None = Field(
+        description="(variable ref, coefficient) pairs of the secondary cost, "
+                    "None without objectives",
+        default=None)
+    secondary_offset: int = 0
+    normalization_report: ConstraintNormalizationReport | None = None
+    fixed: dict[str, tuple[int, int] | None] = Field(
+        description="interval key -> (start, end), or None for absent, of intervals placed "
+                    "without CP variables",
+        default_factory=dict)
+    _template: cp_model.CpModel | None = PrivateAttr(default=None)
+
+    @classmethod
+    def capture(cls, model: cp_model.CpModel,
+                variables: dict[str, tuple[int, int, int, int] | None],
+                secondary_cost: cp_model.LinearExprT | None,
+                normalization_report: ConstraintNormalizationReport | None,
+                fixed: dict[str, tuple[int, int] | None] | None = None) -> "CompiledModel":
+        secondary_terms, secondary_offset = None, 0
+        if secondary_cost is not None:
+            # Let the model flatten the expression into proto terms, then take the objective out
+            model.Minimize(secondary_cost)
+            objective = model.Proto().objective
+            secondary_terms = list(zip(objective.vars, objective.coeffs, strict=True))
+            secondary_offset = round(objective.offset)
+            model.ClearObjective()
+        compiled = cls(variables=variables, secondary_terms=secondary_terms,
+                       secondary_offset=secondary_offset, normalization_report=normalization_report,
+                       fixed=fixed or {})
+        compiled._template = model.clone()
+        return compiled
+
+    def with_proto_text(self) -> "CompiledModel":
+        """The entry with its model as proto text, the only form the python proto parses from"""
+        if self.proto_text is not None or self._template is None:
+            return self
+        return self.model_copy(update={"proto_text": str(self._template.Proto())})
+
+    def instantiate(self) -> cp_model.CpModel:
+        """A fresh copy of the model, which solves extend; the template stays untouched"""
+        if self._template is None:
+            if self.proto_text is None:
+                raise ValueError("Compiled model has neither a template nor proto text")
+            template = cp_model.CpModel()
+            template.Proto().parse_text_format(self.proto_text)
+            template.rebuild_constant_map()
+            self._template = template
+            # The parsed template replaces the text, which is only needed on disk
+            self.proto_text = None
+        return self._template.clone()
+
+    def bind(self, model: cp_model.CpModel) -> dict[str, CPVarHandle]:
+        """The variables of every interval with CP variables in an instantiated model, by key"""
+        # The indexes were captured from this very model, so the checks of
+        # GetIntVarFromProtoIndex and friends, most of the cost of a hit, are skipped
+        proto = model.Proto()
+        handles = {}
+        for key, indexes in self.variables.items():
+            if indexes is not None:
+                start, end, presence, interval = indexes
+                handles[key] = CPVarHandle(cp_model.IntVar(proto, start),
+                                           cp_model.IntVar(proto, end),
+                                           cp_model.IntVar(proto, presence),
+                                           cp_model.IntervalVar(proto, interval))
+        return handles
+
+    def secondary_cost(self, model: cp_model.CpModel) -> cp_model.LinearExprT | None:
+        if self.secondary_terms is None:
+            return None
+        # A negative reference stands for the negated variable
+        variables = [model.GetIntVarFromProtoIndex(ref) if ref >= 0
+                     else -model.GetIntVarFromProtoIndex(-ref - 1)
+                     for ref, _ in self.secondary_terms]
+        coeffs = [c for _, c in self.secondary_terms]
+        return cp_model.LinearExpr.WeightedSum(variables, coeffs) + self.secondary_offset
+
+
+class ModelCache(BoundedCache[CompiledModel]):
+    """Compiled CP models, as zlib-compressed JSON on disk and as built templates in memory"""
+    suffix = ".model"
+
+    def encode(self, entry: CompiledModel) -> bytes:
+        return zlib.compress(entry.with_proto_text().model_dump_json().encode("utf-8"), 1)
+
+    def decode(self, data: bytes) -> CompiledModel:
+        try:
+            return CompiledModel.model_validate_json(zlib.decompress(data))
+        except zlib.error as e:
+            raise ValueError("Corrupt model cache entry") from e
@@ -0,0 +1,112 @@
+from abc import ABC, abstractmethod
+from typing import Annotated, Literal, TYPE_CHECKING
+from pydantic import BaseModel, Field
+from ortools.sat.python import cp_model
+
+from vivia_v4.constraints import collect_target_intervals
+
+if TYPE_CHECKING:
+    from vivia_v4.scheduling_context import SchedulingContext
+    from vivia_v4.templates import ScheduleInterval
+
+
+class BaseObjective(BaseModel, ABC):
+    """
+    A secondary cost term, minimized alongside (or after) the priority objective.
+    Targets intervals by group_name and/or label, or every interval when neither is given.
+    """
+    weight: int = Field(description="Weight of the term in the combined secondary cost", default=1, ge=0)
+    group_name: str | None = None
+    label: str | None = None
+
+    def select_intervals(self, ctx: "SchedulingContext") -> list["ScheduleInterval"]:
+        """Every targeted interval, whether or not it has CP variables"""
+        if self.group_name is None and self.label is None:
+            return ctx.all_intervals
+        return collect_target_intervals(ctx, self.group_name, self.label)
+
+    def get_target_intervals(self, ctx: "SchedulingContext") -> list["ScheduleInterval"]:
+        return [i for i in self.select_intervals(ctx) if i._cp_model_vars.interval is not None]
+
+    def prefers_earliest(self) -> bool:
+        """
+        True when the term adds up per interval and each interval's share is smallest at its
+        earliest placement, so fixing an uncontested interval there never changes the optimum
+        """
+        return False
+
+    @abstractmethod
+    def build(self, ctx: "SchedulingContext") -> cp_model.LinearExprT:
+        """Emits any helper variables and returns the cost expression, in scheduler units"""
+        pass
+
+
+class MakespanObjective(BaseObjective):
+    """The end of the last present interval"""
+    objective_type: Literal["makespan"] = Field(default="makespan", frozen=True)
+
+    def build(self, ctx: "SchedulingContext") -> cp_model.LinearExprT:
+        intervals = self.get_target_intervals(ctx)
+        if not intervals:
+            return 0
+        ends = [i._cp_model_vars.end for i in intervals]
+        makespan = ctx.model.NewIntVar(0, max(ctx.var_bounds(e)[1] for e in ends), ctx.var_name("makespan"))
+        if all(i.mandatory for i in intervals):
+            ctx.model.AddMaxEquality(makespan, ends)
+        else:
+            # An absent interval must not stretch the makespan, so bound it only when present;
+            # minimizing the makespan pulls it down onto the latest present end
+            for i in intervals:
+                ctx.model.Add(makespan >= i._cp_model_vars.end).OnlyEnforceIf(i._cp_model_vars.presence)
+        return makespan
+
+
+class StartDeviationObjective(BaseObjective):
+    """
+    How far each interval starts from the preferred edge of its start_interval: tardiness past
+    the earliest start, or earliness before the latest start. The start variable's domain already
+    is the start window, so the deviation is a plain linear term without helper variables.
+    Absent optional intervals contribute nothing, as their free start settles on the preferred edge.
+    """
+    objective_type: Literal["start_deviation"] = Field(default="start_deviation", frozen=True)
+    preferred: Literal["earliest", "latest"] = "earliest"
+
+    def build(self, ctx: "SchedulingContext") -> cp_model.LinearExprT:
+        intervals = self.get_target_intervals(ctx)
+        if not intervals:
+            return 0
+        starts = [i._cp_model_vars.start for i in intervals]
+        bounds = [ctx.var_bounds(s) for s in starts]
+        if self.preferred == "earliest":
+            return cp_model.LinearExpr.Sum(starts) - sum(lb for lb, _ in bounds)
+        return sum(ub for _, ub in bounds) - cp_model.LinearExpr.Sum(starts)
+
+    def prefers_earliest(self) -> bool:
+        return self.preferred == "earliest"
+
+
+class CompactnessObjective(BaseObjective):
+    """
+    The span from the first start to the last end of the present target intervals. With the
+    workload fixed by the chosen intervals, a shorter span means less idle time between them.
+    """
+    objective_type: Literal["compactness"] = Field(default="compactness", frozen=True)
+
+    def build(self, ctx: "SchedulingContext") -> cp_model.LinearExprT:
+        intervals = self.get_target_intervals(ctx)
+        if not intervals:
+            return 0
+        lb = min(ctx.var_bounds(i._cp_model_vars.start)[0] for i in intervals)
+        ub = max(ctx.var_bounds(i._cp_model_vars.end)[1] for i in intervals)
+        first_start = ctx.model.NewIntVar(lb, ub, ctx.var_name("compact_first_start"))
+        last_end = ctx.model.NewIntVar(lb, ub, ctx.var_name("compact_last_end"))
+        ctx.model.Add(last_end >= first_start)
+        for i in intervals:
+            cp_vars = i._cp_model_vars
+            ctx.model.Add(first_start <= cp_vars.start).OnlyEnforceIf(cp_vars.presence)
+            ctx.model.Add(last_end >= cp_vars.end).OnlyEnforceIf(cp_vars.presence)
+        return last_end - first_start
+
+
+ALL_OBJECTIVES = Annotated[MakespanObjective | StartDeviationObjective | CompactnessObjective,
+                           Field(discriminator='objective_type')]
@@ -0,0 +1,158 @@
+import multiprocessing
+import multiprocessing.queues
+import os
+import queue
+import time
+from typing import Any
+
+from ortools.sat.python import cp_model
+from pydantic import AwareDatetime, BaseModel, Field
+
+
+class PortfolioVariant(BaseModel):
+    """One formulation raced by a portfolio solve"""
+    name: str
+    overrides: dict[str, Any] = Field(
+        description="ViviaScheduler fields replaced for this variant, "
+                    "e.g. unit_length or objective_mode",
+        default_factory=dict)
+    parameters: dict[str, Any] = Field(
+        description="CP-SAT parameters set on top of the solver profile; enum values by name, "
+                    "e.g. {'search_branching': 'FIXED_SEARCH'}",
+        default_factory=dict)
+
+
+class PortfolioOutcome(BaseModel):
+    """
+    What one variant reported back; assignments are datetimes, so variants with other units
+    compare
+    """
+    variant: str
+    status: int = int(cp_model.UNKNOWN)
+    stop_reason: str | None = None
+    score: int = Field(description="Sum of priorities of the present intervals", default=0)
+    secondary: int = Field(description="Value of the secondary cost, 0 without objectives",
+                           default=0)
+    wall_time: float = 0
+    assignment: dict[str, tuple[AwareDatetime, AwareDatetime] | None] = Field(default_factory=dict)
+    error: str | None = None
+
+    @property
+    def feasible(self) -> bool:
+        return self.status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+
+
+DEFAULT_PORTFOLIO: list[PortfolioVariant] = [
+    PortfolioVariant(name="baseline"),
+    PortfolioVariant(name="fixed_search", parameters={"search_branching": "FIXED_SEARCH"}),
+    PortfolioVariant(name="pseudo_cost", parameters={"search_branching": "PSEUDO_COST_SEARCH"}),
+]
+
+
+def _race_worker(pool_json: str, options: dict[str, Any], variant_json: str, num_workers: int,
+                 deadline_at: float, results: "multiprocessing.queues.Queue[str]") -> None:
+    """Builds and solves one variant in a worker process and reports a PortfolioOutcome as JSON"""
+    from vivia_v4.scheduler import ViviaScheduler
+    from vivia_v4.task_pool import ViviaTaskPool
+
+    variant = PortfolioVariant.model_validate_json(variant_json)
+    outcome = PortfolioOutcome(variant=variant.name)
+    try:
+        sched = ViviaScheduler(task_pool=ViviaTaskPool.model_validate_json(pool_json),
+                               **{**options, **variant.overrides})
+        sched.build_model()
+        # The deadline is shared by the whole race, so worker start-up counts against it
+        params = sched.solver.parameters
+        if sched.solver_profile is not None:
+            sched.solver_profile.apply(sched.solver)
+            sched.solver_profile = None
+        params.num_workers = num_workers
+        for name, value in variant.parameters.items():
+            current = getattr(params, name)
+            if isinstance(value, str) and hasattr(type(current), "__members__"):
+                value = getattr(type(current), value)
+            setattr(params, name, value)
+        remaining = deadline_at - time.time()
+        params.max_time_in_seconds = max(0.1, min(params.max_time_in_seconds, remaining))
+        outcome.status = int(sched.solve())
+        outcome.stop_reason = sched.stop_reason
+        outcome.wall_time = sched.solver.WallTime()
+        if outcome.feasible:
+            for i in sched.intervals:
+                start, end = i.actual_interval.start, i.actual_interval.end
+                key = sched.ctx.interval_key(i)
+                if start is not None and end is not None:
+                    outcome.assignment[key] = (start, end)
+                    outcome.score += i.priority
+                else:
+                    outcome.assignment[key] = None
+            if sched._secondary_cost is not None:
+                outcome.secondary = round(sched.solver.Value(sched._secondary_cost))
+    except Exception as e:
+        outcome.status = int(cp_model.MODEL_INVALID)
+        outcome.error = f"{type(e).__name__}: {e}"
+    results.put(outcome.model_dump_json())
+
+
+def race_portfolio(pool_json: str, options: dict[str, Any], variants: list[PortfolioVariant],
+                   deadline_seconds: float, grace_seconds: float = 5.0
+                   ) -> tuple[PortfolioOutcome | None, list[PortfolioOutcome]]:
+    """
+    Solves every variant in its own process. The first optimal outcome stops the race and the
+    remaining processes are terminated; otherwise each variant stops at the shared deadline. The
+    winner is picked from the arrived outcomes by select_winner. Workers use the spawn start
+    method, as forking a process that already runs solver threads is unsafe. Returns the winner,
+    if any, and every outcome that arrived.
+    """
+    if not variants:
+        raise ValueError("A portfolio needs at least one variant")
+    ctx = multiprocessing.get_context("spawn")
+    results = ctx.Queue()
+    deadline_at = time.time() + deadline_seconds
+    # Split the cores instead of letting every variant take all of them
+    num_workers = max(1, (os.cpu_count() or 1) // len(variants))
+    processes = [
+        ctx.Process(target=_race_worker, daemon=True,
+                    args=(pool_json, options, v.model_dump_json(), num_workers, deadline_at,
+                          results))
+        for v in variants
+    ]
+    for p in processes:
+        p.start()
+    outcomes: list[PortfolioOutcome] = []
+    try:
+        while len(outcomes) < len(processes):
+            remaining = deadline_at + grace_seconds - time.time()
+            if remaining <= 0:
+                break
+            try:
+                outcome = PortfolioOutcome.model_validate_json(results.get(timeout=remaining))
+            except queue.Empty:
+                break
+            outcomes.append(outcome)
+            if outcome.status == cp_model.OPTIMAL:
+                break
+    finally:
+        for p in processes:
+            if p.is_alive():
+                p.terminate()
+            p.join(timeout=1)
+        results.close()
+    return select_winner(outcomes, variants), outcomes
+
+
+def select_winner(outcomes: list[PortfolioOutcome],
+                  variants: list[PortfolioVariant]) -> PortfolioOutcome | None:
+    """
+    The best feasible outcome by (status, score, secondary cost): optimal before feasible, then
+    the highest score, then the lowest secondary cost. Remaining ties go to the variant listed
+    first, so the pick does not depend on which process reported first.
+    """
+    order = {v.name: n for n, v in enumerate(variants)}
+
+    def rank(o: PortfolioOutcome) -> tuple[bool, int, int, int]:
+        return (o.status == cp_model.OPTIMAL, o.score, -o.secondary,
+                -order.get(o.variant, len(order)))
+
+    feasible = [o for o in outcomes if o.feasible]
+    return max(feasible, key=rank) if feasible else None
@@ -0,0 +1,40 @@
+import uuid
+from collections.abc import Sequence
+from typing import TYPE_CHECKING
+
+from vivia_v4.constraints import BaseConstraint
+
+if TYPE_CHECKING:
+    from vivia_v4.scheduling_context import SchedulingContext
+
+
+def repair_neighbourhood(ctx: "SchedulingContext", constraints: Sequence[BaseConstraint],
+                         changed_task_ids: list[uuid.UUID], widening: int) -> set[str]:
+    """
+    Keys of the intervals a repair may move. Round 0 frees the changed tasks' intervals and every
+    interval that shares a constraint with them and whose window meets their footprint, the span
+    from their earliest start to their latest end. Each further round widens the footprint by its
+    own length on both sides and follows constraints one step further from the intervals already
+    free.
+    """
+    changed = [i for task_id in changed_task_ids for i in ctx.get_intervals_by_task_id(task_id)]
+    if not changed:
+        return set()
+    bounds = {i.id: ctx.unit_bounds(i) for i in ctx.all_intervals}
+    lo = min(bounds[i.id][0] for i in changed)
+    hi = max(bounds[i.id][3] for i in changed)
+    width = max(hi - lo, 1)
+    target_sets = [{i.id: i for i in c.get_target_intervals(ctx)} for c in constraints]
+    free = {i.id: i for i in changed}
+    for step in range(widening + 1):
+        window = (lo - step * width, hi + step * width)
+        reached = {}
+        for targets in target_sets:
+            if not any(k in free for k in targets):
+                continue
+            for k, i in targets.items():
+                b = bounds[k]
+                if b[0] < window[1] and b[3] > window[0]:
+                    reached[k] = i
+        free.update(reached)
+    return {ctx.interval_key(i) for i in free.values()}
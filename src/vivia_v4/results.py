@@ -0,0 +1,85 @@
+import datetime as DT
+from typing import TYPE_CHECKING
+
+import numpy as np
+from ortools.sat.python import cp_model
+
+from vivia_v4.templates import RealInterval
+
+if TYPE_CHECKING:
+    from vivia_v4.scheduling_context import SchedulingContext
+    from vivia_v4.templates import ScheduleInterval
+
+
+class SolutionTable:
+    """
+    A solved schedule as parallel arrays over the context's intervals: presence and start/end in
+    units. The solver's values are read in one bulk copy of the response; RealIntervals are only
+    built when a row is asked for or the table is materialized onto the intervals.
+    """
+
+    def __init__(self, intervals: list["ScheduleInterval"], keys: list[str], present: np.ndarray,
+                 starts: np.ndarray, ends: np.ndarray, schedule_start: DT.datetime, unit_length: DT.timedelta):
+        self.intervals = intervals
+        self.keys = keys
+        self.present = present
+        self.starts = starts
+        self.ends = ends
+        self.schedule_start = schedule_start
+        self.unit_length = unit_length
+
+    @classmethod
+    def from_solver(cls, ctx: "SchedulingContext", solver: cp_model.CpSolver,
+                    fixed: dict[str, tuple[int, int] | None]) -> "SolutionTable":
+        """Reads every interval with CP variables from the solver, the rest from the fixed placements"""
+        intervals = ctx.all_intervals
+        n = len(intervals)
+        keys = [ctx.interval_key(i) for i in intervals]
+        present = np.zeros(n, dtype=bool)
+        starts = np.zeros(n, dtype=np.int64)
+        ends = np.zeros(n, dtype=np.int64)
+        rows = [k for k, i in enumerate(intervals) if not i._cp_model_vars.is_empty()]
+        if rows:
+            values = np.array(solver.ResponseProto().solution, dtype=np.int64)
+            handles = [intervals[k]._cp_model_vars for k in rows]
+            present[rows] = values[[h.presence.Index() for h in handles]] == 1
+            starts[rows] = values[[h.start.Index() for h in handles]]
+            ends[rows] = values[[h.end.Index() for h in handles]]
+        for k, key in enumerate(keys):
+            if key in fixed and fixed[key] is not None:
+                present[k] = True
+                starts[k], ends[k] = fixed[key]
+        return cls(intervals, keys, present, starts, ends, ctx.schedule_range[0], ctx.unit_length)
+
+    def __len__(self) -> int:
+        return len(self.intervals)
+
+    def real_interval(self, row: int) -> RealInterval:
+        """The row as a RealInterval; built without validation, as solver values are consistent"""
+        if not self.present[row]:
+            return RealInterval.model_construct(start=None, end=None)
+        return RealInterval.model_construct(
+            start=self.schedule_start + int(self.starts[row]) * self.unit_length,
+            end=self.schedule_start + int(self.ends[row]) * self.unit_length,
+        )
+
+    def _offsets(self, units: np.ndarray) -> np.ndarray:
+        return units * np.timedelta64(self.unit_length)
+
+    def materialize(self) -> None:
+        """Writes the table into every interval's actual_interval"""
+        start_offsets, end_offsets = self._offsets(self.starts), self._offsets(self.ends)
+        empty = RealInterval.model_construct(start=None, end=None)
+        for row, interval in enumerate(self.intervals):
+            if not self.present[row]:
+                interval.actual_interval = empty
+            else:
+                interval.actual_interval = RealInterval.model_construct(
+                    start=self.schedule_start + start_offsets[row].item(),
+                    end=self.schedule_start + end_offsets[row].item(),
+                )
+
+    def assignment(self) -> dict[str, tuple[int, int] | None]:
+        """interval key -> (start, end) in units, None for absent intervals"""
+        starts, ends, present = self.starts.tolist(), self.ends.tolist(), self.present.tolist()
+        return {key: (starts[k], ends[k]) if present[k] else None for k, key in enumerate(self.keys)}
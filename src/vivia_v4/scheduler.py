@@ -1,10 +1,25 @@
-from typing import Annotated
+import uuid
+from typing import Annotated, ClassVar, Literal
 from vivia_v4.task_pool import ViviaTaskPool
 from ortools.sat.python import cp_model
 from pydantic import AfterValidator, BaseModel, Field, PrivateAttr, AwareDatetime
 import datetime as DT
-from vivia_v4.templates import ExactDateTask, RelativePeriodItem, ScheduleInterval, FixedPeriodTask
+from vivia_v4.templates import CPVarHandle, ExactDateTask, RelativePeriodItem, ScheduleInterval, FixedPeriodTask
 from vivia_v4.scheduling_context import SchedulingContext
+from vivia_v4.constraints import BaseConstraint, ConstraintNormalizationReport, normalize_constraints
+from vivia_v4.objectives import ALL_OBJECTIVES
+from vivia_v4.solver_profiles import SolverProfile
+from vivia_v4.search import SearchMonitor, TerminationPolicy, describe_stop
+from vivia_v4.solve_cache import CachedSolution, SolveCache, content_hash, pool_digest
+from vivia_v4.model_cache import CompiledModel, ModelCache
+from vivia_v4.portfolio import DEFAULT_PORTFOLIO, PortfolioOutcome, PortfolioVariant, race_portfolio
+from vivia_v4.symmetry import break_symmetries
+from vivia_v4.isolation import find_isolated_intervals
+from vivia_v4.repair import repair_neighbourhood
+from vivia_v4.results import SolutionTable
+from vivia_v4.checkpoint import CheckpointWriter, add_checkpoint_hints, load_checkpoint
+from vivia_v4.feasibility import (InfeasibilityExplanation, OverloadConflict, explain_infeasibility,
+                                  find_mandatory_overload)
 import vivia_v4.validators as VD
 import vivia_v4.model_definitions as MD
 class ViviaScheduler(BaseModel):
@@ -17,38 +32,491 @@ class ViviaScheduler(BaseModel):
     schedule_range: Annotated[tuple[AwareDatetime, AwareDatetime], AfterValidator(VD.validate_interval)]
     _ctx: SchedulingContext | None = PrivateAttr(default=None)
     unit_length: MD.TimeDelta = DT.timedelta(hours=1)
+    solver_profile: SolverProfile | None = Field(description="CP-SAT parameters used by solve()", default=None)
+    termination: TerminationPolicy | None = Field(
+        description="Stop early on a small optimality gap or when the search stagnates", default=None)
+    _stop_reason: str | None = PrivateAttr(default=None)
+    constraint_normalization: bool = Field(description="Drop redundant constraints before emitting them", default=True)
+    _normalization_report: ConstraintNormalizationReport | None = PrivateAttr(default=None)
+    objective_mode: Literal["weighted", "lexicographic"] = Field(
+        description="weighted: maximize sum(priority * presence); "
+                    "lexicographic: optimize priority tiers one after another, highest first",
+        default="weighted")
+    objectives: list[ALL_OBJECTIVES] = Field(
+        description="Secondary cost terms; subtracted from the priority objective in weighted mode, "
+                    "minimized as a final stage in lexicographic mode",
+        default_factory=list)
+    _secondary_cost: cp_model.LinearExprT | None = PrivateAttr(default=None)
+    feasibility_screening: bool = Field(
+        description="Reject mandatory overloads before building the CP model", default=True)
+    _overload_conflict: OverloadConflict | None = PrivateAttr(default=None)
+
+    explain: bool = Field(
+        description="Post mandatory presences as assumptions to explain infeasible solves", default=False)
+    minimize_explanation: bool = Field(
+        description="Shrink the explanation to a minimal conflict set", default=True)
+    _assumptions: dict[int, ScheduleInterval] = PrivateAttr(default_factory=dict)
+    _explanation: InfeasibilityExplanation | None = PrivateAttr(default=None)
+    result_cache: SolveCache | None = Field(
+        description="Returns stored results for unchanged pools, ranges and solve options", default=None, exclude=True)
+    _cache_key: str | None = PrivateAttr(default=None)
+    _cached_solution: CachedSolution | None = PrivateAttr(default=None)
+    model_cache: ModelCache | None = Field(
+        description="Reuses the built CP model of unchanged pools and ranges", default=None, exclude=True)
+    checkpoint_path: str | None = Field(
+        description="Persist the best incumbent here during search and resume from it as hints", default=None)
+    checkpoint_interval_seconds: float = Field(
+        description="Minimum wall-clock seconds between checkpoint writes", default=30.0, ge=0)
+    _checkpoint_writer: CheckpointWriter | None = PrivateAttr(default=None)
+    _checkpoint_hinted: int = PrivateAttr(default=0)
+    _portfolio_outcomes: list[PortfolioOutcome] = PrivateAttr(default_factory=list)
+    symmetry_breaking: bool = Field(
+        description="Order interchangeable copies of an interval so the search skips their permutations",
+        default=True)
+    isolated_fast_path: bool = Field(
+        description="Place intervals no other interval can reach directly, without CP variables", default=True)
+    _fixed_assignment: dict[str, tuple[int, int] | None] = PrivateAttr(default_factory=dict)
+    _repair_rounds: int = PrivateAttr(default=0)
+    materialize_results: bool = Field(
+        description="Write solved placements into every interval's actual_interval right after solving; "
+                    "otherwise they are written on the first materialize() or read of intervals", default=False)
+    _solution_table: SolutionTable | None = PrivateAttr(default=None)
+    _materialized: bool = PrivateAttr(default=True)
+    anonymous_vars: bool = Field(
+        description="Leave CP variables unnamed to shrink the model; variable_table() maps them back", default=False)
+    pinned: dict[str, tuple[int, int] | None] = Field(
+        description="interval key -> (start, end) in units, or None for absent: placements kept as they are",
+        default_factory=dict)
+    # Options that change the built model; solve-only options do not invalidate a compiled model
+    MODEL_KEY_FIELDS: ClassVar[set[str]] = {
+        "schedule_range", "unit_length", "constraint_normalization", "objectives", "explain",
+        "symmetry_breaking", "isolated_fast_path", "pinned",
+        "anonymous_vars"}
+
+    @property
+    def stop_reason(self) -> str | None:
+        """Why the last solve ended: optimal, infeasible, gap, stagnation, time_limit or unknown"""
+        return self._stop_reason
+
+    @property
+    def overload_conflict(self) -> OverloadConflict | None:
+        return self._overload_conflict
+
+    @property
+    def explanation(self) -> InfeasibilityExplanation | None:
+        return self._explanation
+
+    @property
+    def normalization_report(self) -> ConstraintNormalizationReport | None:
+        return self._normalization_report
+
+    @property
+    def portfolio_outcomes(self) -> list[PortfolioOutcome]:
+        """Every variant outcome of the last solve_portfolio() call, in arrival order"""
+        return self._portfolio_outcomes
+
+    @property
+    def solution_table(self) -> SolutionTable | None:
+        """The placements of the last feasible solve, read in bulk from the solver"""
+        return self._solution_table
+
+    @property
+    def ctx(self) -> SchedulingContext:
+        """The scheduling context of the last build"""
+        if self._ctx is None:
+            raise ValueError("Model not built. Call build_model() first.")
+        return self._ctx
+
+    @property
+    def intervals(self) -> list[ScheduleInterval]:
+        """Every interval of the last build, with the placements of the last solve written into them"""
+        self.materialize()
+        return self.ctx.all_intervals
+
+    @property
+    def interval_map(self) -> dict[uuid.UUID, list[ScheduleInterval]]:
+        """task id -> its intervals, as in intervals"""
+        self.materialize()
+        return self.ctx._interval_map
+
+    def materialize(self):
+        """Writes the placements of the last solve into every interval's actual_interval, once"""
+        if self._materialized:
+            return
+        if self._solution_table is not None:
+            self._solution_table.materialize()
+        elif self._cached_solution is not None:
+            self._apply_assignment(self._cached_solution.assignment)
+        self._materialized = True
+
+    @property
+    def checkpoint_hinted(self) -> int:
+        """How many intervals the last solve hinted from a checkpoint"""
+        return self._checkpoint_hinted
+
+    @property
+    def repair_rounds(self) -> int:
+        """How many neighbourhoods the last repair() call solved"""
+        return self._repair_rounds
+
+    def content_hash(self, digest: str | None = None) -> str:
+        """
+        Hash of everything that determines a solve result: pool definition, range, units and
+        options. digest is the pool_digest of the task pool when the caller already has it.
+        """
+        options = self.model_dump(mode="json", exclude={"task_pool"})
+        return content_hash(digest or pool_digest(self.task_pool), options)
+
+    def model_hash(self, digest: str | None = None) -> str:
+        """Hash of everything that determines the built CP model; digest as in content_hash"""
+        options = self.model_dump(mode="json", include=self.MODEL_KEY_FIELDS)
+        return content_hash(digest or pool_digest(self.task_pool), options)
+
+    def _compile(self) -> CompiledModel:
+        variables: dict[str, tuple[int, int, int, int] | None] = {}
+        for i in self.ctx.all_intervals:
+            cp_vars = i._cp_model_vars
+            variables[self.ctx.interval_key(i)] = None if cp_vars.is_empty() else (
+                cp_vars.start.Index(), cp_vars.end.Index(), cp_vars.presence.Index(), cp_vars.interval.Index())
+        return CompiledModel.capture(self.model, variables, self._secondary_cost, self._normalization_report,
+                                     fixed=self._fixed_assignment)
+
+    def _load_compiled(self, compiled: CompiledModel):
+        """Adopts a compiled model and points every interval at its variables in it"""
+        self.model = compiled.instantiate()
+        self.ctx.model = self.model
+        self._assumptions = {}
+        handles = compiled.bind(self.model)
+        for i in self.ctx.all_intervals:
+            i._cp_model_vars = handles.get(self.ctx.interval_key(i)) or CPVarHandle()
+            # The compiled model already carries the assumptions; only the lookup is rebuilt
+            if self.explain and i.mandatory and not i._cp_model_vars.is_empty():
+                self._assumptions[i._cp_model_vars.presence.Index()] = i
+        self._secondary_cost = compiled.secondary_cost(self.model)
+        self._normalization_report = compiled.normalization_report
+        self._fixed_assignment = dict(compiled.fixed)
+
+    def variable_table(self) -> dict[int, tuple[uuid.UUID, str]]:
+        """
+        Debugging side table: proto variable index -> (interval id, role) for the variables of
+        every interval, roles being start, end, duration and presence. Built on demand, so
+        anonymous models carry no naming cost until it is asked for.
+        """
+        proto = self.model.Proto()
+        table: dict[int, tuple[uuid.UUID, str]] = {}
+        for i in self.ctx.all_intervals:
+            cp_vars = i._cp_model_vars
+            if cp_vars.is_empty():
+                continue
+            table[cp_vars.start.Index()] = (i.id, "start")
+            table[cp_vars.end.Index()] = (i.id, "end")
+            table[cp_vars.presence.Index()] = (i.id, "presence")
+            for var in proto.constraints[cp_vars.interval.Index()].interval.size.vars:
+                table[var] = (i.id, "duration")
+        return table
+
+    def _current_assignment(self) -> dict[str, tuple[int, int] | None]:
+        """interval key -> (start, end) in units of the last solve, else of the intervals' actual_interval"""
+        if self._solution_table is not None:
+            return self._solution_table.assignment()
+        if self._cached_solution is not None:
+            return dict(self._cached_solution.assignment)
+        schedule_start = self.schedule_range[0]
+        assignment: dict[str, tuple[int, int] | None] = {}
+        for i in self.ctx.all_intervals:
+            real = i.actual_interval
+            assignment[self.ctx.interval_key(i)] = None if real.is_empty() else (
+                (real.start - schedule_start) // self.unit_length, (real.end - schedule_start) // self.unit_length)
+        return assignment
+
+    def _apply_assignment(self, assignment: dict[str, tuple[int, int] | None]):
+        schedule_start = self.schedule_range[0]
+        for i in self.ctx.all_intervals:
+            units = assignment.get(self.ctx.interval_key(i))
+            if units is None:
+                i.actual_interval = i.actual_interval.clear_interval()
+            else:
+                i.actual_interval = i.actual_interval.set_interval(
+                    schedule_start + units[0] * self.unit_length, schedule_start + units[1] * self.unit_length)
 
     def build_model(self):
-        # 1. Get intervals map from TaskPool
+        # 1. Look up the caches first; both keys share one serialization of the pool
+        self._cached_solution = None
+        self._solution_table = None
+        self._materialized = True
+        compiled, model_key = None, None
+        digest = None if self.result_cache is None and self.model_cache is None else pool_digest(self.task_pool)
+        if self.result_cache is not None:
+            self._cache_key = self.content_hash(digest)
+            self._cached_solution = self.result_cache.get(self.task_pool.id, self._cache_key)
+        if self._cached_solution is None and self.model_cache is not None:
+            model_key = self.model_hash(digest)
+            compiled = self.model_cache.get(self.task_pool.id, model_key)
+
+        # 2. Get intervals map from TaskPool and initialize the SchedulingContext (indexes build on first use)
         interval_map = self.task_pool.get_intervals(*self.schedule_range)
+        self._ctx = ctx = SchedulingContext(model=self.model, task_pool=self.task_pool, interval_map=interval_map,
+                                            schedule_range=self.schedule_range, unit_length=self.unit_length,
+                                            anonymous_vars=self.anonymous_vars)
+
+        # 2.1 A cached result makes the CP model unnecessary
+        if self._cached_solution is not None:
+            return
+
+        # 2.2 A compiled model of the same pool and options replaces steps 3 to 5
+        if compiled is not None:
+            self._overload_conflict = None
+            self._load_compiled(compiled)
+            return
+
+        # Mandatory intervals can not be pinned absent, so they are left free
+        if self.pinned:
+            for interval in ctx.all_intervals:
+                key = ctx.interval_key(interval)
+                if key in self.pinned and (self.pinned[key] is not None or not interval.mandatory):
+                    ctx.pinned[interval.id] = self.pinned[key]
+
+        # 2.5 Screen for mandatory overloads; a conflict proves infeasibility, so skip the model
+        self._overload_conflict = None
+        if self.feasibility_screening:
+            self._overload_conflict = find_mandatory_overload(ctx, self.task_pool.constraints)
+            if self._overload_conflict is not None:
+                return
         
-        # 2. Initialize SchedulingContext (builds indexes automatically)
-        self._ctx = SchedulingContext(model=self.model, task_pool=self.task_pool, interval_map=interval_map)
-        
-        # 3. Create CP variables for all intervals
-        for interval in self._ctx.all_intervals:
-            interval.create_cp_model_vars(self.model, self.schedule_range[0], self.schedule_range[1], self.unit_length)
+        # 2.7 Pinned intervals and intervals nothing can conflict with are placed right away and get no
+        # CP variables; constraints add pinned ones as constant intervals next to intervals that can move
+        fixed = dict(ctx.pinned)
+        if self.isolated_fast_path:
+            fixed.update(find_isolated_intervals(ctx, self.task_pool.constraints, self.objectives))
+        self._fixed_assignment = {}
+        for interval in ctx.all_intervals:
+            if interval.id in fixed:
+                interval._cp_model_vars = CPVarHandle()
+                self._fixed_assignment[ctx.interval_key(interval)] = fixed[interval.id]
+
+        # 3. Create CP variables for all other intervals
+        for interval in ctx.all_intervals:
+            if ctx.interval_key(interval) in self._fixed_assignment:
+                continue
+            interval.create_cp_model_vars(self.model, self.schedule_range[0], self.schedule_range[1], self.unit_length,
+                                          enforce_mandatory=not self.explain, named=not self.anonymous_vars)
+
+        # 3.5 In explain mode mandatory presences are assumptions, so a failed solve names its core
+        self._assumptions = {}
+        if self.explain:
+            for interval in ctx.all_intervals:
+                if interval.mandatory and not interval._cp_model_vars.is_empty():
+                    self._assumptions[interval._cp_model_vars.presence.Index()] = interval
+            self.model.AddAssumptions([i._cp_model_vars.presence for i in self._assumptions.values()])
         
-        # 4. Apply all constraints
-        for constraint in self.task_pool.constraints:
-            constraint.apply(self._ctx)
+        # 3.6 Order interchangeable copies so the search skips their permutations
+        if self.symmetry_breaking:
+            break_symmetries(ctx)
+
+        # 4. Drop redundant constraints, then apply the rest
+        constraints: list[BaseConstraint] = list(self.task_pool.constraints)
+        if self.constraint_normalization:
+            constraints, self._normalization_report = normalize_constraints(ctx, constraints)
+        for constraint in constraints:
+            constraint.apply(ctx)
+
+        # 5. Emit secondary objective terms
+        self._secondary_cost = None
+        terms = [(o.build(ctx), o.weight) for o in self.objectives if o.weight > 0]
+        if terms:
+            self._secondary_cost = cp_model.LinearExpr.WeightedSum([t for t, _ in terms], [w for _, w in terms])
+
+        if self.model_cache is not None and model_key is not None:
+            self.model_cache.put(self.task_pool.id, model_key, self._compile())
+
+    def _priority_objective(self, intervals: list[ScheduleInterval]) -> cp_model.LinearExpr:
+        presences = [i._cp_model_vars.presence for i in intervals if i._cp_model_vars.presence is not None]
+        weights = [i.priority for i in intervals if i._cp_model_vars.presence is not None]
+        return cp_model.LinearExpr.WeightedSum(presences, weights)
+
+    def _hint_from_solution(self):
+        """Seeds the next solve with the current solution of every interval variable"""
+        self.model.ClearHints()
+        for i in self.ctx.all_intervals:
+            cp_vars = i._cp_model_vars
+            for var in (cp_vars.start, cp_vars.end, cp_vars.presence):
+                if var is not None:
+                    self.model.AddHint(var, self.solver.Value(var))
+
+    def _interval_vars(self) -> dict[str, tuple[cp_model.IntVar, cp_model.IntVar, cp_model.IntVar]]:
+        return {self.ctx.interval_key(i): (i._cp_model_vars.start, i._cp_model_vars.end, i._cp_model_vars.presence)
+                for i in self.ctx.all_intervals if not i._cp_model_vars.is_empty()}
+
+    def _prepare_checkpoint(self):
+        """Hints the model from a matching checkpoint and sets up the writer for this solve"""
+        self._checkpoint_writer = None
+        self._checkpoint_hinted = 0
+        if self.checkpoint_path is None:
+            return
+        model_key = self.model_hash()
+        variables = self._interval_vars()
+        checkpoint = load_checkpoint(self.checkpoint_path, model_key)
+        if checkpoint is not None:
+            # Hints of an earlier solve would duplicate these, which CP-SAT rejects
+            self.model.ClearHints()
+            self._checkpoint_hinted = add_checkpoint_hints(self.model, checkpoint, variables)
+        self._checkpoint_writer = CheckpointWriter(
+            self.checkpoint_path, model_key,
+            {key: (s.Index(), e.Index(), p.Index()) for key, (s, e, p) in variables.items()},
+            interval_seconds=self.checkpoint_interval_seconds)
+
+    def _run_solver(self) -> int:
+        """One CP-SAT run, watched by a SearchMonitor when a termination policy is set"""
+        monitor = None
+        if self.termination is not None or self._checkpoint_writer is not None:
+            monitor = SearchMonitor(self.solver, self.termination, self.model.HasObjective(),
+                                    checkpoint=self._checkpoint_writer)
+        try:
+            status = self.solver.Solve(self.model, monitor)
+        finally:
+            if monitor is not None:
+                monitor.close()
+        self._stop_reason = describe_stop(status, self.solver, monitor)
+        return status
+
+    def _solve_lexicographic(self):
+        """
+        Solves one stage per priority tier, from the largest |priority| down. Each stage maximizes
+        (or, for negative priorities, minimizes) how many optional intervals of its tier are present,
+        then fixes that count as a constraint and hints the next stage with the current solution,
+        so a higher tier strictly dominates any number of intervals of lower tiers. Secondary
+        objectives are minimized in a last stage.
+        """
+        tiers: dict[int, list[ScheduleInterval]] = {}
+        for i in self.ctx.all_intervals:
+            if not i.mandatory and i.priority != 0 and i._cp_model_vars.presence is not None:
+                tiers.setdefault(i.priority, []).append(i)
+        status = None
+        for priority in sorted(tiers, key=abs, reverse=True):
+            tier_count = cp_model.LinearExpr.Sum([i._cp_model_vars.presence for i in tiers[priority]])
+            if priority > 0:
+                self.model.Maximize(tier_count)
+            else:
+                self.model.Minimize(tier_count)
+            status = self._run_solver()
+            if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                return status
+            best = round(self.solver.ObjectiveValue())
+            self.model.Add(tier_count >= best if priority > 0 else tier_count <= best)
+            self._hint_from_solution()
+        if self._secondary_cost is not None:
+            self.model.Minimize(self._secondary_cost)
+            status = self._run_solver()
+        elif status is None:
+            self.model.ClearObjective()
+            status = self._run_solver()
+        return status
 
     def solve(self):
-        if self._ctx is None:
-            raise ValueError("Model not built. Call build_model() first.")
-            
-        # Maximize priority * presence
-        self.model.Maximize(sum(
-            shcedule_interval.priority * (shcedule_interval._cp_model_vars.presence if shcedule_interval._cp_model_vars.presence is not None else 1) 
-            for shcedule_interval in self._ctx.all_intervals
-        ))
-        
-        status = self.solver.Solve(self.model)
+        ctx = self.ctx
+        self._explanation = None
+        self._solution_table = None
+        self._materialized = False
+        if self.solver_profile is not None:
+            self.solver_profile.apply(self.solver)
+        if self._overload_conflict is not None:
+            print("No feasible solution found.")
+            self._stop_reason = "infeasible"
+            return cp_model.INFEASIBLE
+        if self._cached_solution is not None:
+            if self.materialize_results:
+                self.materialize()
+            self._stop_reason = "cached"
+            return self._cached_solution.status
+
+        self._prepare_checkpoint()
+        if self.objective_mode == "lexicographic":
+            status = self._solve_lexicographic()
+        else:
+            # Maximize priority * presence, less the weighted secondary costs
+            objective = self._priority_objective(ctx.all_intervals)
+            if self._secondary_cost is not None:
+                objective = objective - self._secondary_cost
+            self.model.Maximize(objective)
+            status = self._run_solver()
         
         if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
             msg = "Optimal solution found!" if status == cp_model.OPTIMAL else "Feasible solution found!"
             print(msg)
-            for i in self._ctx.all_intervals:
-                i.interprete_cp_model_vars(self.solver, self.schedule_range[0], self.schedule_range[1], self.unit_length)
+            self._solution_table = SolutionTable.from_solver(ctx, self.solver, self._fixed_assignment)
+            if self.materialize_results:
+                self.materialize()
+            if self.result_cache is not None and self._cache_key is not None:
+                self.result_cache.put(self.task_pool.id, self._cache_key, CachedSolution(
+                    status=status, stop_reason=self._stop_reason, assignment=self._solution_table.assignment()))
         else:
             print("No feasible solution found.")
+            if status == cp_model.INFEASIBLE and self._assumptions:
+                self._explanation = explain_infeasibility(
+                    ctx, self.solver, self._assumptions, minimize=self.minimize_explanation)
+        return status
+
+    def solve_portfolio(self, deadline_seconds: float, variants: list[PortfolioVariant] | None = None):
+        """
+        Races several formulations of this scheduler's pool in worker processes and adopts the
+        winner's schedule; see race_portfolio. Needs no build_model() call: every worker builds
+        its own model.
+        """
+        interval_map = self.task_pool.get_intervals(*self.schedule_range)
+        self._ctx = SchedulingContext(model=self.model, task_pool=self.task_pool, interval_map=interval_map,
+                                      schedule_range=self.schedule_range, unit_length=self.unit_length,
+                                      anonymous_vars=self.anonymous_vars)
+        # Variants must not share a checkpoint file
+        options = self.model_dump(mode="json", exclude={"task_pool", "checkpoint_path"})
+        winner, self._portfolio_outcomes = race_portfolio(
+            self.task_pool.model_dump_json(), options, variants or DEFAULT_PORTFOLIO, deadline_seconds)
+        if winner is None:
+            print("No feasible solution found.")
+            statuses = {o.status for o in self._portfolio_outcomes}
+            self._stop_reason = "infeasible" if statuses == {cp_model.INFEASIBLE} else "unknown"
+            return cp_model.INFEASIBLE if statuses == {cp_model.INFEASIBLE} else cp_model.UNKNOWN
+        print(f"Portfolio winner: {winner.variant} ({winner.stop_reason}, {winner.wall_time:.2f}s)")
+        # The winner's placements are written into the intervals, which are now the current solution
+        self._solution_table, self._cached_solution, self._materialized = None, None, True
+        for i in self.ctx.all_intervals:
+            real = winner.assignment.get(self.ctx.interval_key(i))
+            if real is None:
+                i.actual_interval = i.actual_interval.clear_interval()
+            else:
+                i.actual_interval = i.actual_interval.set_interval(*real)
+        self._stop_reason = winner.stop_reason
+        return winner.status
+
+    def repair(self, changed_task_ids: list[uuid.UUID], previous: dict[str, tuple[int, int] | None] | None = None,
+               max_rounds: int = 3):
+        """
+        Re-solves only the neighbourhood of changed tasks (see repair_neighbourhood); every other
+        interval is pinned to its previous placement, taken from `previous` or else from its
+        actual_interval. Pinned intervals only enter the model as constants in the constraints they
+        share with free ones. A round without a feasible schedule is retried with a wider
+        neighbourhood, up to max_rounds rounds. Replaces build_model() and solve(); the pinned
+        field is restored afterwards.
+        """
+        interval_map = self.task_pool.get_intervals(*self.schedule_range)
+        self._ctx = SchedulingContext(model=self.model, task_pool=self.task_pool, interval_map=interval_map,
+                                      schedule_range=self.schedule_range, unit_length=self.unit_length,
+                                      anonymous_vars=self.anonymous_vars)
+        if previous is None:
+            changed = {self.ctx.interval_key(i) for t in changed_task_ids for i in interval_map.get(t, [])}
+            previous = {k: v for k, v in self._current_assignment().items() if k not in changed}
+        status = cp_model.UNKNOWN
+        pinned = self.pinned
+        try:
+            for widening in range(max_rounds):
+                self._repair_rounds = widening + 1
+                free = repair_neighbourhood(self.ctx, self.task_pool.constraints, changed_task_ids, widening)
+                print(f"Repair round {widening + 1}: {len(free)} intervals free.")
+                self.pinned = {k: v for k, v in previous.items() if k not in free}
+                self.model = cp_model.CpModel()
+                self.build_model()
+                status = self.solve()
+                if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+                    break
+        finally:
+            self.pinned = pinned
+        return status
@@ -1,4 +1,6 @@
+import datetime as DT
 import uuid
+from math import ceil
 from typing import TYPE_CHECKING, Any
 from ortools.sat.python import cp_model
 from vivia_v4.templates import ScheduleInterval
@@ -8,19 +10,35 @@ if TYPE_CHECKING:
 
 class SchedulingContext:
     def __init__(self, model: cp_model.CpModel, task_pool: "ViviaTaskPool", 
-                 interval_map: dict[uuid.UUID, list[ScheduleInterval]]):
+                 interval_map: dict[uuid.UUID, list[ScheduleInterval]],
+                 schedule_range: tuple[DT.datetime, DT.datetime] | None = None,
+                 unit_length: DT.timedelta | None = None, anonymous_vars: bool = False):
         self.model = model
         self.task_pool = task_pool
         self._interval_map = interval_map
-        self._caches: dict[str, Any] = {}
+        self.schedule_range = schedule_range
+        self.unit_length = unit_length
+        self.anonymous_vars = anonymous_vars
+        self._caches: dict[str, Any] | None = None
+        self._task_map: dict[uuid.UUID, Any] | None = None
+        self._interval_keys: dict[uuid.UUID, str] | None = None
+        self._interval_tasks: dict[uuid.UUID, uuid.UUID] | None = None
+        self._interval_groups: dict[uuid.UUID, frozenset[str]] | None = None
+        # Intervals kept at a previous placement (None: absent); they get no CP variables
+        self.pinned: dict[uuid.UUID, tuple[int, int] | None] = {}
+        self._pinned_intervals: dict[tuple[uuid.UUID, int], cp_model.IntervalVar] = {}
         
         # Flatten intervals
         self._all_intervals = []
         for intervals in self._interval_map.values():
             self._all_intervals.extend(intervals)
-            
-        # Build caches
-        self._build_caches()
+
+    def _index_cache(self, index_type: str) -> Any:
+        """The merged cache of the pool's indexes of a type, built on first use"""
+        if self._caches is None:
+            self._caches = {}
+            self._build_caches()
+        return self._caches.get(index_type, {})
 
     def _build_caches(self):
         for index in self.task_pool.indexes:
@@ -43,17 +61,87 @@ class SchedulingContext:
                                  # For IdIndex, just overwrite
                                  existing[k] = v
 
+    def to_units(self, delta: DT.timedelta) -> int:
+        """Converts a time span into scheduler units, rounding up so gaps are never shortened"""
+        if self.unit_length is None:
+            raise ValueError("unit_length is required to convert time spans into units")
+        return ceil(delta / self.unit_length)
+
+    def unit_bounds(self, interval: ScheduleInterval) -> tuple[int, int, int, int, int, int]:
+        """Start, end and duration bounds of an interval in units, discretized exactly like its CP variables"""
+        return interval.unit_bounds(self.schedule_range[0], self.unit_length)
+
+    def var_name(self, *parts: object) -> str:
+        """A CP variable name joined from parts, or an empty name without the string work in anonymous mode"""
+        if self.anonymous_vars:
+            return ""
+        return "".join(str(p) for p in parts)
+
+    def var_bounds(self, var: cp_model.IntVar) -> tuple[int, int]:
+        """Lower and upper bound of a CP variable's domain"""
+        domain = self.model.Proto().variables[var.Index()].domain
+        return domain[0], domain[len(domain) - 1]
+
+    def pinned_targets(self, intervals: list[ScheduleInterval]) -> list[ScheduleInterval]:
+        """The intervals pinned present, in order"""
+        return [i for i in intervals if self.pinned.get(i.id) is not None]
+
+    def pinned_interval(self, interval: ScheduleInterval, padding: int = 0) -> cp_model.IntervalVar:
+        """A constant interval at the pinned placement, its end padded by padding units; made once per padding"""
+        key = (interval.id, padding)
+        if key not in self._pinned_intervals:
+            start, end = self.pinned[interval.id]
+            self._pinned_intervals[key] = self.model.NewFixedSizeIntervalVar(
+                start, end - start + padding, self.var_name(interval.name, "_pinned_interval_var"))
+        return self._pinned_intervals[key]
+
     @property
     def all_intervals(self) -> list[ScheduleInterval]:
         return self._all_intervals
 
+    def get_task(self, task_id: uuid.UUID | None) -> Any:
+        if self._task_map is None:
+            self._task_map = {t.id: t for t in self.task_pool.tasks}
+        return self._task_map.get(task_id)
+
+    def interval_key(self, interval: ScheduleInterval) -> str:
+        """
+        Deterministic identity of an interval: its task id and its position among the task's
+        intervals. Unlike interval ids, which lazily generated intervals draw at random, it is
+        the same for every build of an unchanged pool over the same range.
+        """
+        if self._interval_keys is None:
+            self._interval_keys = {
+                i.id: f"{task_id}:{k}"
+                for task_id, intervals in self._interval_map.items()
+                for k, i in enumerate(intervals)
+            }
+        return self._interval_keys[interval.id]
+
+    def task_id_of(self, interval: ScheduleInterval) -> uuid.UUID | None:
+        """The id of the task an interval was generated from, by the interval map"""
+        if self._interval_tasks is None:
+            self._interval_tasks = {
+                i.id: task_id for task_id, intervals in self._interval_map.items() for i in intervals}
+        return self._interval_tasks.get(interval.id)
+
     def get_intervals_by_task_id(self, task_id: uuid.UUID) -> list[ScheduleInterval]:
         return self._interval_map.get(task_id, [])
 
     def get_intervals_by_group_name(self, group_name: str) -> list[ScheduleInterval]:
-        cache = self._caches.get('group_index', {})
+        cache = self._index_cache('group_index')
         return cache.get(group_name, [])
 
     def get_intervals_by_label(self, label: str) -> list[ScheduleInterval]:
-        cache = self._caches.get('label_index', {})
+        cache = self._index_cache('label_index')
         return cache.get(label, [])
+
+    def group_names(self, interval: ScheduleInterval) -> frozenset[str]:
+        """Every group the interval belongs to, by its task or by its own id"""
+        if self._interval_groups is None:
+            groups: dict[uuid.UUID, set[str]] = {}
+            for name, intervals in self._index_cache('group_index').items():
+                for i in intervals:
+                    groups.setdefault(i.id, set()).add(name)
+            self._interval_groups = {k: frozenset(v) for k, v in groups.items()}
+        return self._interval_groups.get(interval.id, frozenset())
@@ -0,0 +1,99 @@
+import threading
+import time
+
+from ortools.sat.python import cp_model
+from pydantic import BaseModel, Field
+
+from vivia_v4.checkpoint import CheckpointWriter
+
+
+class TerminationPolicy(BaseModel):
+    """When to stop a solve before CP-SAT proves optimality"""
+    relative_gap: float | None = Field(
+        description="Stop once |bound - objective| / max(1, |objective|) drops to this value", default=None, ge=0)
+    stagnation_seconds: float | None = Field(
+        description="Stop when no better solution was found for this many wall-clock seconds", default=None, gt=0)
+
+
+class SearchMonitor(cp_model.CpSolverSolutionCallback):
+    """
+    Solution callback enforcing a TerminationPolicy. The gap is checked on every new solution;
+    stagnation is watched by a timer that is re-armed whenever the objective improves and, once it
+    fires, stops the solver from its own thread. Improving solutions are handed to the checkpoint
+    writer, if any.
+    """
+
+    def __init__(self, solver: cp_model.CpSolver, policy: TerminationPolicy | None, has_objective: bool,
+                 checkpoint: CheckpointWriter | None = None):
+        super().__init__()
+        self._solver = solver
+        self._policy = policy or TerminationPolicy()
+        self._has_objective = has_objective
+        self._checkpoint = checkpoint
+        self._best: float | None = None
+        self._timer: threading.Timer | None = None
+        self._lock = threading.Lock()
+        self.stop_reason: str | None = None
+        self.solution_count = 0
+        self.last_improvement = time.monotonic()
+
+    def on_solution_callback(self) -> None:
+        self.solution_count += 1
+        if not self._has_objective:
+            if self._checkpoint is not None:
+                self._checkpoint.record(self.response_proto.solution, None)
+            return
+        objective = self.ObjectiveValue()
+        if self._best is None or objective != self._best:
+            self._best = objective
+            self.last_improvement = time.monotonic()
+            self._arm_stagnation_timer()
+            if self._checkpoint is not None:
+                self._checkpoint.record(self.response_proto.solution, objective)
+        gap_limit = self._policy.relative_gap
+        if gap_limit is not None:
+            gap = abs(self.BestObjectiveBound() - objective) / max(1.0, abs(objective))
+            if gap <= gap_limit:
+                self._stop("gap")
+
+    def _arm_stagnation_timer(self) -> None:
+        if self._policy.stagnation_seconds is None:
+            return
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+            if self.stop_reason is not None:
+                return
+            self._timer = threading.Timer(self._policy.stagnation_seconds, self._stop, args=("stagnation",))
+            self._timer.daemon = True
+            self._timer.start()
+
+    def _stop(self, reason: str) -> None:
+        with self._lock:
+            if self.stop_reason is None:
+                self.stop_reason = reason
+        self._solver.StopSearch()
+
+    def close(self) -> None:
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+        if self._checkpoint is not None:
+            self._checkpoint.close()
+
+
+def describe_stop(status: int, solver: cp_model.CpSolver, monitor: SearchMonitor | None) -> str:
+    """Why a solve ended: optimal, infeasible, gap, stagnation, time_limit or unknown"""
+    if monitor is not None and monitor.stop_reason is not None:
+        return monitor.stop_reason
+    if status == cp_model.OPTIMAL:
+        return "optimal"
+    if status == cp_model.INFEASIBLE:
+        return "infeasible"
+    if status == cp_model.MODEL_INVALID:
+        return "model_invalid"
+    limit = solver.parameters.max_time_in_seconds
+    if solver.WallTime() >= limit * 0.99:
+        return "time_limit"
+    return "unknown"
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import threading
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from vivia_v4.task_pool import ViviaTaskPool
+
+
+def canonical_pool_json(pool: ViviaTaskPool) -> str:
+    """
+    The pool's definition as JSON, without anything a solve or lazy generation writes back: solved
+    actual_intervals are dropped, and the period containers of FixedPeriodTask, which are derived
+    from period_items on demand, are left out entirely. Serialized in one pass by pydantic.
+    """
+    exclude: dict[int, Any] = {}
+    for k, task in enumerate(pool.tasks):
+        if task.template_type == "fixed_period":
+            exclude[k] = {"container": True}
+        elif hasattr(task.container, "intervals"):
+            exclude[k] = {"container": {"intervals": {"__all__": {"actual_interval"}}}}
+    return pool.model_dump_json(exclude={"tasks": exclude} if exclude else None)
+
+
+def pool_digest(pool: ViviaTaskPool) -> str:
+    """sha256 of the pool's canonical JSON, the pool part of every cache key"""
+    return hashlib.sha256(canonical_pool_json(pool).encode("utf-8")).hexdigest()
+
+
+def content_hash(*parts: object) -> str:
+    """sha256 over the canonical (sorted-key, compact) JSON of the given JSON-compatible parts"""
+    payload = json.dumps(parts, sort_keys=True, separators=(",", ":"), ensure_ascii=False)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class CachedSolution(BaseModel):
+    """A solve result in scheduler units, keyed by deterministic interval identity"""
+    status: int
+    stop_reason: str | None = None
+    assignment: dict[str, tuple[int, int] | None] = Field(
+        description="interval key -> (start, end) in units from the schedule start, "
+                    "None when absent",
+        default_factory=dict)
+
+
+class BoundedCache[EntryType](ABC):
+    """
+    Bounded two-level cache: an in-memory LRU in front of one file per entry on disk. Entries are
+    grouped by pool id so every write of a pool can drop them at once. Subclasses define how an
+    entry is encoded into the file.
+    """
+    suffix = ".bin"
+
+    def __init__(self, directory: str | None = None, max_entries: int = 256,
+                 max_disk_entries: int = 4096) -> None:
+        self.directory = directory
+        self.max_entries = max_entries
+        self.max_disk_entries = max_disk_entries
+        self._memory: OrderedDict[tuple[int, str], EntryType] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @abstractmethod
+    def encode(self, entry: EntryType) -> bytes:
+        pass
+
+    @abstractmethod
+    def decode(self, data: bytes) -> EntryType:
+        pass
+
+    def _path(self, directory: str, pool_id: int, key: str) -> str:
+        return os.path.join(directory, f"{pool_id}_{key}{self.suffix}")
+
+    def get(self, pool_id: int, key: str) -> EntryType | None:
+        with self._lock:
+            hit = self._memory.get((pool_id, key))
+            if hit is not None:
+                self._memory.move_to_end((pool_id, key))
+                return hit
+        if self.directory is None:
+            return None
+        try:
+            with open(self._path(self.directory, pool_id, key), 'rb') as f:
+                hit = self.decode(f.read())
+        except (OSError, ValueError):
+            return None
+        self._remember(pool_id, key, hit)
+        return hit
+
+    def put(self, pool_id: int, key: str, entry: EntryType) -> None:
+        self._remember(pool_id, key, entry)
+        if self.directory is None:
+            return
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(self.directory, pool_id, key), 'wb') as f:
+            f.write(self.encode(entry))
+        self._trim_disk(self.directory)
+
+    def invalidate(self, pool_id: int) -> None:
+        """Drops every entry of a pool, in memory and on disk"""
+        with self._lock:
+            for k in [k for k in self._memory if k[0] == pool_id]:
+                del self._memory[k]
+        if self.directory is None or not os.path.isdir(self.directory):
+            return
+        prefix = f"{pool_id}_"
+        for name in os.listdir(self.directory):
+            if name.startswith(prefix) and name.endswith(self.suffix):
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                except OSError:
+                    pass
+
+    def _remember(self, pool_id: int, key: str, entry: EntryType) -> None:
+        with self._lock:
+            self._memory[(pool_id, key)] = entry
+            self._memory.move_to_end((pool_id, key))
+            while len(self._memory) > self.max_entries:
+                self._memory.popitem(last=False)
+
+    def _trim_disk(self, directory: str) -> None:
+        entries = [os.path.join(directory, n)
+                   for n in os.listdir(directory) if n.endswith(self.suffix)]
+        if len(entries) <= self.max_disk_entries:
+            return
+        entries.sort(key=lambda p: os.path.getmtime(p))
+        for path in entries[: len(entries) - self.max_disk_entries]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class SolveCache(BoundedCache[CachedSolution]):
+    """Solve results, stored as one JSON file per entry"""
+    suffix = ".json"
+
+    def encode(self, entry: CachedSolution) -> bytes:
+        return entry.model_dump_json().encode("utf-8")
+
+    def decode(self, data: bytes) -> CachedSolution:
+        return CachedSolution.model_validate_json(data)
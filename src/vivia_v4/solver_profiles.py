@@ -0,0 +1,59 @@
+from pydantic import BaseModel, Field
+from ortools.sat.python import cp_model
+
+
+class SolverProfile(BaseModel):
+    """A named set of CP-SAT parameters, trading solve latency against schedule quality"""
+    name: str
+    max_time_in_seconds: float | None = Field(description="Wall-clock limit of one solve", default=None, gt=0)
+    num_workers: int | None = Field(description="Parallel search workers, 0 means all cores", default=None, ge=0)
+    relative_gap_limit: float | None = Field(
+        description="Stop once the objective is proven within this relative gap of the optimum", default=None, ge=0)
+    deterministic: bool = Field(
+        description="Interleave the workers and use a fixed seed so repeated solves give the same result",
+        default=False)
+    max_deterministic_time: float | None = Field(
+        description="Limit in deterministic time units, reproducible unlike wall-clock limits", default=None, gt=0)
+    random_seed: int | None = None
+
+    def capped(self, max_time_in_seconds: float | None = None, max_workers: int | None = None) -> "SolverProfile":
+        """A copy that respects a tenant's time and worker caps"""
+        update = {}
+        if max_time_in_seconds is not None:
+            update["max_time_in_seconds"] = min(self.max_time_in_seconds or max_time_in_seconds, max_time_in_seconds)
+        if max_workers is not None and max_workers > 0:
+            workers = self.num_workers or max_workers  # 0 or unset would take every core
+            update["num_workers"] = min(workers, max_workers)
+        return self.model_copy(update=update)
+
+    def apply(self, solver: cp_model.CpSolver) -> None:
+        params = solver.parameters
+        if self.max_time_in_seconds is not None:
+            params.max_time_in_seconds = self.max_time_in_seconds
+        if self.num_workers is not None:
+            params.num_workers = self.num_workers
+        if self.relative_gap_limit is not None:
+            params.relative_gap_limit = self.relative_gap_limit
+        if self.max_deterministic_time is not None:
+            params.max_deterministic_time = self.max_deterministic_time
+        if self.deterministic:
+            params.interleave_search = True
+            params.random_seed = self.random_seed if self.random_seed is not None else 0
+        elif self.random_seed is not None:
+            params.random_seed = self.random_seed
+
+
+SOLVER_PROFILES: dict[str, SolverProfile] = {
+    "interactive": SolverProfile(name="interactive", max_time_in_seconds=2.0, num_workers=4, relative_gap_limit=0.01),
+    "batch": SolverProfile(name="batch", max_time_in_seconds=120.0, num_workers=0),
+    "deterministic": SolverProfile(name="deterministic", num_workers=4, deterministic=True, max_deterministic_time=20.0),
+}
+
+
+def get_solver_profile(name: str, overrides: dict[str, SolverProfile] | None = None) -> SolverProfile:
+    """Looks a profile up in the overrides first, then in the built-in SOLVER_PROFILES"""
+    if overrides and name in overrides:
+        return overrides[name]
+    if name in SOLVER_PROFILES:
+        return SOLVER_PROFILES[name]
+    raise ValueError(f"Unknown solver profile {name!r}")
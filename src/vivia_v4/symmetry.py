@@ -0,0 +1,41 @@
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from vivia_v4.scheduling_context import SchedulingContext
+    from vivia_v4.templates import ScheduleInterval
+
+
+def find_interchangeable_intervals(ctx: "SchedulingContext") -> list[list["ScheduleInterval"]]:
+    """
+    Groups of two or more intervals that no constraint or objective can tell apart: same source
+    task, windows, duration bounds, mandatory flag, priority, labels, group memberships and
+    allowed windows.
+    Groups keep the intervals' order in their task, so the ordering is the same on every build.
+    """
+    groups: dict[tuple, list["ScheduleInterval"]] = {}
+    for task_id, intervals in ctx._interval_map.items():
+        for i in intervals:
+            if i._cp_model_vars.is_empty():
+                continue
+            signature = (task_id, i.start_interval, i.end_interval, i.duration_interval, i.mandatory,
+                         i.priority, frozenset(i.labels), ctx.group_names(i), tuple(i.allowed_windows or ()))
+            groups.setdefault(signature, []).append(i)
+    return [g for g in groups.values() if len(g) > 1]
+
+
+def break_symmetries(ctx: "SchedulingContext") -> int:
+    """
+    Orders each group of interchangeable intervals so that only one of their permutations stays
+    feasible: optional copies are used front to back (presence[k+1] <= presence[k]) and present
+    copies start in order. Returns how many groups were ordered.
+    """
+    groups = find_interchangeable_intervals(ctx)
+    for group in groups:
+        for a, b in zip(group, group[1:]):
+            va, vb = a._cp_model_vars, b._cp_model_vars
+            if a.mandatory:
+                ctx.model.Add(va.start <= vb.start)
+            else:
+                ctx.model.AddImplication(vb.presence, va.presence)
+                ctx.model.Add(va.start <= vb.start).OnlyEnforceIf(vb.presence)
+    return len(groups)
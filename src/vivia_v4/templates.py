@@ -1,14 +1,19 @@
+import calendar
 import datetime as DT
 from pydantic import AwareDatetime
+import re
 import uuid
 from abc import ABC, abstractmethod
-from typing import Annotated, Any, Literal, Self, TYPE_CHECKING
+from typing import Annotated, Any, Iterator, Literal, Self, TYPE_CHECKING
 
+import numpy as np
 from ortools.sat.python import cp_model
-from pydantic import BaseModel, Field, PrivateAttr, model_validator
+from ortools.sat.python.cp_model import Domain
+from pydantic import AfterValidator, BaseModel, Field, PrivateAttr, model_validator
 
 from vivia_v4.model_definitions import IntervalValidationMixin, TimeDelta
-from vivia_v4.utils import IntervalUtil, Period
+from vivia_v4.utils import CalendarPeriod, IntervalUtil
+import vivia_v4.validators as VD
 from vivia_v4.validators import ensure_all_or_none, validate_field_types
 from vivia_v4.constraints import constraint, ALL_CONSTRAINTS
 
@@ -58,6 +63,13 @@ class RealInterval(BaseModel):
         return data
 
 
+# RealInterval is frozen, so intervals can share the unsolved one
+_EMPTY_REAL_INTERVAL = RealInterval()
+_MICROSECOND = DT.timedelta(microseconds=1)
+# The fields ScheduleInterval.trusted counts as explicitly set
+_TRUSTED_FIELDS = ("name", "mandatory", "priority", "start_interval", "end_interval", "duration_interval")
+
+
 class CPModelVariables(BaseModel):
     start: cp_model.IntVar | None = None
     end: cp_model.IntVar | None = None
@@ -90,6 +102,38 @@ class CPModelVariables(BaseModel):
     def clear_model_vars(self) -> 'CPModelVariables':
         return CPModelVariables()
 
+
+class CPVarHandle:
+    """
+    The CP variables of one interval, as used while building and reading a model: a plain slotted
+    object with CPModelVariables' attributes and methods, but no validation per interval.
+    validated() returns the checked pydantic form for debugging.
+    """
+    __slots__ = ("start", "end", "presence", "interval")
+
+    def __init__(self, start: cp_model.IntVar | None = None, end: cp_model.IntVar | None = None,
+                 presence: cp_model.IntVar | None = None, interval: cp_model.IntervalVar | None = None):
+        self.start = start
+        self.end = end
+        self.presence = presence
+        self.interval = interval
+
+    def is_empty(self) -> bool:
+        return self.start is None and self.end is None and self.presence is None and self.interval is None
+
+    def set_model_vars(self, start: cp_model.IntVar, end: cp_model.IntVar, presence: cp_model.IntVar,
+                       interval: cp_model.IntervalVar) -> 'CPVarHandle':
+        return CPVarHandle(start, end, presence, interval)
+
+    def clear_model_vars(self) -> 'CPVarHandle':
+        return CPVarHandle()
+
+    def validated(self) -> CPModelVariables:
+        return CPModelVariables(start=self.start, end=self.end, presence=self.presence, interval=self.interval)
+
+    def __repr__(self) -> str:
+        return f"CPVarHandle(start={self.start}, end={self.end}, presence={self.presence}, interval={self.interval})"
+
 class ScheduleInterval(IntervalValidationMixin[AwareDatetime, TimeDelta]):
     name: str = Field(description="The name of the interval")
     mandatory: bool = Field(description="Whether the interval is mandatory")
@@ -97,46 +141,109 @@ class ScheduleInterval(IntervalValidationMixin[AwareDatetime, TimeDelta]):
     id: uuid.UUID = Field(default_factory=uuid.uuid4, description="The id of the interval")
    
     actual_interval: RealInterval = Field(default_factory=RealInterval)
-    _cp_model_vars: CPModelVariables = PrivateAttr(default_factory=CPModelVariables)
+    _cp_model_vars: CPVarHandle = PrivateAttr(default_factory=CPVarHandle)
     _source_task_id: uuid.UUID | None = PrivateAttr(default=None)
     labels: set[str] = Field(description="Labels for grouping and querying", default_factory=set)
+    allowed_windows: list[Annotated[tuple[AwareDatetime, AwareDatetime], AfterValidator(VD.validate_interval)]] | None = Field(
+        description="Windows the interval must lie entirely inside one of, sorted and disjoint; None allows "
+                    "any placement within the start and end intervals",
+        default=None)
+
+    @classmethod
+    def trusted(cls, name: str, mandatory: bool, priority: int,
+                start_interval: tuple[DT.datetime, DT.datetime], end_interval: tuple[DT.datetime, DT.datetime],
+                duration_interval: tuple[DT.timedelta, DT.timedelta],
+                source_task_id: uuid.UUID | None = None, interval_id: uuid.UUID | None = None,
+                allowed_windows: list[tuple[DT.datetime, DT.datetime]] | None = None) -> "ScheduleInterval":
+        """
+        Builds an interval without validation, for templates deriving it from bounds they already
+        validated. Input from outside goes through the validating constructor.
+        """
+        interval = cls.model_construct(
+            set(_TRUSTED_FIELDS), name=name, mandatory=mandatory, priority=priority,
+            start_interval=start_interval, end_interval=end_interval, duration_interval=duration_interval,
+            id=uuid.uuid4() if interval_id is None else interval_id, actual_interval=_EMPTY_REAL_INTERVAL,
+            labels=set(), allowed_windows=allowed_windows)
+        interval._source_task_id = source_task_id
+        return interval
 
     def create_cp_model_vars(
         self, cp_model: cp_model.CpModel,
         schedule_start: DT.datetime, schedule_end: DT.datetime,
-        unit_length: DT.timedelta) -> CPModelVariables:
+        unit_length: DT.timedelta, enforce_mandatory: bool = True, named: bool = True) -> CPVarHandle:
 
         if not IntervalUtil.is_contained((self.start_interval[0], self.end_interval[1]), (schedule_start, schedule_end)):
             raise ValueError("Inproper interval, it is not contained in the schedule domain")
+        min_start, max_start, min_end, max_end, min_duration, max_duration = self.unit_bounds(schedule_start, unit_length)
+        # Unnamed variables keep the proto small; names only help when reading a dumped model
+        suffixes = ("_start_var", "_end_var", "_duration_var", "_presence_var", "_interval_var")
+        names = [self.name + s for s in suffixes] if named else [""] * len(suffixes)
+        windows = None
+        if self.allowed_windows is not None:
+            windows = self.window_units(schedule_start, unit_length)
+        if windows:
+            # One variable over the union of the windows replaces an alternative per window
+            start_domain = Domain.FromIntervals([[lo, hi - min_duration] for lo, hi in windows]) \
+                .intersection_with(Domain(min_start, max_start))
+            end_domain = Domain.FromIntervals([[lo + min_duration, hi] for lo, hi in windows]) \
+                .intersection_with(Domain(min_end, max_end))
+            if start_domain.is_empty() or end_domain.is_empty():
+                windows = []
+        if windows:
+            start_var = cp_model.NewIntVarFromDomain(start_domain, names[0])
+            end_var = cp_model.NewIntVarFromDomain(end_domain, names[1])
+        else:
+            start_var = cp_model.NewIntVar(min_start, max_start, names[0])
+            end_var = cp_model.NewIntVar(min_end, max_end, names[1])
+        duration_var = cp_model.NewIntVar(min_duration, max_duration, names[2])
+        presence_var = cp_model.NewBoolVar(names[3])
+        interval_var = cp_model.NewOptionalIntervalVar(
+            start_var, duration_var, end_var, presence_var, names[4]
+        )
+        if windows == []:
+            cp_model.Add(presence_var == 0)  # no window fits the interval
+        elif windows and min_duration < max_duration:
+            # Start and end may then fall into different windows; fixed intervals over the holes
+            # between the windows keep the interval inside one
+            holes = [cp_model.NewFixedSizeIntervalVar(a[1], b[0] - a[1], "") for a, b in zip(windows, windows[1:])]
+            if holes:
+                cp_model.AddNoOverlap([interval_var] + holes)
+        if self.mandatory and enforce_mandatory:
+            cp_model.Add(presence_var == 1)
+        self._cp_model_vars = CPVarHandle(start_var, end_var, presence_var, interval_var)
+        return self._cp_model_vars
+
+    def unit_bounds(self, schedule_start: DT.datetime, unit_length: DT.timedelta) -> tuple[int, int, int, int, int, int]:
+        """
+        Start, end and duration bounds in units, as the CP variables get them: lower bounds round
+        up, upper bounds round down but never below the lower bound.
+        """
         from math import ceil
         def interval2unit(interval: tuple[DT.datetime, DT.datetime]) -> tuple[int, int]:
             lb = ceil((interval[0] - schedule_start) / unit_length)
             rb = (interval[1] - schedule_start) // unit_length
             return (lb, max(lb, rb))
-        start = interval2unit(self.start_interval)
-        end = interval2unit(self.end_interval)
-        duration = ceil(self.duration_interval[0] / unit_length), self.duration_interval[1] // unit_length
-        duration = (min(duration[0], duration[1]), duration[1])
-        min_start, max_start = start
-        min_end, max_end = end
-        min_duration, max_duration = duration
-        start_var = cp_model.NewIntVar(min_start, max_start, self.name + "_start_var")
-        end_var = cp_model.NewIntVar(min_end, max_end, self.name + "_end_var")
-        duration_var = cp_model.NewIntVar(min_duration, max_duration, self.name + "_duration_var")
-        presence_var = cp_model.NewBoolVar(self.name + "_presence_var")
-        interval_var = cp_model.NewOptionalIntervalVar(
-            start_var, duration_var, end_var, presence_var, self.name + "_interval_var"
-        )
-        if self.mandatory:
-            cp_model.Add(presence_var == 1)
-        cp_model_vars = self._cp_model_vars.set_model_vars(
-            start=start_var,
-            end=end_var,
-            presence=presence_var,
-            interval=interval_var,
-        )
-        self._cp_model_vars = cp_model_vars
-        return self._cp_model_vars
+        s_lo, s_hi = interval2unit(self.start_interval)
+        e_lo, e_hi = interval2unit(self.end_interval)
+        d_hi = self.duration_interval[1] // unit_length
+        d_lo = min(ceil(self.duration_interval[0] / unit_length), d_hi)
+        return s_lo, s_hi, e_lo, e_hi, d_lo, d_hi
+
+    def window_units(self, schedule_start: DT.datetime, unit_length: DT.timedelta) -> list[tuple[int, int]]:
+        """
+        allowed_windows in whole units, discretized like create_cp_model_vars: shrunk to unit
+        boundaries, merged where they meet, and without those shorter than the minimum duration.
+        """
+        from math import ceil
+        min_duration = self.unit_bounds(schedule_start, unit_length)[4]
+        merged: list[tuple[int, int]] = []
+        for lo, hi in sorted((ceil((a - schedule_start) / unit_length), (b - schedule_start) // unit_length)
+                             for a, b in self.allowed_windows or []):
+            if merged and lo <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            else:
+                merged.append((lo, hi))
+        return [(lo, hi) for lo, hi in merged if hi - lo >= min_duration]
 
     def interprete_cp_model_vars(self, cp_solver: cp_model.CpSolver, schedule_start: DT.datetime, schedule_end: DT.datetime, unit_length: DT.timedelta):
         def unit_interval2datetime(interval):
@@ -194,17 +301,17 @@ class ExactDateTask(Tasktemplate, IntervalValidationMixin[AwareDatetime, TimeDel
     def initialize(self) -> Self:
         if not self.container.intervals:
             intervals = []
+            # The bounds were validated on this task, so the copies skip validation
             for i in range(self.repeatition):
-                new_interval = ScheduleInterval(
+                intervals.append(ScheduleInterval.trusted(
                     name=self.name + str(i),
                     mandatory=self.mandatory,
                     priority=self.priority,
                     start_interval=self.start_interval,
                     end_interval=self.end_interval,
                     duration_interval=self.duration_interval,
-                )
-                new_interval._source_task_id = self.id
-                intervals.append(new_interval)
+                    source_task_id=self.id,
+                ))
             self.container.intervals = intervals
         return self
     def get_intervals(self, start: DT.datetime, end: DT.datetime) -> list[ScheduleInterval]:
@@ -224,16 +331,22 @@ class FixedPeriodTask(Tasktemplate):
     effective_interval: tuple[AwareDatetime, AwareDatetime]
     period_items: list[RelativePeriodItem]
     container: list[Interval_List_Timestamped] = Field(description="The List of the intervals", default=list())
+    calendar_zone: str | None = Field(
+        description="IANA zone whose wall clock the periods follow, e.g. 'Europe/Berlin'; the period length "
+                    "must then be whole days. None keeps periods of fixed length from anchor_date",
+        default=None)
     _offset_lb: TimeDelta = PrivateAttr()# how much the really possible leftbound is offset from the period start
     _offset_rb: TimeDelta = PrivateAttr()# how much the really possible rightbound is offset from the period start
-    _period: Period = PrivateAttr()
+    _calendar: CalendarPeriod | None = PrivateAttr(default=None)
+    _item_offsets: np.ndarray = PrivateAttr()# items x (start lb, start rb, end lb, end rb) from the period start, in microseconds
+    _stamped: dict[DT.datetime, Interval_List_Timestamped] = PrivateAttr()# container by time_stamp
     @model_validator(mode="after")
     def validate_active_days(self):
         """
         Validates configuration and initializes internal state.
         
         Calculates the full period length and the bounding box of offsets (_offset_lb, _offset_rb)
-        based on the provided period_items. Initializes the helper Period object.
+        based on the provided period_items. Initializes the CalendarPeriod of a calendar_zone.
         """
         def validate_indices():
             """Checks if the active_index is valid, it ranges from 0 to period_unit_num - 1"""
@@ -250,14 +363,31 @@ class FixedPeriodTask(Tasktemplate):
                 all_end.append(item.active_index * self.period_unit_len + item.end_interval[1])
             self._offset_lb = min(all_start)  # the left most possible start time of an interval in a period
             self._offset_rb = max(all_end)    # the right most possible end time of an interval in a period
+            rows = []
+            for item in self.period_items:
+                shift = item.active_index * self.period_unit_len
+                rows.append([(t + shift) // _MICROSECOND for t in (*item.start_interval, *item.end_interval)])
+            self._item_offsets = np.array(rows, dtype=np.int64).reshape(-1, 4)
 
         def initialize_period():
-            """Initializes the helper Period object"""
-            self._period = Period(self.anchor_date, self.period_unit_num * self.period_unit_len)
+            """Initializes the CalendarPeriod for a calendar_zone"""
+            if self.calendar_zone is not None:
+                if self.period_len % DT.timedelta(days=1):
+                    raise ValueError("a calendar_zone needs a period of whole days")
+                self._calendar = CalendarPeriod(self.anchor_date, "day", self.period_len.days, self.calendar_zone)
+
+        def index_container():
+            """Indexes the generated interval lists by time_stamp"""
+            self._stamped = {}
+            for x in self.container:
+                if x.time_stamp in self._stamped:
+                    raise ValueError("重复的时间组")
+                self._stamped[x.time_stamp] = x
 
         validate_indices()
         calculate_offsets()
         initialize_period()
+        index_container()
         return self
     @property
     def datetime_stamps(self):
@@ -265,60 +395,301 @@ class FixedPeriodTask(Tasktemplate):
     @property
     def period_len(self):
         return self.period_unit_len * self.period_unit_num
-    def _get_period_with_offset(self, target_time: AwareDatetime):
+    def _at(self, offset: DT.timedelta) -> DT.datetime:
+        """The datetime at an offset from the anchor, on the zone's wall clock for a calendar_zone"""
+        if self._calendar is None:
+            return self.anchor_date + offset
+        return self._calendar.localize(self._calendar.local_anchor + offset)
+    def _period_indices(self, start: DT.datetime, end: DT.datetime) -> range:
         """
-        Returns the period with offset applied to the left and right bounds, which is the real period occupied by the tasks.
+        Indices k of the periods, starting at anchor_date + k * period_len, whose occupied span
+        from _offset_lb to _offset_rb lies inside both (start, end) and effective_interval.
         """
-        p_start, _ = self._period.get_period(target_time=target_time)
-        occupied_start = p_start + self._offset_lb
-        occupied_end = p_start + self._offset_rb
-        return occupied_start, occupied_end
-    def _generate_period_intervals(self, target_time: AwareDatetime):
+        lo = max(start, self.effective_interval[0])
+        hi = min(end, self.effective_interval[1])
+        if self._calendar is None:
+            tz = self.anchor_date.tzinfo
+            origin, lo_local, hi_local = self.anchor_date, lo.astimezone(tz), hi.astimezone(tz)
+        else:
+            self._calendar.prepare(lo, hi)
+            origin, lo_local, hi_local = self._calendar.local_anchor, self._calendar.to_local(lo), self._calendar.to_local(hi)
+        first = -((origin + self._offset_lb - lo_local) // self.period_len)
+        last = (hi_local - origin - self._offset_rb) // self.period_len
+        if self._calendar is not None:
+            # Wall-clock indices can be one off next to a DST change; the exact bounds settle the edges
+            def fits(k: int) -> bool:
+                return lo <= self._at(k * self.period_len + self._offset_lb) and \
+                    self._at(k * self.period_len + self._offset_rb) <= hi
+            first, last = first - 1, last + 1
+            while first <= last and not fits(first):
+                first += 1
+            while last >= first and not fits(last):
+                last -= 1
+        return range(first, last + 1)
+    def _stamp(self, indices: range) -> list[list[list[DT.timedelta]]]:
+        """The item bounds of every period in indices as offsets from anchor_date, computed in one array operation"""
+        periods = np.arange(indices.start, indices.stop, dtype=np.int64)
+        offsets = periods[:, None, None] * (self.period_len // _MICROSECOND) + self._item_offsets[None, :, :]
+        return offsets.astype("timedelta64[us]").tolist()
+    def _build_period(self, time_stamp: DT.datetime, offsets: list[list[DT.timedelta]]) -> Interval_List_Timestamped:
         """
-        Generates the interval list for a single period, based on the target_time.
+        Creates the interval list of the period starting at time_stamp from its stamped item bounds.
         The time-stamp is the start of the period, not the occupied period start.
         """
-        pl, pb = self._period.get_period(target_time=target_time)
-        ext = [x for x in self.container if x.time_stamp == pl]
-        if len(ext) > 1:
-            raise ValueError("重复的时间组")
-        elif len(ext) == 1:
-            return ext[0]
-        new_interval_list: Interval_List_Timestamped = Interval_List_Timestamped(time_stamp=pl)
-        for item in self.period_items:
-            current_start_interval = (pl + item.start_interval[0] + item.active_index * self.period_unit_len,
-                                      pl + item.start_interval[1] + item.active_index * self.period_unit_len)
-            current_end_interval = (pl + item.end_interval[0] + item.active_index * self.period_unit_len,
-                                      pl + item.end_interval[1] + item.active_index * self.period_unit_len)
-            new_interval = ScheduleInterval(
+        intervals = []
+        zone_period = self._calendar
+        if zone_period is None:
+            at = self.anchor_date.__add__
+        else:
+            origin, localize = zone_period.local_anchor, zone_period.localize
+            at = lambda offset: localize(origin + offset)  # noqa: E731
+        # Shifting validated items by the period start keeps them valid, so no validation is rerun
+        for item, (s_lb, s_rb, e_lb, e_rb) in zip(self.period_items, offsets):
+            current_end_interval = (at(e_lb), at(e_rb))
+            intervals.append(ScheduleInterval.trusted(
                 name=self.name + f"{current_end_interval[0]}",
                 mandatory=self.mandatory,
                 priority=self.priority,
-                start_interval=current_start_interval,
+                start_interval=(at(s_lb), at(s_rb)),
                 end_interval=current_end_interval,
                 duration_interval=item.duration_interval,
-            )
-            new_interval._source_task_id = self.id
-            new_interval_list.intervals.append(new_interval)
+                source_task_id=self.id,
+            ))
+        new_interval_list = Interval_List_Timestamped.model_construct(time_stamp=time_stamp, intervals=intervals,
+                                                                      constraints=[])
         self.container.append(new_interval_list)
+        self._stamped[time_stamp] = new_interval_list
         return new_interval_list
+    def iter_intervals(self, start: AwareDatetime, end: AwareDatetime) -> Iterator[ScheduleInterval]:
+        """
+        Yields the intervals of every period inside (start, end) and the effective interval, in
+        period order. Periods already in the container are reused; the rest are created as they
+        are reached.
+        """
+        indices = self._period_indices(start, end)
+        if not indices:
+            return
+        for k, offsets in zip(indices, self._stamp(indices)):
+            time_stamp = self._at(k * self.period_len)
+            interval_list = self._stamped.get(time_stamp)
+            if interval_list is None:
+                interval_list = self._build_period(time_stamp, offsets)
+            yield from interval_list.intervals
     def get_intervals(self, start: AwareDatetime, end: AwareDatetime) -> list[ScheduleInterval]:
-        result: list[ScheduleInterval] = []
-        def fuck(p):
-            return IntervalUtil.is_contained(p, (start, end)) and IntervalUtil.is_contained(p, self.effective_interval)
-        current_time = start
-        p = self._get_period_with_offset(current_time)
-        if not fuck(p):
-            current_time += self.period_len
-            p = self._get_period_with_offset(current_time)
-        while fuck(p):
-            new_interval_list = self._generate_period_intervals(current_time)
-            result.extend(new_interval_list.intervals)
-            current_time += self.period_len
-            p = self._get_period_with_offset(current_time)
-        return result
-        if fuck(p):
-            pass
-        return super().get_intervals(start, end)
+        return list(self.iter_intervals(start, end))
     
-ALLTASKTEMPLATES = Annotated[ExactDateTask | FixedPeriodTask, Field(discriminator='template_type')]
+_WEEKDAYS = ("MO", "TU", "WE", "TH", "FR", "SA", "SU")
+_BYWEEKDAY = re.compile(r"^([+-]?\d{1,2})?(MO|TU|WE|TH|FR|SA|SU)$")
+
+
+class RRuleTask(Tasktemplate, IntervalValidationMixin[TimeDelta, TimeDelta]):
+    """
+    A task recurring on the days an RRULE-like rule picks, e.g. the second Tuesday of every month or
+    weekdays except holidays. Each occurrence is one interval whose bounds are offsets from the
+    local midnight of its day. Occurrences are not stored in the pool: they are enumerated for the
+    requested window only, starting at the first period of the rule inside it, and kept in memory
+    with ids derived from the task id and the day, so they stay the same across reloads.
+    """
+    template_type: Literal["rrule"] = Field(default="rrule", frozen=True)
+    freq: Literal["daily", "weekly", "monthly"]
+    interval: int = Field(description="Every how many days, weeks or months the rule repeats", default=1, ge=1)
+    dtstart: AwareDatetime = Field(description="The first day the rule may pick; its zone defines local days")
+    until: AwareDatetime | None = Field(description="The last day the rule may pick", default=None)
+    byweekday: list[str] = Field(
+        description="Weekdays as MO..SU; monthly rules take an ordinal in the month too, e.g. 2TU or -1FR",
+        default_factory=list)
+    bymonthday: list[int] = Field(description="Days of the month, negative counting from the end", default_factory=list)
+    exdates: list[DT.date] = Field(description="Local days left out", default_factory=list)
+    calendar_zone: str | None = Field(
+        description="IANA zone whose local days the occurrences follow; None uses dtstart's offset", default=None)
+    container: Interval_Container = Field(
+        description="Unused, occurrences are generated on demand", default_factory=Interval_Container)
+    _weekdays: list[tuple[int | None, int]] = PrivateAttr()  # (ordinal in the month or None, weekday)
+    _calendar: CalendarPeriod | None = PrivateAttr(default=None)
+    _occurrences: dict[DT.date, ScheduleInterval] = PrivateAttr(default_factory=dict)
+
+    @model_validator(mode="after")
+    def compile_rule(self) -> Self:
+        self._weekdays = []
+        for text in self.byweekday:
+            match = _BYWEEKDAY.match(text.upper())
+            if match is None:
+                raise ValueError(f"invalid byweekday {text!r}")
+            ordinal = int(match.group(1)) if match.group(1) else None
+            if ordinal is not None and (self.freq != "monthly" or ordinal == 0 or abs(ordinal) > 5):
+                raise ValueError(f"byweekday ordinals need a monthly rule and lie in -5..5, got {text!r}")
+            self._weekdays.append((ordinal, _WEEKDAYS.index(match.group(2))))
+        for day in self.bymonthday:
+            if day == 0 or abs(day) > 31:
+                raise ValueError(f"bymonthday must lie in -31..31 without 0, got {day}")
+        if self.calendar_zone is not None:
+            self._calendar = CalendarPeriod(self.dtstart, "day", 1, self.calendar_zone)
+        return self
+
+    def _local_date(self, t: DT.datetime) -> DT.date:
+        if self._calendar is None:
+            return t.astimezone(self.dtstart.tzinfo).date()
+        return self._calendar.to_local(t).date()
+
+    def _at(self, day: DT.date, offset: DT.timedelta) -> DT.datetime:
+        """The datetime at an offset from the local midnight of day"""
+        midnight = DT.datetime.combine(day, DT.time())
+        if self._calendar is None:
+            return midnight.replace(tzinfo=self.dtstart.tzinfo) + offset
+        return self._calendar.localize(midnight + offset)
+
+    def _fits(self, day: DT.date, start: DT.datetime, end: DT.datetime) -> bool:
+        return start <= self._at(day, self.start_interval[0]) and self._at(day, self.end_interval[1]) <= end
+
+    def _matches(self, day: DT.date) -> bool:
+        """Whether a day inside a repeating period passes the byweekday and bymonthday filters"""
+        if self._weekdays and not any(
+                weekday == day.weekday() and (ordinal is None or self._nth_in_month(day, ordinal))
+                for ordinal, weekday in self._weekdays):
+            return False
+        if self.bymonthday:
+            month_len = calendar.monthrange(day.year, day.month)[1]
+            if day.day not in self.bymonthday and day.day - month_len - 1 not in self.bymonthday:
+                return False
+        return True
+
+    @staticmethod
+    def _nth_in_month(day: DT.date, ordinal: int) -> bool:
+        if ordinal > 0:
+            return (day.day - 1) // 7 + 1 == ordinal
+        month_len = calendar.monthrange(day.year, day.month)[1]
+        return -((month_len - day.day) // 7 + 1) == ordinal
+
+    def _candidate_days(self, first: DT.date, last: DT.date) -> Iterator[DT.date]:
+        """
+        The days of the repeating periods meeting first..last, in order. Enumeration starts at the
+        period containing first, found arithmetically from dtstart, and only days the rule can pick
+        inside a period are produced.
+        """
+        anchor = self.dtstart.astimezone(self._calendar.zone if self._calendar else self.dtstart.tzinfo).date()
+        if self.freq == "daily":
+            k = max(0, -(-(first - anchor).days // self.interval))
+            day = anchor + DT.timedelta(days=k * self.interval)
+            while day <= last:
+                yield day
+                day += DT.timedelta(days=self.interval)
+        elif self.freq == "weekly":
+            week0 = anchor - DT.timedelta(days=anchor.weekday())
+            weekdays = sorted({w for _, w in self._weekdays}) or [anchor.weekday()]
+            k = max(0, (first - week0).days // 7 // self.interval)
+            week = week0 + DT.timedelta(weeks=k * self.interval)
+            while week <= last:
+                for w in weekdays:
+                    yield week + DT.timedelta(days=w)
+                week += DT.timedelta(weeks=self.interval)
+        else:
+            months = max(0, ((first.year - anchor.year) * 12 + first.month - anchor.month) // self.interval)
+            month_index = anchor.year * 12 + anchor.month - 1 + months * self.interval
+            while True:
+                year, month = divmod(month_index, 12)
+                month_start = DT.date(year, month + 1, 1)
+                if month_start > last:
+                    return
+                month_len = calendar.monthrange(year, month + 1)[1]
+                days: set[int] = set()
+                for d in self.bymonthday:
+                    days.add(d if d > 0 else month_len + d + 1)
+                for ordinal, weekday in self._weekdays:
+                    first_weekday = (weekday - month_start.weekday()) % 7 + 1
+                    if ordinal is None:
+                        days.update(range(first_weekday, month_len + 1, 7))
+                    elif ordinal > 0:
+                        days.add(first_weekday + 7 * (ordinal - 1))
+                    else:
+                        last_weekday = first_weekday + 7 * ((month_len - first_weekday) // 7)
+                        days.add(last_weekday + 7 * (ordinal + 1))
+                if not days:
+                    days.add(anchor.day)
+                for d in sorted(days):
+                    if 1 <= d <= month_len:
+                        yield DT.date(year, month + 1, d)
+                month_index += self.interval
+
+    def iter_intervals(self, start: AwareDatetime, end: AwareDatetime) -> Iterator[ScheduleInterval]:
+        """Yields the occurrences whose bounds lie inside (start, end), in day order"""
+        if self._calendar is not None:
+            self._calendar.prepare(start, end)
+        # One day of slack on each side; the exact bounds decide
+        first = max(self._local_date(start - self.start_interval[0]) - DT.timedelta(days=1),
+                    self._local_date(self.dtstart))
+        last = self._local_date(end - self.end_interval[1]) + DT.timedelta(days=1)
+        if self.until is not None:
+            last = min(last, self._local_date(self.until))
+        excluded = set(self.exdates)
+        for day in self._candidate_days(first, last):
+            if day < first or day > last or day in excluded or not self._matches(day) or not self._fits(day, start, end):
+                continue
+            interval = self._occurrences.get(day)
+            if interval is None:
+                interval = ScheduleInterval.trusted(
+                    name=self.name + day.isoformat(),
+                    mandatory=self.mandatory,
+                    priority=self.priority,
+                    start_interval=(self._at(day, self.start_interval[0]), self._at(day, self.start_interval[1])),
+                    end_interval=(self._at(day, self.end_interval[0]), self._at(day, self.end_interval[1])),
+                    duration_interval=self.duration_interval,
+                    source_task_id=self.id,
+                    interval_id=uuid.uuid5(self.id, day.isoformat()),
+                )
+                self._occurrences[day] = interval
+            yield interval
+
+    def get_intervals(self, start: DT.datetime, end: DT.datetime) -> list[ScheduleInterval]:
+        return list(self.iter_intervals(start, end))
+
+
+class MultiWindowTask(Tasktemplate):
+    """
+    A task done once, in any one of several windows. It becomes a single interval restricted to
+    the windows (see ScheduleInterval.allowed_windows) instead of one alternative task per window.
+    """
+    template_type: Literal["multi_window"] = Field(default="multi_window", frozen=True)
+    windows: list[Annotated[tuple[AwareDatetime, AwareDatetime], AfterValidator(VD.validate_interval)]] = Field(
+        description="The windows the task may be done in", min_length=1)
+    duration_interval: Annotated[tuple[TimeDelta, TimeDelta], AfterValidator(VD.validate_interval)]
+    container: Interval_List = Field(description="The List of the intervals", default=Interval_List())
+    @property
+    def usable_windows(self) -> list[tuple[AwareDatetime, AwareDatetime]]:
+        """The windows sorted and merged where they meet, without those shorter than the minimum duration"""
+        merged: list[tuple[AwareDatetime, AwareDatetime]] = []
+        for lo, hi in sorted(self.windows):
+            if merged and lo <= merged[-1][1]:
+                merged[-1] = (merged[-1][0], max(merged[-1][1], hi))
+            else:
+                merged.append((lo, hi))
+        return [(lo, hi) for lo, hi in merged if hi - lo >= self.duration_interval[0]]
+    @property
+    def effective_interval(self) -> tuple[AwareDatetime, AwareDatetime]:
+        windows = self.usable_windows
+        return windows[0][0], windows[-1][1]
+    @model_validator(mode="after")
+    def initialize(self) -> Self:
+        windows = self.usable_windows
+        if not windows:
+            raise ValueError("no window is as long as the minimum duration")
+        if not self.container.intervals:
+            shortest = self.duration_interval[0]
+            self.container.intervals = [ScheduleInterval.trusted(
+                name=self.name,
+                mandatory=self.mandatory,
+                priority=self.priority,
+                start_interval=(windows[0][0], windows[-1][1] - shortest),
+                end_interval=(windows[0][0] + shortest, windows[-1][1]),
+                duration_interval=self.duration_interval,
+                source_task_id=self.id,
+                allowed_windows=windows,
+            )]
+        return self
+    def get_intervals(self, start: DT.datetime, end: DT.datetime) -> list[ScheduleInterval]:
+        if IntervalUtil.is_contained(self.effective_interval, (start, end)):
+            return self.container.intervals
+        return []
+
+
+ALLTASKTEMPLATES = Annotated[ExactDateTask | FixedPeriodTask | RRuleTask | MultiWindowTask,
+                             Field(discriminator='template_type')]
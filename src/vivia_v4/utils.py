@@ -37,8 +37,10 @@ class IntervalUtil:
         else:
             raise ValueError("UNKNOWN MODE")
     
+import calendar
 import datetime as DT
 from time import timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 def retain_date(datetime: DT.datetime) -> DT.datetime:
     if hasattr(datetime, 'tzinfo') and datetime.tzinfo is not None:
         return DT.datetime(
@@ -104,6 +106,98 @@ class Period():
         self.period = (new_start, new_end)
         return self.period
 
+class CalendarPeriod():
+    """
+    Wall-clock periods of `count` days, weeks or months in a named zone, starting at the anchor's
+    local time. Period k of a daily task starts at the same local time on every day, across DST
+    changes. Local times are turned into UTC with a per-day table of UTC offsets, filled once per
+    local day, so lookups are O(1) after the table covers the horizon. Nonexistent and ambiguous
+    local times resolve like zoneinfo with fold=0: to the offset in effect before the change.
+    """
+    UNITS = ("day", "week", "month")
+
+    def __init__(self, anchor_date: DT.datetime, unit: str, count: int, zone: str) -> None:
+        if anchor_date.tzinfo is None:
+            raise ValueError("Anchor datetime must be timezone-aware")
+        if unit not in self.UNITS:
+            raise ValueError(f"unit must be one of {self.UNITS}")
+        if count < 1:
+            raise ValueError("count must be positive")
+        try:
+            self.zone = ZoneInfo(zone)
+        except (ZoneInfoNotFoundError, ValueError) as e:
+            raise ValueError(f"unknown time zone {zone!r}") from e
+        self.unit = unit
+        self.count = count
+        self.local_anchor = anchor_date.astimezone(self.zone).replace(tzinfo=None)
+        self.length = None if unit == "month" else DT.timedelta(days=count * (7 if unit == "week" else 1))
+        # local ordinal day -> (offset from midnight, local time the offset changes or None, offset after)
+        self._days: dict[int, tuple[DT.timedelta, DT.timedelta | None, DT.timedelta]] = {}
+
+    def _day(self, ordinal: int) -> tuple[DT.timedelta, DT.timedelta | None, DT.timedelta]:
+        entry = self._days.get(ordinal)
+        if entry is None:
+            midnight = DT.datetime.fromordinal(ordinal)
+            before = self.zone.utcoffset(midnight)
+            after = self.zone.utcoffset(midnight + DT.timedelta(days=1))
+            switch = None
+            if before != after:
+                # first local second of the day at which fold=0 already gives the new offset
+                lo, hi = 0, 86400
+                while lo < hi:
+                    mid = (lo + hi) // 2
+                    if self.zone.utcoffset(midnight + DT.timedelta(seconds=mid)) == after:
+                        hi = mid
+                    else:
+                        lo = mid + 1
+                switch = DT.timedelta(seconds=lo)
+            entry = (before, switch, after)
+            self._days[ordinal] = entry
+        return entry
+
+    def prepare(self, start: DT.datetime, end: DT.datetime) -> None:
+        """Fills the offset table for every local day from start to end"""
+        first, last = self.to_local(start).toordinal(), self.to_local(end).toordinal()
+        for ordinal in range(first - 1, last + 2):
+            self._day(ordinal)
+
+    def localize(self, local: DT.datetime) -> DT.datetime:
+        """The UTC datetime of a naive local wall-clock time"""
+        before, switch, after = self._day(local.toordinal())
+        offset = before
+        if switch is not None and local - local.replace(hour=0, minute=0, second=0, microsecond=0) >= switch:
+            offset = after
+        return (local - offset).replace(tzinfo=DT.timezone.utc)
+
+    def to_local(self, target_time: DT.datetime) -> DT.datetime:
+        """The naive local wall-clock time of an aware datetime"""
+        return target_time.astimezone(self.zone).replace(tzinfo=None)
+
+    def local_start(self, index: int) -> DT.datetime:
+        """Naive local start of period `index`; month periods keep the anchor's day, clamped to the month's end"""
+        if self.length is not None:
+            return self.local_anchor + index * self.length
+        months = self.local_anchor.month - 1 + index * self.count
+        year, month = self.local_anchor.year + months // 12, months % 12 + 1
+        day = min(self.local_anchor.day, calendar.monthrange(year, month)[1])
+        return self.local_anchor.replace(year=year, month=month, day=day)
+
+    def index_of(self, target_time: DT.datetime) -> int:
+        """The index of the period containing an aware datetime"""
+        local = self.to_local(target_time)
+        if self.length is not None:
+            return (local - self.local_anchor) // self.length
+        months = (local.year - self.local_anchor.year) * 12 + local.month - self.local_anchor.month
+        index = months // self.count
+        if self.local_start(index) > local:
+            index -= 1
+        return index
+
+    def get_period(self, target_time: DT.datetime) -> tuple[DT.datetime, DT.datetime]:
+        """The (start, end) in UTC of the period containing target_time"""
+        index = self.index_of(target_time)
+        return self.localize(self.local_start(index)), self.localize(self.local_start(index + 1))
+
 if __name__ == "__main__":
     import datetime as DT
     from datetime import timezone
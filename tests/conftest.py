@@ -4,4 +4,4 @@ from pathlib import Path
 ROOT = Path(__file__).resolve().parents[1]
 SRC = ROOT / "src"
 if str(SRC) not in sys.path:
-    sys.path.insert(0, str(SRC))
\ No newline at end of file
+    sys.path.insert(0, str(SRC))
@@ -0,0 +1,50 @@
+import datetime as DT
+from vivia_v4.constraints import GapNoOverlapConstraint, NoOverlapConstraint
+from vivia_v4.indexes import GroupIndex
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from helpers import START, make_task
+
+
+def build(pool: ViviaTaskPool) -> ViviaScheduler:
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(hours=6)))
+    sched.build_model()
+    return sched
+
+
+def test_duplicate_subsumed_and_trivial_no_overlaps_are_dropped():
+    pool = ViviaTaskPool(id=2800)
+    a, b, c = (make_task(name, 0, 6, hours=1, mandatory=False) for name in "abc")
+    for t in (a, b, c):
+        pool.add_task(t)
+    extra = GroupIndex()
+    extra.template_groups["same_as_default"] = [a.id, b.id, c.id]
+    extra.template_groups["pair"] = [a.id, b.id]
+    extra.template_groups["single"] = [c.id]
+    pool.indexes.append(extra)
+    pool.constraints += [
+        NoOverlapConstraint(group_name="same_as_default"),
+        NoOverlapConstraint(group_name="pair"),
+        NoOverlapConstraint(group_name="single"),
+        NoOverlapConstraint(group_name="missing"),
+    ]
+    report = build(pool).normalization_report
+    reasons = {r.constraint.group_name: r.reason for r in report.removed}
+    assert reasons == {
+        "same_as_default": "duplicate",
+        "pair": "subsumed",
+        "single": "trivial",
+        "missing": "trivial",
+    }
+    assert len(pool.constraints) == 5, "Normalization must not mutate the pool"
+
+
+def test_gap_no_overlap_subsumes_plain_no_overlap_but_not_reverse():
+    pool = ViviaTaskPool(id=2801)
+    a, b = (make_task(name, 0, 6, hours=1, mandatory=False) for name in "ab")
+    pool.add_task(a)
+    pool.add_task(b)
+    gap = GapNoOverlapConstraint(group_name="default", min_gap=DT.timedelta(hours=1))
+    pool.constraints.append(gap)
+    report = build(pool).normalization_report
+    assert [(type(r.constraint), r.reason) for r in report.removed] == [(NoOverlapConstraint, "subsumed")]
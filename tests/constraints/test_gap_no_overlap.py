@@ -0,0 +1,135 @@
+import datetime as DT
+import pytest
+from ortools.sat.python import cp_model
+from vivia_v4.constraints import GapNoOverlapConstraint, TransitionTime
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from vivia_v4.templates import ExactDateTask
+from helpers import START, make_task
+
+
+def make_meeting(name: str, window_hours: int = 4) -> ExactDateTask:
+    return make_task(name, 0, window_hours, hours=1)
+
+
+def solve_pool(pool: ViviaTaskPool, hours: int = 4):
+    # Screening would reject the overloaded cases before the constraint is ever emitted
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(hours=hours)),
+                           feasibility_screening=False)
+    sched.build_model()
+    status = sched.solver.Solve(sched.model)
+    return sched, status
+
+
+def test_min_gap_separates_consecutive_intervals():
+    pool = ViviaTaskPool(id=2600)
+    a, b = make_meeting("a"), make_meeting("b")
+    pool.add_task(a, group_name="meetings")
+    pool.add_task(b, group_name="meetings")
+    pool.constraints.append(GapNoOverlapConstraint(group_name="meetings", min_gap=DT.timedelta(minutes=30)))
+    sched, status = solve_pool(pool)
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    a_vars, b_vars = a.container.intervals[0]._cp_model_vars, b.container.intervals[0]._cp_model_vars
+    a_start, b_start = sched.solver.Value(a_vars.start), sched.solver.Value(b_vars.start)
+    # 30 minutes round up to one whole unit of rest between the two 1h meetings
+    assert abs(a_start - b_start) >= 2, "Meetings must be separated by at least one unit of rest"
+
+
+def test_min_gap_too_large_is_infeasible():
+    pool = ViviaTaskPool(id=2601)
+    pool.add_task(make_meeting("a", window_hours=3), group_name="meetings")
+    pool.add_task(make_meeting("b", window_hours=3), group_name="meetings")
+    pool.constraints.append(GapNoOverlapConstraint(group_name="meetings", min_gap=DT.timedelta(hours=2)))
+    _, status = solve_pool(pool, hours=3)
+    assert status == cp_model.INFEASIBLE
+
+
+def test_label_pair_transition_applies_only_to_matching_order():
+    pool = ViviaTaskPool(id=2602)
+    gym, talk = make_meeting("gym", window_hours=2), make_meeting("talk", window_hours=2)
+    gym.container.intervals[0].labels.add("sport")
+    talk.container.intervals[0].labels.add("work")
+    pool.add_task(gym, group_name="meetings")
+    pool.add_task(talk, group_name="meetings")
+    pool.constraints.append(GapNoOverlapConstraint(
+        group_name="meetings",
+        transitions=[TransitionTime(from_label="sport", to_label="work", gap=DT.timedelta(hours=1))],
+    ))
+    sched, status = solve_pool(pool, hours=2)
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    gym_start = sched.solver.Value(gym.container.intervals[0]._cp_model_vars.start)
+    talk_start = sched.solver.Value(talk.container.intervals[0]._cp_model_vars.start)
+    # Back to back in a 2h window only works as work -> sport; sport -> work needs an extra hour
+    assert (talk_start, gym_start) == (0, 1)
+
+
+def test_cross_label_transitions_cap_their_pairs():
+    pool = ViviaTaskPool(id=2606)
+    for k in range(6):
+        t = make_meeting(f"m{k}", window_hours=20)
+        t.container.intervals[0].labels.add("sport" if k % 2 else "work")
+        pool.add_task(t, group_name="meetings")
+    gap = GapNoOverlapConstraint(
+        group_name="meetings", max_transition_pairs=8,
+        transitions=[TransitionTime(from_label="sport", to_label="work", gap=DT.timedelta(hours=1))])
+    sport, work = pool.tasks[1].container.intervals[0], pool.tasks[0].container.intervals[0]
+    assert (gap.transition_gap(sport, work), gap.transition_gap(work, sport)) == (DT.timedelta(hours=1), DT.timedelta(0))
+    pool.constraints.append(gap)
+    # 3 sport x 3 work intervals that can all meet: 9 disjunctions
+    with pytest.raises(ValueError, match="max_transition_pairs"):
+        solve_pool(pool, hours=20)
+    gap.max_transition_pairs = 9
+    sched, status = solve_pool(pool, hours=20)
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    assert sum("_before_" in v.name for v in sched.model.Proto().variables) == 9
+
+def test_same_label_transition_is_a_stretched_no_overlap():
+    pool = ViviaTaskPool(id=2603)
+    a, b = make_meeting("a", window_hours=3), make_meeting("b", window_hours=3)
+    for t in (a, b):
+        t.container.intervals[0].labels.add("mtg")
+        pool.add_task(t, group_name="meetings")
+    pool.constraints.append(GapNoOverlapConstraint(
+        group_name="meetings", transitions=[TransitionTime(from_label="mtg", to_label="mtg", gap=DT.timedelta(hours=1))]))
+    sched, status = solve_pool(pool, hours=3)
+    assert status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    starts = sorted(sched.solver.Value(t.container.intervals[0]._cp_model_vars.start) for t in (a, b))
+    assert starts == [0, 2]
+    assert not any("_before_" in v.name for v in sched.model.Proto().variables), "No pairwise disjunctions"
+
+
+def test_same_label_transition_scales_linearly():
+    pool = ViviaTaskPool(id=2604)
+    for k in range(800):
+        t = make_meeting(f"m{k}", window_hours=2000)
+        t.container.intervals[0].labels.add("mtg")
+        pool.add_task(t, group_name="meetings")
+    pool.constraints.append(GapNoOverlapConstraint(
+        group_name="meetings", transitions=[TransitionTime(from_label="mtg", to_label="mtg", gap=DT.timedelta(hours=1))]))
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(hours=2000)),
+                           feasibility_screening=False, isolated_fast_path=False, symmetry_breaking=False)
+    sched.build_model()
+    proto = sched.model.Proto()
+    assert len(proto.variables) <= 5 * 800
+    assert len(proto.constraints) <= 5 * 800
+
+
+def test_transition_from_a_pinned_interval():
+    pool = ViviaTaskPool(id=2605)
+    gym, talk = make_meeting("gym", window_hours=3), make_meeting("talk", window_hours=3)
+    gym.container.intervals[0].labels.add("sport")
+    talk.container.intervals[0].labels.add("work")
+    pool.add_task(gym, group_name="meetings")
+    pool.add_task(talk, group_name="meetings")
+    pool.constraints.append(GapNoOverlapConstraint(
+        group_name="meetings",
+        transitions=[TransitionTime(from_label="sport", to_label="work", gap=DT.timedelta(hours=1))],
+    ))
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(hours=3)),
+                           isolated_fast_path=False, pinned={f"{gym.id}:0": (0, 1)})
+    sched.build_model()
+    assert gym.container.intervals[0]._cp_model_vars.is_empty()
+    assert sched.solve() == cp_model.OPTIMAL
+    sched.materialize()
+    # The pinned gym session still imposes its rest hour on the talk
+    assert talk.container.intervals[0].actual_interval.start == START + DT.timedelta(hours=2)
@@ -0,0 +1,87 @@
+import datetime as DT
+from vivia_v4.constraints import PeriodCapConstraint
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from vivia_v4.templates import ExactDateTask
+from helpers import START, make_task
+
+
+def make_workouts(repeatition: int, days: int, hours: int = 1) -> ExactDateTask:
+    return make_task("workout", 0, 24 * days, hours=hours, mandatory=False, repeatition=repeatition)
+
+
+def scheduled_days(task: ExactDateTask) -> list[DT.date]:
+    return [i.actual_interval.start.date() for i in task.container.intervals if not i.actual_interval.is_empty()]
+
+
+def test_max_count_per_day():
+    pool = ViviaTaskPool(id=2700)
+    t = make_workouts(repeatition=3, days=1)
+    pool.add_task(t, group_name="sport")
+    pool.constraints.append(PeriodCapConstraint(
+        group_name="sport", anchor_date=START, period_length=DT.timedelta(days=1), max_count=2,
+    ))
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(days=1)))
+    sched.build_model()
+    sched.solve()
+    sched.materialize()
+    assert len(scheduled_days(t)) == 2, "Only two workouts fit the daily cap"
+
+
+def test_max_count_spreads_over_periods():
+    pool = ViviaTaskPool(id=2701)
+    t = make_workouts(repeatition=6, days=3)
+    pool.add_task(t, group_name="sport")
+    pool.constraints.append(PeriodCapConstraint(
+        group_name="sport", anchor_date=START, period_length=DT.timedelta(days=1), max_count=2,
+    ))
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(days=3)))
+    sched.build_model()
+    sched.solve()
+    sched.materialize()
+    days = scheduled_days(t)
+    assert len(days) == 6, "Six workouts fit when spread over three days"
+    assert all(days.count(d) <= 2 for d in set(days))
+
+
+def test_max_duration_per_week():
+    pool = ViviaTaskPool(id=2702)
+    t = make_workouts(repeatition=5, days=7, hours=3)
+    pool.add_task(t, group_name="work")
+    pool.constraints.append(PeriodCapConstraint(
+        group_name="work", anchor_date=START, period_length=DT.timedelta(days=7),
+        max_duration=DT.timedelta(hours=8),
+    ))
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(days=7)))
+    sched.build_model()
+    sched.solve()
+    sched.materialize()
+    assert len(scheduled_days(t)) == 2, "Only two 3h blocks fit an 8h weekly cap"
+
+
+def test_buckets_follow_the_discretized_start():
+    # 23:15..23:45 rounds to a start at midnight on hourly units, so it belongs to the second day
+    pool = ViviaTaskPool(id=2705)
+    late = ExactDateTask(
+        name="late", mandatory=False, priority=1, repeatition=1,
+        start_interval=(START + DT.timedelta(hours=23, minutes=15), START + DT.timedelta(hours=23, minutes=45)),
+        end_interval=(START + DT.timedelta(hours=24), START + DT.timedelta(hours=26)),
+        duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=1)),
+    )
+    early = ExactDateTask(
+        name="early", mandatory=False, priority=1, repeatition=1,
+        start_interval=(START + DT.timedelta(hours=26), START + DT.timedelta(hours=26)),
+        end_interval=(START + DT.timedelta(hours=27), START + DT.timedelta(hours=27)),
+        duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=1)),
+    )
+    pool.add_task(late, group_name="sport")
+    pool.add_task(early, group_name="sport")
+    pool.constraints.append(PeriodCapConstraint(
+        group_name="sport", anchor_date=START, period_length=DT.timedelta(days=1), max_count=1,
+    ))
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(days=2)),
+                           isolated_fast_path=False)
+    sched.build_model()
+    sched.solve()
+    sched.materialize()
+    assert len(scheduled_days(late) + scheduled_days(early)) == 1, "Both would start on the second day"
@@ -0,0 +1,40 @@
+"""Task and pool factories shared by the tests"""
+import datetime as DT
+
+from vivia_v4.constraints import BaseConstraint
+from vivia_v4.task_pool import ViviaTaskPool
+from vivia_v4.templates import ExactDateTask, Tasktemplate
+
+START = DT.datetime(2024, 1, 1, tzinfo=DT.timezone.utc)
+HOUR = DT.timedelta(hours=1)
+
+
+def at(hour: float) -> DT.datetime:
+    return START + hour * HOUR
+
+
+def make_task(name: str, first_hour: float, last_hour: float, hours: float = 2, mandatory: bool = True,
+              priority: int = 1, repeatition: int = 1, min_hours: float | None = None) -> ExactDateTask:
+    """
+    A task placeable anywhere between first_hour and last_hour after START, lasting hours, or from
+    min_hours up to hours when min_hours is given
+    """
+    return ExactDateTask(
+        name=name, mandatory=mandatory, priority=priority, repeatition=repeatition,
+        start_interval=(at(first_hour), at(last_hour - hours)),
+        end_interval=(at(first_hour + hours), at(last_hour)),
+        duration_interval=((hours if min_hours is None else min_hours) * HOUR, hours * HOUR),
+    )
+
+
+def make_pool(pool_id: int, *tasks: Tasktemplate, constraints: tuple[BaseConstraint, ...] = (),
+              group_name: str = "all") -> ViviaTaskPool:
+    """
+    A pool with every task in group_name, constrained by constraints; tasks in the "default" group
+    also get its implicit NoOverlap
+    """
+    pool = ViviaTaskPool(id=pool_id)
+    for t in tasks:
+        pool.add_task(t, group_name=group_name)
+    pool.constraints.extend(constraints)
+    return pool
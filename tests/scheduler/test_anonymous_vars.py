@@ -0,0 +1,40 @@
+import datetime as DT
+from ortools.sat.python import cp_model
+from vivia_v4.constraints import GapNoOverlapConstraint
+from vivia_v4.objectives import MakespanObjective
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from helpers import START, make_pool, make_task
+
+END = START + DT.timedelta(hours=12)
+
+
+def sample_pool() -> ViviaTaskPool:
+    return make_pool(4500, make_task("work", 0, 12, mandatory=False, repeatition=3, min_hours=1),
+                           constraints=(GapNoOverlapConstraint(group_name="all", min_gap=DT.timedelta(hours=1)),))
+
+
+def build(pool: ViviaTaskPool, **options) -> ViviaScheduler:
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), objectives=[MakespanObjective()], **options)
+    sched.build_model()
+    return sched
+
+
+def test_anonymous_model_has_no_names_and_the_same_optimum():
+    pool = sample_pool()
+    named, anonymous = build(pool), build(pool, anonymous_vars=True)
+    assert all(v.name == "" for v in anonymous.model.Proto().variables)
+    assert all(c.name == "" for c in anonymous.model.Proto().constraints)
+    assert len(str(anonymous.model.Proto())) < len(str(named.model.Proto()))
+    assert named.solve() == anonymous.solve() == cp_model.OPTIMAL
+    assert named.solver.ObjectiveValue() == anonymous.solver.ObjectiveValue()
+    assert named.model_hash() != anonymous.model_hash()
+
+
+def test_variable_table_maps_indices_back_to_intervals():
+    sched = build(sample_pool(), anonymous_vars=True)
+    table = sched.variable_table()
+    for i in sched._ctx.all_intervals:
+        roles = sorted(role for owner, role in table.values() if owner == i.id)
+        assert roles == ["duration", "end", "presence", "start"]
+        assert table[i._cp_model_vars.start.Index()] == (i.id, "start")
@@ -0,0 +1,48 @@
+import datetime as DT
+from ortools.sat.python import cp_model
+from vivia_v4.constraints import NoOverlapConstraint
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from helpers import START, make_pool, make_task
+
+END = START + DT.timedelta(hours=6)
+
+
+def sample_pool() -> ViviaTaskPool:
+    pool = make_pool(4400, make_task("work", 0, 6, mandatory=False, repeatition=4),
+                           constraints=(NoOverlapConstraint(group_name="all"),))
+    pool.add_task(make_task("lonely", 0, 1, hours=1))
+    return pool
+
+
+def solve(**options) -> ViviaScheduler:
+    sched = ViviaScheduler(task_pool=sample_pool(), schedule_range=(START, END), **options)
+    sched.build_model()
+    assert sched.solve() == cp_model.OPTIMAL
+    return sched
+
+
+def test_bulk_results_match_per_interval_reads():
+    sched = solve()
+    table = sched.solution_table
+    assert len(table) == len(sched.intervals) == 5
+    for row, i in enumerate(sched.intervals):
+        assert table.real_interval(row) == i.actual_interval
+        if not i._cp_model_vars.is_empty():
+            expected = i.model_copy().interprete_cp_model_vars(sched.solver, START, END, sched.unit_length)
+            assert i.actual_interval == expected
+    assert table.assignment() == sched._current_assignment()
+    assert sum(table.present) == 4, "Three work copies fill the range, lonely is outside their group"
+
+
+def test_results_stay_in_the_table_until_read():
+    sched = solve()
+    assert all(i.actual_interval.is_empty() for i in sched._ctx.all_intervals)
+    # Repair and re-hinting read the table, not the unwritten intervals
+    assert sched._current_assignment() == sched.solution_table.assignment()
+    assert sum(not i.actual_interval.is_empty() for i in sched.intervals) == 4
+    table = sched.solution_table
+    lonely = [row for row, i in enumerate(sched._ctx.all_intervals) if i.name == "lonely0"][0]
+    real = table.real_interval(lonely)
+    assert (real.start, real.end) == (START, START + DT.timedelta(hours=1))
+    assert real.duration == DT.timedelta(hours=1)
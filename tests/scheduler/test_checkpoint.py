@@ -0,0 +1,89 @@
+import datetime as DT
+import os
+import time
+
+import pytest
+from ortools.sat.python import cp_model
+from vivia_v4.checkpoint import Checkpoint, CheckpointWriter
+from vivia_v4.constraints import NoOverlapConstraint
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from helpers import START, make_pool, make_task
+
+END = START + DT.timedelta(hours=12)
+
+
+def sample_pool(repeatition: int = 4) -> ViviaTaskPool:
+    return make_pool(3700, make_task("work", 0, 12, mandatory=False, priority=2, repeatition=repeatition),
+                           constraints=(NoOverlapConstraint(group_name="all"),))
+
+
+def build(pool: ViviaTaskPool, path: str) -> ViviaScheduler:
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), checkpoint_path=path,
+                           checkpoint_interval_seconds=0)
+    sched.build_model()
+    return sched
+
+
+def test_incumbent_is_persisted_by_interval_key(tmp_path):
+    path = str(tmp_path / "run.json")
+    sched = build(sample_pool(), path)
+    assert sched.solve() == cp_model.OPTIMAL
+    checkpoint = Checkpoint.model_validate_json(open(path).read())
+    assert checkpoint.model_key == sched.model_hash()
+    assert checkpoint.objective == sched.solver.ObjectiveValue()
+    for i in sched._ctx.all_intervals:
+        units = checkpoint.assignment[sched._ctx.interval_key(i)]
+        assert units == (sched.solver.Value(i._cp_model_vars.start), sched.solver.Value(i._cp_model_vars.end))
+
+
+def test_resume_hints_the_next_solve(tmp_path):
+    path = str(tmp_path / "run.json")
+    pool = sample_pool()
+    first = build(pool, path)
+    first.solve()
+    # A restarted worker reloads the same pool
+    resumed = build(ViviaTaskPool.model_validate(pool.model_dump()), path)
+    assert resumed.solve() == cp_model.OPTIMAL
+    hint = resumed.model.Proto().solution_hint
+    assert len(hint.vars) == 3 * len(resumed._ctx.all_intervals)
+    assert resumed.checkpoint_hinted == len(resumed._ctx.all_intervals)
+    assert resumed.solver.ObjectiveValue() == first.solver.ObjectiveValue()
+
+
+@pytest.mark.parametrize("objective_mode", ["weighted", "lexicographic"])
+def test_repeated_solves_with_one_checkpoint(tmp_path, objective_mode):
+    sched = build(sample_pool(), str(tmp_path / "run.json"))
+    sched.objective_mode = objective_mode
+    # Every solve after the first hints from the checkpoint the one before wrote
+    assert [sched.solve() for _ in range(3)] == [cp_model.OPTIMAL] * 3
+    hint = sched.model.Proto().solution_hint
+    assert len(hint.vars) == len(set(hint.vars))
+
+
+def test_checkpoint_of_another_model_is_ignored(tmp_path):
+    path = str(tmp_path / "run.json")
+    build(sample_pool(), path).solve()
+    other = build(sample_pool(repeatition=5), path)
+    other.solve()
+    assert len(other.model.Proto().solution_hint.vars) == 0
+    # The new model's incumbent replaces the stale checkpoint
+    assert Checkpoint.model_validate_json(open(path).read()).model_key == other.model_hash()
+
+
+def test_writer_persists_first_incumbent_and_later_ones_on_a_timer(tmp_path):
+    path = str(tmp_path / "w.json")
+    writer = CheckpointWriter(path, "key", {"a:0": (0, 1, 2)}, interval_seconds=0.2)
+    writer.record([0, 2, 1], 5.0)
+    assert os.path.exists(path), "The first incumbent is written at once"
+    writer.record([3, 5, 1], 4.0)
+    assert Checkpoint.model_validate_json(open(path).read()).objective == 5.0
+    # No further improvement arrives; the timer still writes the pending one
+    deadline = time.monotonic() + 5
+    while writer.write_count < 2 and time.monotonic() < deadline:
+        time.sleep(0.02)
+    checkpoint = Checkpoint.model_validate_json(open(path).read())
+    assert checkpoint.objective == 4.0 and checkpoint.assignment == {"a:0": (3, 5)}
+    writer.record([0, 0, 0], 3.0)
+    writer.close()
+    assert Checkpoint.model_validate_json(open(path).read()).assignment == {"a:0": None}
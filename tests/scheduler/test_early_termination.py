@@ -0,0 +1,43 @@
+import datetime as DT
+from ortools.sat.python import cp_model
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.search import TerminationPolicy
+from vivia_v4.task_pool import ViviaTaskPool
+from helpers import START, make_pool, make_task
+
+END = START + DT.timedelta(hours=24)
+
+
+def sample_pool(pool_id: int, mandatory: bool = False) -> ViviaTaskPool:
+    tasks = [make_task(f"t{k}", 0, 24, hours=3, mandatory=mandatory, priority=k + 1, repeatition=2) for k in range(8)]
+    return make_pool(pool_id, *tasks, group_name="default")
+
+
+def test_loose_gap_stops_at_first_solution():
+    sched = ViviaScheduler(task_pool=sample_pool(3400), schedule_range=(START, END),
+                           termination=TerminationPolicy(relative_gap=1e9))
+    sched.build_model()
+    assert sched.solve() in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    assert sched.stop_reason == "gap"
+
+
+def test_stop_reason_without_policy():
+    sched = ViviaScheduler(task_pool=sample_pool(3401), schedule_range=(START, END))
+    sched.build_model()
+    assert sched.solve() == cp_model.OPTIMAL
+    assert sched.stop_reason == "optimal"
+
+    sched = ViviaScheduler(task_pool=sample_pool(3402, mandatory=True), schedule_range=(START, END))
+    sched.build_model()
+    assert sched.solve() == cp_model.INFEASIBLE
+    assert sched.stop_reason == "infeasible"
+
+
+def test_stagnation_timer_stops_a_long_solve():
+    sched = ViviaScheduler(task_pool=sample_pool(3403), schedule_range=(START, END),
+                           unit_length=DT.timedelta(minutes=1),
+                           termination=TerminationPolicy(stagnation_seconds=0.05))
+    sched.build_model()
+    sched.solver.parameters.num_workers = 1
+    assert sched.solve() in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    assert sched.stop_reason in ("stagnation", "optimal")
@@ -28,6 +28,7 @@ def test_exact_four_intervals_solve_all():
     sched = ViviaScheduler(task_pool=pool, schedule_range=(start, end))
     sched.build_model()
     sched.solve()
+    sched.materialize()
     assert len(t.container.intervals) == 4, "ExactDateTask should have 4 intervals in container"
     assert all(not i.actual_interval.is_empty() for i in t.container.intervals), "All 4 intervals should be scheduled (non-empty actual_interval)"
 
@@ -41,5 +42,6 @@ def test_exact_fifteen_intervals_one_unassigned():
     sched = ViviaScheduler(task_pool=pool, schedule_range=(start, end))
     sched.build_model()
     sched.solve()
+    sched.materialize()
     empties = sum(1 for i in t.container.intervals if i.actual_interval.is_empty())
     assert empties == 1, "Exactly one interval should be unassigned (empty actual_interval) in 168h window for 15x12h"
@@ -0,0 +1,48 @@
+import datetime as DT
+from ortools.sat.python import cp_model
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from helpers import START, make_task
+
+
+def test_explanation_names_minimal_conflicting_tasks():
+    pool = ViviaTaskPool(id=3200)
+    # c is pinned to [1, 3), which leaves no 2h slot in [0, 4) for either a or b
+    a, b, c = make_task("a", 0, 4), make_task("b", 0, 4), make_task("c", 1, 3)
+    unrelated = make_task("unrelated", 10, 20)
+    for t in (a, b, c, unrelated):
+        pool.add_task(t)
+    # Screening would already catch this overload; disable it to exercise the CP explanation
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(days=1)),
+                           explain=True, feasibility_screening=False)
+    sched.build_model()
+    assert sched.solve() == cp_model.INFEASIBLE
+    explanation = sched.explanation
+    assert explanation is not None and explanation.minimal
+    assert {e.task_name for e in explanation.conflicts} in ({"a", "c"}, {"b", "c"})
+    assert all(e.task_id in {a.id, b.id, c.id} for e in explanation.conflicts)
+
+
+def test_feasible_explain_mode_still_schedules_mandatory_tasks():
+    pool = ViviaTaskPool(id=3201)
+    t = make_task("t", 0, 4)
+    pool.add_task(t)
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(days=1)), explain=True)
+    sched.build_model()
+    assert sched.solve() == cp_model.OPTIMAL
+    assert sched.explanation is None
+    assert not sched.interval_map[t.id][0].actual_interval.is_empty()
+
+
+def test_explanation_names_tasks_of_a_reloaded_pool():
+    pool = ViviaTaskPool(id=3202)
+    a, b = make_task("a", 0, 3), make_task("b", 0, 3)
+    pool.add_task(a)
+    pool.add_task(b)
+    pool = ViviaTaskPool.model_validate_json(pool.model_dump_json())
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(days=1)),
+                           explain=True, feasibility_screening=False)
+    sched.build_model()
+    assert sched.solve() == cp_model.INFEASIBLE
+    assert {(e.task_id, e.task_name) for e in sched.explanation.conflicts} == {(a.id, "a"), (b.id, "b")}
+    assert sched.model.HasObjective(), "Minimization runs on a copy of the model"
@@ -0,0 +1,49 @@
+import datetime as DT
+from ortools.sat.python import cp_model
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from vivia_v4.templates import ExactDateTask
+from helpers import START, make_task
+
+
+def test_overload_is_reported_without_building_the_model():
+    pool = ViviaTaskPool(id=3100)
+    a, b = make_task("a", 2, 6, 3), make_task("b", 3, 7, 3)
+    pool.add_task(a)
+    pool.add_task(b)
+    pool.add_task(make_task("far", 10, 20, 3))
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(days=1)))
+    sched.build_model()
+    conflict = sched.overload_conflict
+    assert conflict is not None
+    assert conflict.window == (START + DT.timedelta(hours=2), START + DT.timedelta(hours=7))
+    assert set(conflict.interval_ids) == {a.container.intervals[0].id, b.container.intervals[0].id}
+    assert conflict.required == DT.timedelta(hours=6) and conflict.available == DT.timedelta(hours=5)
+    assert len(sched.model.Proto().variables) == 0, "The CP model should not be built"
+    assert sched.solve() == cp_model.INFEASIBLE
+
+
+def test_optional_intervals_do_not_count_as_load():
+    pool = ViviaTaskPool(id=3101)
+    pool.add_task(make_task("a", 2, 6, 3))
+    pool.add_task(make_task("b", 3, 7, 3, mandatory=False))
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(days=1)))
+    sched.build_model()
+    assert sched.overload_conflict is None
+    assert sched.solve() == cp_model.OPTIMAL
+
+
+def test_screening_rounds_like_the_cp_variables():
+    # Both windows are shorter than a unit; the CP variables round them to start 10 and end 11
+    pool = ViviaTaskPool(id=3104)
+    pool.add_task(ExactDateTask(
+        name="narrow", mandatory=True, priority=1, repeatition=1,
+        start_interval=(START + DT.timedelta(hours=9, minutes=30), START + DT.timedelta(hours=9, minutes=45)),
+        end_interval=(START + DT.timedelta(hours=10, minutes=30), START + DT.timedelta(hours=10, minutes=45)),
+        duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=1)),
+    ))
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, START + DT.timedelta(days=1)),
+                           unit_length=DT.timedelta(hours=1), isolated_fast_path=False)
+    sched.build_model()
+    assert sched.overload_conflict is None
+    assert sched.solve() == cp_model.OPTIMAL
@@ -0,0 +1,65 @@
+import datetime as DT
+from ortools.sat.python import cp_model
+from vivia_v4.constraints import GapNoOverlapConstraint, NoOverlapConstraint, PeriodCapConstraint
+from vivia_v4.objectives import StartDeviationObjective
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from helpers import START, make_pool, make_task
+
+END = START + DT.timedelta(hours=24)
+
+
+def sample_pool() -> ViviaTaskPool:
+    return make_pool(
+        4000,
+        make_task("lonely", 2, 6, mandatory=False),
+        make_task("busy_a", 10, 13, mandatory=False),
+        make_task("busy_b", 11, 14, mandatory=False),
+        make_task("near_gap", 15, 17, hours=1, mandatory=False),
+        constraints=(GapNoOverlapConstraint(group_name="all", min_gap=DT.timedelta(hours=2)),),
+    )
+
+
+def solve(pool: ViviaTaskPool, **options) -> ViviaScheduler:
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), **options)
+    sched.build_model()
+    assert sched.solve() == cp_model.OPTIMAL
+    sched.materialize()
+    return sched
+
+
+def isolated_names(sched: ViviaScheduler) -> set[str]:
+    return {i.name for i in sched._ctx.all_intervals if i._cp_model_vars.is_empty()}
+
+
+def test_isolated_intervals_are_placed_without_variables():
+    pool = sample_pool()
+    sched = solve(pool)
+    # near_gap's window ends 1h after busy_b's window, closer than the 2h gap
+    assert isolated_names(sched) == {"lonely0"}
+    lonely = pool.tasks[0].container.intervals[0]
+    assert (lonely.actual_interval.start, lonely.actual_interval.end) == (
+        START + DT.timedelta(hours=2), START + DT.timedelta(hours=4))
+    assert len(sched.model.Proto().variables) < len(solve(pool, isolated_fast_path=False).model.Proto().variables)
+
+
+def test_fast_path_keeps_the_optimum():
+    pool = sample_pool()
+    fast, slow = solve(pool), solve(sample_pool(), isolated_fast_path=False)
+    present = lambda s: sorted(i.name for i in s._ctx.all_intervals if not i.actual_interval.is_empty())
+    assert present(fast) == present(slow)
+
+
+def test_other_constraints_and_objectives_keep_intervals_in_the_model():
+    pool = sample_pool()
+    pool.constraints.append(PeriodCapConstraint(
+        group_name="all", anchor_date=START, period_length=DT.timedelta(days=1), max_count=3))
+    assert isolated_names(solve(pool)) == set()
+    assert isolated_names(solve(sample_pool(), objectives=[StartDeviationObjective(preferred="latest")])) == set()
+    assert isolated_names(solve(sample_pool(), objectives=[StartDeviationObjective(preferred="earliest")])) == {"lonely0"}
+
+
+def test_unwanted_intervals_are_left_to_the_solver():
+    pool = make_pool(4001, make_task("optional_zero", 2, 6, hours=1, mandatory=False, priority=0),
+                     constraints=(NoOverlapConstraint(group_name="all"),))
+    assert isolated_names(solve(pool)) == set()
@@ -0,0 +1,37 @@
+import datetime as DT
+from ortools.sat.python import cp_model
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from vivia_v4.templates import ExactDateTask
+from helpers import START, make_pool, make_task
+
+END = START + DT.timedelta(hours=3)
+
+
+def sample_pool(pool_id: int) -> tuple[ViviaTaskPool, ExactDateTask, ExactDateTask]:
+    """One 3h task of priority 2 competing with three 1h tasks of priority 1 for a 3h window"""
+    long_task = make_task("long", 0, 3, hours=3, mandatory=False, priority=2)
+    short_task = make_task("short", 0, 3, hours=1, mandatory=False, repeatition=3)
+    return make_pool(pool_id, long_task, short_task, group_name="default"), long_task, short_task
+
+
+def present(task: ExactDateTask) -> int:
+    return sum(1 for i in task.container.intervals if not i.actual_interval.is_empty())
+
+
+def test_weighted_mode_lets_many_low_priorities_win():
+    pool, long_task, short_task = sample_pool(2900)
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END))
+    sched.build_model()
+    assert sched.solve() == cp_model.OPTIMAL
+    sched.materialize()
+    assert (present(long_task), present(short_task)) == (0, 3)
+
+
+def test_lexicographic_mode_lets_higher_tier_dominate():
+    pool, long_task, short_task = sample_pool(2901)
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), objective_mode="lexicographic")
+    sched.build_model()
+    assert sched.solve() == cp_model.OPTIMAL
+    sched.materialize()
+    assert (present(long_task), present(short_task)) == (1, 0)
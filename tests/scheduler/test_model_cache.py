@@ -0,0 +1,89 @@
+import datetime as DT
+from ortools.sat.python import cp_model
+from vivia_v4.constraints import GapNoOverlapConstraint, NoOverlapConstraint
+from vivia_v4.model_cache import ModelCache
+from vivia_v4.objectives import StartDeviationObjective
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from vivia_v4.templates import FixedPeriodTask, RelativePeriodItem
+from helpers import START, make_task
+
+END = START + DT.timedelta(days=2)
+
+
+def make_pool() -> ViviaTaskPool:
+    pool = ViviaTaskPool(id=3600)
+    pool.add_task(make_task("exact", 0, 48, mandatory=False, repeatition=3), group_name="all")
+    pool.add_task(FixedPeriodTask(
+        name="daily", mandatory=True, priority=1, period_unit_num=1, anchor_date=START,
+        effective_interval=(START, END),
+        period_items=[RelativePeriodItem(
+            active_index=0,
+            start_interval=(DT.timedelta(hours=8), DT.timedelta(hours=10)),
+            end_interval=(DT.timedelta(hours=9), DT.timedelta(hours=11)),
+            duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=1)),
+        )],
+    ), group_name="all")
+    pool.constraints.append(NoOverlapConstraint(group_name="all"))
+    pool.constraints.append(GapNoOverlapConstraint(group_name="all", min_gap=DT.timedelta(hours=1)))
+    return pool
+
+
+def solve(pool: ViviaTaskPool, cache: ModelCache, **options) -> ViviaScheduler:
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), model_cache=cache,
+                           objectives=[StartDeviationObjective(weight=1)], **options)
+    sched.build_model()
+    assert sched.solve() == cp_model.OPTIMAL
+    return sched
+
+
+def solved_intervals(sched: ViviaScheduler):
+    return [(i.actual_interval.start, i.actual_interval.end) for i in sched._ctx.all_intervals]
+
+
+def test_unchanged_pool_reuses_compiled_model(tmp_path):
+    cache = ModelCache(directory=str(tmp_path))
+    pool = make_pool()
+    first = solve(pool, cache)
+    second = solve(ViviaTaskPool.model_validate(pool.model_dump()), cache)
+    assert second.model is not first.model
+    assert [str(c) for c in second.model.Proto().constraints] == [str(c) for c in first.model.Proto().constraints]
+    assert second.solver.ObjectiveValue() == first.solver.ObjectiveValue()
+    assert solved_intervals(second) == solved_intervals(first)
+    assert second.normalization_report == first.normalization_report
+    # Another process parses the disk copy
+    third = solve(ViviaTaskPool.model_validate(pool.model_dump()), ModelCache(directory=str(tmp_path)))
+    assert third.solver.ObjectiveValue() == first.solver.ObjectiveValue()
+    assert solved_intervals(third) == solved_intervals(first)
+
+
+def test_solving_does_not_touch_the_cached_model(tmp_path):
+    cache = ModelCache(directory=str(tmp_path))
+    pool = make_pool()
+    # Lexicographic solves add constraints per tier; the next build must start from the clean model
+    solve(pool, cache, objective_mode="lexicographic")
+    again = solve(pool, cache, objective_mode="lexicographic")
+    assert len(cache._memory) == 1, "Solve-only options must not change the model key"
+    assert again.stop_reason == "optimal"
+
+
+def test_build_options_and_invalidation_miss(tmp_path):
+    cache = ModelCache(directory=str(tmp_path))
+    pool = make_pool()
+    solve(pool, cache)
+    solve(pool, cache, constraint_normalization=False)
+    assert len(cache._memory) == 2
+    cache.invalidate(pool.id)
+    assert not cache._memory and not list(tmp_path.iterdir())
+
+
+def test_memory_hit_skips_the_build_work(tmp_path):
+    cache = ModelCache(directory=str(tmp_path))
+    pool = make_pool()
+    solve(pool, cache)
+    entry = next(iter(cache._memory.values()))
+    assert entry.proto_text is None, "Memory entries keep the built model, not its text"
+    hit = solve(pool, cache)
+    # No constraint ran on the hit, so the group and label indexes of the context were never built
+    assert hit._ctx._caches is None
+    assert entry.proto_text is None
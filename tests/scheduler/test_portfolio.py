@@ -0,0 +1,54 @@
+import datetime as DT
+from ortools.sat.python import cp_model
+from vivia_v4.constraints import NoOverlapConstraint
+from vivia_v4.portfolio import PortfolioOutcome, PortfolioVariant, select_winner
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from helpers import START, make_pool, make_task
+
+END = START + DT.timedelta(hours=8)
+
+
+def sample_pool() -> ViviaTaskPool:
+    return make_pool(3800, make_task("work", 0, 8, mandatory=False, priority=2, repeatition=3),
+                           constraints=(NoOverlapConstraint(group_name="all"),))
+
+
+def test_portfolio_adopts_the_winning_schedule():
+    sched = ViviaScheduler(task_pool=sample_pool(), schedule_range=(START, END))
+    status = sched.solve_portfolio(deadline_seconds=30, variants=[
+        PortfolioVariant(name="hourly"),
+        PortfolioVariant(name="half_hourly", overrides={"unit_length": "PT30M"},
+                         parameters={"search_branching": "FIXED_SEARCH"}),
+    ])
+    assert status == cp_model.OPTIMAL
+    outcomes = sched.portfolio_outcomes
+    assert outcomes[0].variant in ("hourly", "half_hourly") and outcomes[0].error is None
+    present = [i.actual_interval for i in sched._ctx.all_intervals if not i.actual_interval.is_empty()]
+    assert len(present) == 3
+    assert sched.stop_reason == "optimal"
+
+
+def test_failing_variants_do_not_win():
+    sched = ViviaScheduler(task_pool=sample_pool(), schedule_range=(START, END))
+    status = sched.solve_portfolio(deadline_seconds=30, variants=[
+        PortfolioVariant(name="broken", overrides={"objective_mode": "nonsense"}),
+    ])
+    assert status == cp_model.UNKNOWN
+    assert sched.portfolio_outcomes[0].error is not None
+
+
+def test_winner_does_not_depend_on_arrival_order():
+    variants = [PortfolioVariant(name=n) for n in ("a", "b", "c", "d", "e")]
+    outcomes = [
+        PortfolioOutcome(variant="a", status=cp_model.FEASIBLE, score=9),
+        PortfolioOutcome(variant="b", status=cp_model.OPTIMAL, score=5, secondary=3),
+        PortfolioOutcome(variant="c", status=cp_model.OPTIMAL, score=5, secondary=1),
+        PortfolioOutcome(variant="d", status=cp_model.OPTIMAL, score=5, secondary=1),
+        PortfolioOutcome(variant="e", status=cp_model.INFEASIBLE),
+    ]
+    # Optimal before feasible, then the lowest secondary cost, then the variant listed first
+    assert select_winner(outcomes, variants).variant == "c"
+    assert select_winner(outcomes[::-1], variants).variant == "c"
+    assert select_winner(outcomes[:1] + outcomes[4:], variants).variant == "a"
+    assert select_winner(outcomes[4:], variants) is None
@@ -0,0 +1,96 @@
+import datetime as DT
+from ortools.sat.python import cp_model
+from vivia_v4.constraints import NoOverlapConstraint, PeriodCapConstraint
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.templates import ExactDateTask
+from helpers import START, make_pool, make_task
+
+END = START + DT.timedelta(hours=24)
+NO_OVERLAP = (NoOverlapConstraint(group_name="all"),)
+
+
+def placement(task: ExactDateTask) -> tuple[int, int]:
+    real = task.container.intervals[0].actual_interval
+    hour = DT.timedelta(hours=1)
+    return (real.start - START) // hour, (real.end - START) // hour
+
+
+def test_repair_moves_only_the_neighbourhood():
+    early, late = make_task("early", 0, 6), make_task("late", 16, 24)
+    pool = make_pool(4200, early, late, constraints=NO_OVERLAP)
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), isolated_fast_path=False)
+    sched.build_model()
+    assert sched.solve() == cp_model.OPTIMAL
+    sched.materialize()
+    before = placement(late)
+    new = make_task("new", 0, 4)
+    pool.add_task(new, group_name="all")
+    repair = ViviaScheduler(task_pool=pool, schedule_range=(START, END), isolated_fast_path=False)
+    assert repair.repair([new.id]) == cp_model.OPTIMAL
+    repair.materialize()
+    assert repair.repair_rounds == 1
+    assert placement(late) == before, "Intervals outside the footprint keep their previous placement"
+    a, b = sorted([placement(early), placement(new)])
+    assert a[1] <= b[0]
+
+
+def test_repair_widens_the_neighbourhood_until_feasible():
+    a, b, c, d = make_task("a", 0, 4), make_task("b", 0, 8), make_task("c", 4, 12), make_task("d", 4, 8)
+    new = make_task("new", 0, 4)
+    pool = make_pool(4200, a, b, c, d, new, constraints=NO_OVERLAP)
+    previous = {f"{a.id}:0": (0, 2), f"{b.id}:0": (2, 4), f"{c.id}:0": (4, 6), f"{d.id}:0": (6, 8)}
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), isolated_fast_path=False)
+    # With c and d pinned, b has no room once new takes its slot; the second round frees them
+    assert sched.repair([new.id], previous=previous) == cp_model.OPTIMAL
+    sched.materialize()
+    assert sched.repair_rounds == 2
+    spans = sorted(placement(t) for t in (a, b, c, d, new))
+    assert all(x[1] <= y[0] for x, y in zip(spans, spans[1:]))
+
+
+def test_pinned_intervals_enter_the_model_as_constants():
+    tasks = [make_task(f"t{k}", 2 * k, 2 * k + 4, hours=1) for k in range(10)]
+    new = make_task("new", 0, 4)
+    pool = make_pool(4200, *tasks, constraints=NO_OVERLAP)
+    full = ViviaScheduler(task_pool=pool, schedule_range=(START, END), isolated_fast_path=False)
+    full.build_model()
+    assert full.solve() == cp_model.OPTIMAL
+    full.materialize()
+    before = {t.id: placement(t) for t in tasks}
+    pool.add_task(new, group_name="all")
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), isolated_fast_path=False)
+    assert sched.repair([new.id]) == cp_model.OPTIMAL
+    sched.materialize()
+    assert sched.pinned == {}, "repair() restores the pinned field"
+    proto = sched.model.Proto()
+    assert len(proto.variables) < len(full.model.Proto().variables)
+    pinned = [t for t in tasks if t.container.intervals[0]._cp_model_vars.is_empty()]
+    assert pinned and all(placement(t) == before[t.id] for t in pinned)
+    # Constant intervals: no start variables and a literal size
+    fixed = [c for c in proto.constraints if not c.interval.start.vars and c.interval.size.offset > 0]
+    assert len(fixed) == len(pinned)
+    spans = sorted(placement(t) for t in tasks + [new])
+    assert all(x[1] <= y[0] for x, y in zip(spans, spans[1:]))
+
+
+def test_isolated_fast_path_keeps_pinned_placements():
+    lone = make_task("lone", 0, 12)
+    pool = make_pool(4200, lone, constraints=NO_OVERLAP)
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), pinned={f"{lone.id}:0": (5, 7)})
+    sched.build_model()
+    assert sched.solve() == cp_model.OPTIMAL
+    sched.materialize()
+    assert placement(lone) == (5, 7)
+
+
+def test_pinned_intervals_count_against_period_caps():
+    pinned, free = make_task("pinned", 0, 24), make_task("free", 0, 24)
+    pool = make_pool(4201, pinned, free, constraints=(PeriodCapConstraint(
+        group_name="all", anchor_date=START, period_length=DT.timedelta(hours=12), max_count=1),))
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), isolated_fast_path=False,
+                           pinned={f"{pinned.id}:0": (2, 4)})
+    sched.build_model()
+    assert sched.solve() == cp_model.OPTIMAL
+    sched.materialize()
+    assert placement(pinned) == (2, 4)
+    assert placement(free)[0] >= 12, "The pinned interval fills the first period's cap"
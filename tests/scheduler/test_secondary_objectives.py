@@ -0,0 +1,54 @@
+import datetime as DT
+from vivia_v4.objectives import CompactnessObjective, MakespanObjective, StartDeviationObjective
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from helpers import START, make_task
+
+END = START + DT.timedelta(hours=10)
+
+
+def solve(pool: ViviaTaskPool, **kwargs) -> ViviaScheduler:
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), **kwargs)
+    sched.build_model()
+    sched.solve()
+    sched.materialize()
+    return sched
+
+
+def test_makespan_pulls_everything_to_the_front():
+    pool = ViviaTaskPool(id=3000)
+    t = make_task("t", 0, 10, hours=1, repeatition=3)
+    pool.add_task(t)
+    solve(pool, objectives=[MakespanObjective()])
+    assert max(i.actual_interval.end for i in t.container.intervals) == START + DT.timedelta(hours=3)
+
+
+def test_start_deviation_prefers_latest_edge():
+    pool = ViviaTaskPool(id=3001)
+    t = make_task("t", 0, 10, hours=1)
+    pool.add_task(t)
+    solve(pool, objectives=[StartDeviationObjective(preferred="latest")])
+    assert t.container.intervals[0].actual_interval.start == END - DT.timedelta(hours=1)
+
+
+def test_compactness_removes_idle_gaps():
+    pool = ViviaTaskPool(id=3002)
+    t = make_task("t", 0, 10, hours=1, repeatition=3)
+    pool.add_task(t)
+    solve(pool, objectives=[CompactnessObjective(group_name="default")])
+    starts = sorted(i.actual_interval.start for i in t.container.intervals)
+    assert starts[-1] - starts[0] == DT.timedelta(hours=2)
+
+
+def test_lexicographic_keeps_priorities_ahead_of_secondary_costs():
+    pool = ViviaTaskPool(id=3003)
+    t = make_task("t", 0, 10, hours=1, mandatory=False, repeatition=4)
+    pool.add_task(t)
+    # A huge makespan weight would drop every optional interval in weighted mode
+    solve(pool, objectives=[MakespanObjective(weight=100)])
+    assert all(i.actual_interval.is_empty() for i in t.container.intervals)
+    pool = ViviaTaskPool(id=3004)
+    t = make_task("t", 0, 10, hours=1, mandatory=False, repeatition=4)
+    pool.add_task(t)
+    solve(pool, objectives=[MakespanObjective(weight=100)], objective_mode="lexicographic")
+    assert max(i.actual_interval.end for i in t.container.intervals) == START + DT.timedelta(hours=4)
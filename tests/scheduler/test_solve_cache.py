@@ -0,0 +1,76 @@
+import datetime as DT
+import pytest
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.solve_cache import BoundedCache, SolveCache
+from vivia_v4.task_pool import ViviaTaskPool
+from vivia_v4.templates import FixedPeriodTask, RelativePeriodItem
+from helpers import START, make_task
+
+END = START + DT.timedelta(days=2)
+
+
+def make_pool() -> ViviaTaskPool:
+    pool = ViviaTaskPool(id=3500)
+    pool.add_task(make_task("exact", 0, 48, mandatory=False, repeatition=3))
+    pool.add_task(FixedPeriodTask(
+        name="daily", mandatory=True, priority=1, period_unit_num=1, anchor_date=START,
+        effective_interval=(START, END),
+        period_items=[RelativePeriodItem(
+            active_index=0,
+            start_interval=(DT.timedelta(hours=8), DT.timedelta(hours=10)),
+            end_interval=(DT.timedelta(hours=9), DT.timedelta(hours=11)),
+            duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=1)),
+        )],
+    ))
+    return pool
+
+
+def solve(pool: ViviaTaskPool, cache: SolveCache) -> ViviaScheduler:
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), result_cache=cache)
+    sched.build_model()
+    sched.solve()
+    return sched
+
+
+def solved_intervals(sched: ViviaScheduler):
+    return [(i.actual_interval.start, i.actual_interval.end) for i in sched._ctx.all_intervals]
+
+
+def test_unchanged_pool_is_served_from_cache(tmp_path):
+    cache = SolveCache(directory=str(tmp_path))
+    pool = make_pool()
+    first = solve(pool, cache)
+    assert first.stop_reason == "optimal"
+    # A reloaded pool regenerates its periodic intervals with fresh ids, but hashes the same
+    second = solve(ViviaTaskPool.model_validate(pool.model_dump()), cache)
+    assert second.stop_reason == "cached"
+    assert len(second.model.Proto().variables) == 0, "A cache hit must not build the CP model"
+    assert solved_intervals(second) == solved_intervals(first)
+    # Another process only has the disk copy
+    assert solve(ViviaTaskPool.model_validate(pool.model_dump()), SolveCache(str(tmp_path))).stop_reason == "cached"
+
+
+def test_changes_and_invalidation_miss(tmp_path):
+    cache = SolveCache(directory=str(tmp_path))
+    pool = make_pool()
+    solve(pool, cache)
+    pool.tasks[0].priority = 5
+    assert solve(pool, cache).stop_reason != "cached", "A changed pool must hash differently"
+    cache.invalidate(pool.id)
+    assert not list(tmp_path.iterdir())
+    assert solve(pool, cache).stop_reason != "cached"
+
+
+def test_memory_and_disk_bounds(tmp_path):
+    cache = SolveCache(directory=str(tmp_path), max_entries=1, max_disk_entries=2)
+    pool = make_pool()
+    for priority in (1, 2, 3):
+        pool.tasks[0].priority = priority
+        solve(pool, cache)
+    assert len(cache._memory) == 1
+    assert len(list(tmp_path.iterdir())) == 2
+
+
+def test_bounded_cache_requires_an_encoding():
+    with pytest.raises(TypeError):
+        BoundedCache()
@@ -0,0 +1,45 @@
+import datetime as DT
+import pytest
+from ortools.sat.python import cp_model
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.solver_profiles import SOLVER_PROFILES, SolverProfile, get_solver_profile
+from vivia_v4.task_pool import ViviaTaskPool
+
+
+def test_profile_applies_parameters_to_solver():
+    solver = cp_model.CpSolver()
+    get_solver_profile("interactive").apply(solver)
+    assert solver.parameters.max_time_in_seconds == 2.0
+    assert solver.parameters.num_workers == 4
+    assert solver.parameters.relative_gap_limit == 0.01
+
+
+def test_deterministic_profile_interleaves_search():
+    solver = cp_model.CpSolver()
+    get_solver_profile("deterministic").apply(solver)
+    assert solver.parameters.interleave_search
+    assert solver.parameters.max_deterministic_time == 20.0
+
+
+def test_tenant_caps_clamp_time_and_all_core_workers():
+    capped = SOLVER_PROFILES["batch"].capped(max_time_in_seconds=10.0, max_workers=2)
+    assert (capped.max_time_in_seconds, capped.num_workers) == (10.0, 2)
+    assert SOLVER_PROFILES["batch"].num_workers == 0, "Capping must not mutate the shared profile"
+    unlimited = SolverProfile(name="unlimited").capped(max_time_in_seconds=5.0)
+    assert unlimited.max_time_in_seconds == 5.0
+
+
+def test_overrides_take_precedence_and_unknown_names_fail():
+    custom = SolverProfile(name="interactive", max_time_in_seconds=0.5)
+    assert get_solver_profile("interactive", {"interactive": custom}) is custom
+    with pytest.raises(ValueError):
+        get_solver_profile("nope")
+
+
+def test_scheduler_uses_profile_on_solve():
+    start = DT.datetime(2024, 1, 1, tzinfo=DT.timezone.utc)
+    sched = ViviaScheduler(task_pool=ViviaTaskPool(id=3300), schedule_range=(start, start + DT.timedelta(days=1)),
+                           solver_profile=get_solver_profile("interactive"))
+    sched.build_model()
+    sched.solve()
+    assert sched.solver.parameters.max_time_in_seconds == 2.0
@@ -0,0 +1,53 @@
+import datetime as DT
+from ortools.sat.python import cp_model
+from vivia_v4.constraints import NoOverlapConstraint
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.symmetry import find_interchangeable_intervals
+from vivia_v4.task_pool import ViviaTaskPool
+from helpers import START, make_task
+
+END = START + DT.timedelta(hours=10)
+
+
+def build(pool: ViviaTaskPool, **options) -> ViviaScheduler:
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), **options)
+    sched.build_model()
+    return sched
+
+
+def test_copies_are_grouped_by_task_and_targeting():
+    pool = ViviaTaskPool(id=3900)
+    task = make_task("work", 0, 10, hours=1, mandatory=False, repeatition=4)
+    pool.add_task(task, group_name="all")
+    pool.add_task(make_task("other", 0, 10, hours=1, mandatory=False), group_name="all")
+    pool.constraints.append(NoOverlapConstraint(group_name="all"))
+    task.container.intervals[3].labels.add("special")
+    groups = find_interchangeable_intervals(build(pool)._ctx)
+    assert [len(g) for g in groups] == [3], "A label tells the fourth copy apart"
+
+
+def test_optional_copies_are_used_in_order():
+    pool = ViviaTaskPool(id=3901)
+    task = make_task("work", 0, 10, hours=1, mandatory=False, repeatition=6)
+    pool.add_task(task, group_name="all")
+    pool.constraints.append(NoOverlapConstraint(group_name="all"))
+    # Six mandatory hours leave four for six optional one-hour copies
+    pool.add_task(make_task("block", 0, 10, hours=1, repeatition=6), group_name="all")
+    sched = build(pool)
+    assert sched.solve() == cp_model.OPTIMAL
+    sched.materialize()
+    intervals = task.container.intervals
+    present = [not i.actual_interval.is_empty() for i in intervals]
+    assert present == [True] * 4 + [False] * 2
+    starts = [i.actual_interval.start for i in intervals[:4]]
+    assert starts == sorted(starts)
+
+
+def test_symmetry_breaking_keeps_the_optimum():
+    pool = ViviaTaskPool(id=3902)
+    pool.add_task(make_task("work", 0, 10, hours=1, mandatory=False, repeatition=12), group_name="all")
+    pool.constraints.append(NoOverlapConstraint(group_name="all"))
+    with_breaking = build(pool)
+    without = build(pool, symmetry_breaking=False)
+    assert with_breaking.solve() == without.solve() == cp_model.OPTIMAL
+    assert with_breaking.solver.ObjectiveValue() == without.solver.ObjectiveValue() == 10
@@ -0,0 +1,71 @@
+import datetime as DT
+from ortools.sat.python import cp_model
+from vivia_v4.constraints import NoOverlapConstraint
+from vivia_v4.insertion import StoredSchedule, insert_task
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from helpers import START, make_pool, make_task
+
+END = START + DT.timedelta(hours=12)
+
+
+def solved_pool() -> tuple[ViviaTaskPool, StoredSchedule]:
+    pool = make_pool(4100, make_task("morning", 0, 4), make_task("flexible", 0, 6),
+                     constraints=(NoOverlapConstraint(group_name="all"),))
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), isolated_fast_path=False)
+    sched.build_model()
+    assert sched.solve() == cp_model.OPTIMAL
+    return pool, StoredSchedule(schedule_range=(START, END), unit_length=sched.unit_length,
+                                assignment=sched._current_assignment())
+
+
+def placement(result, task):
+    [interval] = result.intervals[str(task.id)]
+    return interval.actual_interval.start, interval.actual_interval.end
+
+
+def test_new_task_fits_into_a_gap_greedily():
+    pool, stored = solved_pool()
+    task = make_task("new", 0, 12)
+    pool.add_task(task, group_name="all")
+    result = insert_task(pool, task, stored)
+    assert result.method == "greedy"
+    assert list(result.intervals) == [str(task.id)], "Only the new task moves"
+    start, end = placement(result, task)
+    busy = [v for v in stored.assignment.values() if v]
+    units = ((start - START) // DT.timedelta(hours=1), (end - START) // DT.timedelta(hours=1))
+    assert units[0] == max(e for _, e in busy), "Earliest start after the occupied hours"
+    assert len(result.schedule.assignment) == len(stored.assignment) + 1
+
+
+def test_optional_task_without_priority_stays_absent():
+    pool, stored = solved_pool()
+    task = make_task("idle", 0, 12, mandatory=False, priority=0)
+    pool.add_task(task, group_name="all")
+    result = insert_task(pool, task, stored)
+    assert result.method == "greedy"
+    assert result.schedule.assignment[f"{task.id}:0"] is None
+    assert placement(result, task) == (None, None)
+
+
+def test_blocked_gap_falls_back_to_a_local_solve():
+    pool, stored = solved_pool()
+    morning, flexible = pool.tasks
+    stored.assignment = {f"{morning.id}:0": (0, 2), f"{flexible.id}:0": (2, 4)}
+    # No gap is left in the new task's window unless "flexible" moves out of the way
+    task = make_task("tight", 0, 4)
+    pool.add_task(task, group_name="all")
+    result = insert_task(pool, task, stored)
+    assert result.method == "local_solve"
+    assert str(flexible.id) in result.intervals
+    assert result.schedule.assignment[f"{flexible.id}:0"][0] >= 4
+    assert result.schedule.assignment[f"{task.id}:0"] is not None
+
+
+def test_infeasible_insertion_reports_failure():
+    pool, stored = solved_pool()
+    task = make_task("impossible", 0, 2)
+    pool.add_task(task, group_name="all")
+    pool.add_task(make_task("also_impossible", 0, 2), group_name="all")
+    result = insert_task(pool, task, stored)
+    assert result.method == "failed" and result.schedule is None
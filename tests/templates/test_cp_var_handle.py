@@ -0,0 +1,35 @@
+import datetime as DT
+import pytest
+from ortools.sat.python import cp_model
+from vivia_v4.templates import CPModelVariables, CPVarHandle, ScheduleInterval
+from helpers import START
+
+
+def make_interval() -> ScheduleInterval:
+    return ScheduleInterval(
+        name="handle", mandatory=False, priority=1,
+        start_interval=(START, START + DT.timedelta(hours=2)),
+        end_interval=(START + DT.timedelta(hours=1), START + DT.timedelta(hours=3)),
+        duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=1)),
+    )
+
+
+def test_created_vars_use_the_slotted_handle():
+    interval = make_interval()
+    assert interval._cp_model_vars.is_empty()
+    handle = interval.create_cp_model_vars(cp_model.CpModel(), START, START + DT.timedelta(hours=3),
+                                           DT.timedelta(hours=1))
+    assert isinstance(handle, CPVarHandle) and interval._cp_model_vars is handle
+    assert not handle.is_empty()
+    with pytest.raises(AttributeError):
+        handle.extra = 1
+    # The validated pydantic form stays available for debugging
+    validated = handle.validated()
+    assert isinstance(validated, CPModelVariables) and validated.start is handle.start
+    assert handle.clear_model_vars().is_empty()
+
+
+def test_validated_form_rejects_partial_handles():
+    model = cp_model.CpModel()
+    with pytest.raises(ValueError):
+        CPVarHandle(start=model.NewIntVar(0, 1, "start")).validated()
@@ -50,3 +50,73 @@ def test_fixed_period_creates_intervals_on_get():
     assert len(t.container[0].intervals) == 5, "Five intervals expected for active days 1..5"
     assert len(intervals) == 5, "get_intervals should return five intervals"
 
+
+
+def test_fixed_period_stamps_a_year_of_periods():
+    t = make_fixed_period_task()
+    anchor = t.anchor_date
+    t.effective_interval = (anchor, anchor + DT.timedelta(days=364))
+    t = FixedPeriodTask.model_validate(t.model_dump())
+    intervals = t.get_intervals(anchor, anchor + DT.timedelta(days=400))
+    assert len(intervals) == 52 * 5, "Every full week inside the effective interval should be generated"
+    week, day = DT.timedelta(days=7), DT.timedelta(days=1)
+    expected = [anchor + w * week + d * day + DT.timedelta(hours=8) for w in range(52) for d in range(1, 6)]
+    assert [i.start_interval[0] for i in intervals] == expected
+    assert all(i.end_interval[0] - i.start_interval[0] == DT.timedelta(hours=10) for i in intervals)
+    assert len(t.container) == 52
+
+
+def test_fixed_period_iter_intervals_is_lazy_and_reuses_periods():
+    t = make_fixed_period_task()
+    anchor = t.anchor_date
+    t.effective_interval = (anchor, anchor + DT.timedelta(days=28))
+    t = FixedPeriodTask.model_validate(t.model_dump())
+    it = t.iter_intervals(anchor, anchor + DT.timedelta(days=28))
+    first = next(it)
+    assert len(t.container) == 1, "Only the first period should exist after one interval"
+    rest = list(it)
+    assert len(t.container) == 4 and len(rest) == 19
+    again = t.get_intervals(anchor + DT.timedelta(days=7), anchor + DT.timedelta(days=28))
+    assert [i.id for i in again] == [i.id for i in rest[4:]], "Existing periods should be reused"
+    reloaded = FixedPeriodTask.model_validate(t.model_dump())
+    assert reloaded.get_intervals(anchor, anchor + DT.timedelta(days=7))[0].id == first.id
+    assert len(reloaded.container) == 4
+
+
+def test_fixed_period_skips_to_effective_interval():
+    t = make_fixed_period_task()
+    anchor = t.anchor_date
+    t.effective_interval = (anchor + DT.timedelta(days=21), anchor + DT.timedelta(days=35))
+    t = FixedPeriodTask.model_validate(t.model_dump())
+    intervals = t.get_intervals(anchor, anchor + DT.timedelta(days=60))
+    assert [x.time_stamp for x in t.container] == [anchor + DT.timedelta(days=21), anchor + DT.timedelta(days=28)]
+    assert len(intervals) == 10
+
+
+def test_fixed_period_calendar_zone_follows_local_time():
+    from zoneinfo import ZoneInfo
+    import pytest
+    tz = ZoneInfo("America/New_York")
+    anchor = DT.datetime(2024, 3, 8, tzinfo=tz)
+    item = RelativePeriodItem(active_index=0,
+                              start_interval=(DT.timedelta(hours=8), DT.timedelta(hours=8)),
+                              end_interval=(DT.timedelta(hours=9), DT.timedelta(hours=9)),
+                              duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=1)))
+    fields = dict(name="daily", mandatory=True, priority=1, period_unit_num=1, anchor_date=anchor,
+                  effective_interval=(anchor, anchor + DT.timedelta(days=5)), period_items=[item])
+    t = FixedPeriodTask(calendar_zone="America/New_York", **fields)
+    intervals = t.get_intervals(anchor, anchor + DT.timedelta(days=5))
+    assert len(intervals) == 5
+    assert all(i.start_interval[0].astimezone(tz).hour == 8 for i in intervals), "Start should stay at 08:00 local"
+    assert [i.start_interval[0].astimezone(DT.timezone.utc).hour for i in intervals] == [13, 13, 12, 12, 12]
+    reloaded = FixedPeriodTask.model_validate(t.model_dump())
+    assert reloaded.get_intervals(anchor, anchor + DT.timedelta(days=5))[2].id == intervals[2].id
+
+    # Datetimes parsed from JSON carry a fixed UTC offset, so fixed-length periods drift
+    est = DT.timezone(DT.timedelta(hours=-5))
+    drifting = FixedPeriodTask(**{**fields, "anchor_date": anchor.astimezone(est)})
+    fixed = drifting.get_intervals(anchor, anchor + DT.timedelta(days=5))
+    assert fixed[3].start_interval[0].astimezone(tz).hour == 9, "Fixed-length periods drift across DST"
+    with pytest.raises(ValueError):
+        FixedPeriodTask(calendar_zone="America/New_York", period_unit_len=DT.timedelta(hours=12),
+                        **{k: v for k, v in fields.items()})
@@ -0,0 +1,88 @@
+import datetime as DT
+
+import pytest
+from ortools.sat.python import cp_model
+
+from vivia_v4.constraints import NoOverlapConstraint
+from vivia_v4.insertion import StoredSchedule, insert_task
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from vivia_v4.templates import ExactDateTask, MultiWindowTask
+from helpers import HOUR, START, at, make_task
+
+END = START + DT.timedelta(hours=24)
+
+
+def make_multi(windows, hours=(2, 2), mandatory=True):
+    return MultiWindowTask(name="multi", mandatory=mandatory, priority=1,
+                           windows=[(at(a), at(b)) for a, b in windows],
+                           duration_interval=(hours[0] * HOUR, hours[1] * HOUR))
+
+
+def blocker(first: int, last: int) -> ExactDateTask:
+    return make_task("blocker", first, last, hours=last - first)
+
+
+def solve(pool: ViviaTaskPool) -> ViviaScheduler:
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), unit_length=HOUR)
+    sched.build_model()
+    assert sched.solve() == cp_model.OPTIMAL
+    sched.materialize()
+    return sched
+
+
+def test_single_interval_over_merged_windows():
+    task = make_multi([(10, 13), (1, 2), (4, 6), (5, 8)])
+    [interval] = task.get_intervals(START, END)
+    assert interval.allowed_windows == [(at(4), at(8)), (at(10), at(13))], "Short windows drop, touching ones merge"
+    assert interval.start_interval == (at(4), at(11)) and interval.end_interval == (at(6), at(13))
+    reloaded = MultiWindowTask.model_validate_json(task.model_dump_json())
+    assert reloaded.container.intervals[0].allowed_windows == interval.allowed_windows
+    with pytest.raises(ValueError):
+        make_multi([(0, 1)])
+
+
+def test_solver_uses_the_next_window_when_the_first_is_taken():
+    pool = ViviaTaskPool(id=5000)
+    task = make_multi([(2, 5), (8, 10), (14, 20)])
+    pool.add_task(task, group_name="all")
+    pool.add_task(blocker(2, 5), group_name="all")
+    pool.add_task(blocker(8, 9), group_name="all")
+    pool.constraints.append(NoOverlapConstraint(group_name="all"))
+    sched = solve(pool)
+    real = task.container.intervals[0].actual_interval
+    assert (real.start, real.end) == (at(14), at(16)), "Only the third window has room"
+    proto = sched.model.Proto()
+    start_domain = list(proto.variables[task.container.intervals[0]._cp_model_vars.start.Index()].domain)
+    assert start_domain == [2, 3, 8, 8, 14, 18]
+
+
+def test_varying_duration_never_straddles_a_hole():
+    pool = ViviaTaskPool(id=5001)
+    task = make_multi([(0, 3), (4, 10)], hours=(2, 6))
+    pool.add_task(task, group_name="all")
+    pool.constraints.append(NoOverlapConstraint(group_name="all"))
+    # The longest fitting placement is wanted, so without the hole intervals 0..6 would win
+    sched = ViviaScheduler(task_pool=pool, schedule_range=(START, END), unit_length=HOUR, isolated_fast_path=False)
+    sched.build_model()
+    interval = task.container.intervals[0]
+    duration = sched.model.NewIntVar(0, 24, "duration")
+    sched.model.Add(duration == interval._cp_model_vars.end - interval._cp_model_vars.start)
+    sched.model.Maximize(duration)
+    assert sched.solver.Solve(sched.model) == cp_model.OPTIMAL
+    start, end = sched.solver.Value(interval._cp_model_vars.start), sched.solver.Value(interval._cp_model_vars.end)
+    assert (start, end) == (4, 10)
+
+
+def test_greedy_insert_skips_the_holes():
+    pool = ViviaTaskPool(id=5002)
+    pool.add_task(blocker(0, 3), group_name="all")
+    pool.constraints.append(NoOverlapConstraint(group_name="all"))
+    sched = solve(pool)
+    stored = StoredSchedule(schedule_range=(START, END), unit_length=HOUR, assignment=sched._current_assignment())
+    task = make_multi([(1, 4), (6, 9)], hours=(2, 2))
+    pool.add_task(task, group_name="all")
+    result = insert_task(pool, task, stored)
+    assert result.method == "greedy"
+    [interval] = result.intervals[str(task.id)]
+    assert (interval.actual_interval.start, interval.actual_interval.end) == (at(6), at(8))
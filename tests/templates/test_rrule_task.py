@@ -0,0 +1,93 @@
+import datetime as DT
+import uuid
+
+import pytest
+
+from vivia_v4.task_pool import ViviaTaskPool
+from vivia_v4.templates import RRuleTask
+from helpers import START
+
+UTC = DT.timezone.utc
+
+
+def make_rrule(**kwargs):
+    fields = dict(name="r", mandatory=False, priority=1, dtstart=START,
+                  start_interval=(DT.timedelta(hours=9), DT.timedelta(hours=10)),
+                  end_interval=(DT.timedelta(hours=10), DT.timedelta(hours=12)),
+                  duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=2)))
+    fields.update(kwargs)
+    return RRuleTask(**fields)
+
+
+def days(intervals):
+    return [i.start_interval[0].date() for i in intervals]
+
+
+def test_second_tuesday_of_each_month():
+    t = make_rrule(freq="monthly", byweekday=["2TU"])
+    got = days(t.get_intervals(START, DT.datetime(2024, 7, 1, tzinfo=UTC)))
+    assert got == [DT.date(2024, 1, 9), DT.date(2024, 2, 13), DT.date(2024, 3, 12),
+                   DT.date(2024, 4, 9), DT.date(2024, 5, 14), DT.date(2024, 6, 11)]
+    last_friday = make_rrule(freq="monthly", byweekday=["-1FR"], interval=2)
+    assert days(last_friday.get_intervals(START, DT.datetime(2024, 7, 1, tzinfo=UTC))) == \
+        [DT.date(2024, 1, 26), DT.date(2024, 3, 29), DT.date(2024, 5, 31)]
+
+
+def test_weekdays_except_holidays():
+    t = make_rrule(freq="weekly", byweekday=["MO", "TU", "WE", "TH", "FR"],
+                   exdates=[DT.date(2024, 1, 1), DT.date(2024, 1, 15)])
+    got = days(t.get_intervals(START, DT.datetime(2024, 1, 20, tzinfo=UTC)))
+    assert len(got) == 13
+    assert DT.date(2024, 1, 1) not in got and DT.date(2024, 1, 15) not in got
+    assert all(d.weekday() < 5 for d in got)
+
+
+def test_month_days_and_daily_interval():
+    t = make_rrule(freq="monthly", bymonthday=[31, -1])
+    assert days(t.get_intervals(START, DT.datetime(2024, 5, 1, tzinfo=UTC))) == \
+        [DT.date(2024, 1, 31), DT.date(2024, 2, 29), DT.date(2024, 3, 31), DT.date(2024, 4, 30)]
+    every_third = make_rrule(freq="daily", interval=3, until=DT.datetime(2024, 1, 12, tzinfo=UTC))
+    assert days(every_third.get_intervals(START, DT.datetime(2024, 2, 1, tzinfo=UTC))) == \
+        [DT.date(2024, 1, d) for d in (1, 4, 7, 10)]
+
+
+def test_window_far_from_dtstart_and_partial_days():
+    t = make_rrule(freq="daily", interval=2)
+    window = (DT.datetime(2030, 6, 2, 9, 30, tzinfo=UTC), DT.datetime(2030, 6, 8, 11, tzinfo=UTC))
+    got = t.get_intervals(*window)
+    assert days(got) == [DT.date(2030, 6, 4), DT.date(2030, 6, 6)], "Occurrences must lie fully inside the window"
+    assert all(window[0] <= i.start_interval[0] and i.end_interval[1] <= window[1] for i in got)
+
+
+def test_ids_are_deterministic_and_cached():
+    t = make_rrule(freq="weekly")
+    first = t.get_intervals(START, DT.datetime(2024, 2, 1, tzinfo=UTC))
+    assert t.get_intervals(START, DT.datetime(2024, 2, 1, tzinfo=UTC))[0] is first[0]
+    reloaded = RRuleTask.model_validate_json(t.model_dump_json())
+    again = reloaded.get_intervals(START, DT.datetime(2024, 2, 1, tzinfo=UTC))
+    assert [i.id for i in again] == [i.id for i in first]
+    assert first[0].id == uuid.uuid5(t.id, "2024-01-01")
+    assert all(i._source_task_id == t.id for i in again)
+
+
+def test_calendar_zone_keeps_local_time():
+    from zoneinfo import ZoneInfo
+    tz = ZoneInfo("Europe/Berlin")
+    t = make_rrule(freq="daily", dtstart=DT.datetime(2024, 3, 29, tzinfo=tz), calendar_zone="Europe/Berlin")
+    got = t.get_intervals(DT.datetime(2024, 3, 29, tzinfo=tz), DT.datetime(2024, 4, 2, tzinfo=tz))
+    assert [i.start_interval[0].astimezone(tz).hour for i in got] == [9, 9, 9, 9]
+    assert [i.start_interval[0].hour for i in got] == [8, 8, 7, 7]
+
+
+def test_rrule_task_in_pool_and_validation():
+    pool = ViviaTaskPool(id=1)
+    pool.add_task(make_rrule(freq="monthly", byweekday=["1MO"]))
+    reloaded = ViviaTaskPool.model_validate_json(pool.model_dump_json())
+    assert isinstance(reloaded.tasks[0], RRuleTask)
+    assert len(reloaded.get_intervals(START, DT.datetime(2024, 4, 1, tzinfo=UTC))[pool.tasks[0].id]) == 3
+    with pytest.raises(ValueError):
+        make_rrule(freq="weekly", byweekday=["2TU"])
+    with pytest.raises(ValueError):
+        make_rrule(freq="monthly", byweekday=["XX"])
+    with pytest.raises(ValueError):
+        make_rrule(freq="monthly", bymonthday=[0])
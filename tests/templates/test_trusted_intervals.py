@@ -0,0 +1,51 @@
+import datetime as DT
+
+from vivia_v4.templates import ExactDateTask, FixedPeriodTask, RelativePeriodItem, ScheduleInterval
+
+
+def test_trusted_interval_matches_validated_interval():
+    start = DT.datetime(2024, 1, 1, 8, tzinfo=DT.timezone.utc)
+    bounds = dict(start_interval=(start, start + DT.timedelta(hours=1)),
+                  end_interval=(start + DT.timedelta(hours=2), start + DT.timedelta(hours=4)),
+                  duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=3)))
+    trusted = ScheduleInterval.trusted(name="a", mandatory=True, priority=2, **bounds)
+    validated = ScheduleInterval(name="a", mandatory=True, priority=2, **bounds)
+    assert trusted.model_dump(exclude={"id"}) == validated.model_dump(exclude={"id"})
+    assert trusted.actual_interval.is_empty() and trusted._cp_model_vars.is_empty()
+    assert trusted.id != validated.id
+    assert ScheduleInterval.model_validate_json(trusted.model_dump_json()).model_dump() == trusted.model_dump()
+
+
+def test_templates_build_intervals_with_source_task():
+    anchor = DT.datetime(2024, 1, 1, tzinfo=DT.timezone.utc)
+    exact = ExactDateTask(name="e", mandatory=False, priority=1, repeatition=3,
+                          start_interval=(anchor, anchor), end_interval=(anchor, anchor + DT.timedelta(hours=2)),
+                          duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=2)))
+    assert [i._source_task_id for i in exact.container.intervals] == [exact.id] * 3
+    assert len({i.id for i in exact.container.intervals}) == 3
+
+    period = FixedPeriodTask(
+        name="p", mandatory=True, priority=1, period_unit_num=2, anchor_date=anchor,
+        effective_interval=(anchor, anchor + DT.timedelta(days=4)),
+        period_items=[RelativePeriodItem(active_index=1,
+                                         start_interval=(DT.timedelta(hours=8), DT.timedelta(hours=9)),
+                                         end_interval=(DT.timedelta(hours=10), DT.timedelta(hours=12)),
+                                         duration_interval=(DT.timedelta(hours=2), DT.timedelta(hours=3)))])
+    intervals = period.get_intervals(anchor, anchor + DT.timedelta(days=4))
+    assert [i.start_interval[0] for i in intervals] == [anchor + DT.timedelta(days=1, hours=8),
+                                                        anchor + DT.timedelta(days=3, hours=8)]
+    assert intervals[1].end_interval == (anchor + DT.timedelta(days=3, hours=10), anchor + DT.timedelta(days=3, hours=12))
+    assert all(i._source_task_id == period.id for i in intervals)
+    for i in intervals:
+        ScheduleInterval.model_validate(i.model_dump())
+
+
+def test_trusted_interval_accepts_assignment():
+    start = DT.datetime(2024, 1, 1, tzinfo=DT.timezone.utc)
+    interval = ScheduleInterval.trusted(name="a", mandatory=False, priority=0, start_interval=(start, start),
+                                        end_interval=(start, start + DT.timedelta(hours=1)),
+                                        duration_interval=(DT.timedelta(0), DT.timedelta(hours=1)))
+    interval.actual_interval = interval.actual_interval.set_interval(start, start + DT.timedelta(minutes=30))
+    interval.labels.add("x")
+    assert "actual_interval" in interval.model_fields_set
+    assert interval.model_copy(deep=True).actual_interval.duration == DT.timedelta(minutes=30)
@@ -6,6 +6,7 @@ import os
 
 from vivia_v4.api.main import app
 from vivia_v4.api.config import settings
+from vivia_v4.api.manager import PoolManager
 from vivia_v4.templates import ExactDateTask
 
 client = TestClient(app)
@@ -84,3 +85,33 @@ def test_admin_registration_flow():
 def test_auth_failure():
     resp = client.post("/tasks/create", headers={"X-API-Key": "INVALID"}, json={})
     assert resp.status_code == 401
+
+def test_rejected_insert_leaves_the_pool_unchanged():
+    email = f"insert_user_{uuid.uuid4()}@example.com"
+    user_data = client.post("/auth/admin/register", json={
+        "email": email,
+        "admin_secret": settings.admin_secret
+    }).json()
+    headers = {"X-API-Key": user_data["api_key"]}
+
+    anchor = DT.datetime(2024, 1, 1, tzinfo=DT.timezone.utc)
+    end = anchor + DT.timedelta(hours=1)
+    def exact_task(name):
+        return ExactDateTask(name=name, mandatory=True, priority=1, repeatition=1,
+                             start_interval=(anchor, anchor), end_interval=(end, end),
+                             duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=1)))
+
+    assert client.post("/tasks/create", headers=headers,
+                       json=exact_task("first").model_dump(mode='json')).status_code == 200
+    resp_solve = client.post("/scheduler/solve", headers=headers, json={
+        "start": "2024-01-01T00:00:00Z",
+        "end": "2024-01-02T00:00:00Z"
+    })
+    assert resp_solve.status_code == 200
+
+    # A second mandatory task at the same hour overlaps the first in the default group
+    clash = exact_task("clash")
+    resp_insert = client.post("/tasks/insert", headers=headers, json=clash.model_dump(mode='json'))
+    assert resp_insert.status_code == 409
+    pool = PoolManager.load_pool(user_data["user_id"])
+    assert [t.name for t in pool.tasks] == ["first"]
@@ -0,0 +1,46 @@
+import datetime as DT
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from vivia_v4.utils import CalendarPeriod
+
+
+@pytest.mark.parametrize("zone", ["America/New_York", "Europe/London", "Australia/Lord_Howe", "Asia/Kolkata"])
+def test_localize_matches_zoneinfo_fold_zero(zone):
+    tz = ZoneInfo(zone)
+    cal = CalendarPeriod(DT.datetime(2024, 1, 1, tzinfo=DT.timezone.utc), "day", 1, zone)
+    cal.prepare(DT.datetime(2024, 1, 1, tzinfo=DT.timezone.utc), DT.datetime(2025, 1, 1, tzinfo=DT.timezone.utc))
+    for day in range(366):
+        for minute in range(0, 1440, 10):
+            local = DT.datetime(2024, 1, 1) + DT.timedelta(days=day, minutes=minute)
+            assert cal.localize(local) == (local - tz.utcoffset(local)).replace(tzinfo=DT.timezone.utc)
+
+
+def test_daily_periods_keep_wall_clock_across_dst():
+    tz = ZoneInfo("America/New_York")
+    cal = CalendarPeriod(DT.datetime(2024, 3, 8, 8, tzinfo=tz), "day", 1, "America/New_York")
+    before = cal.get_period(DT.datetime(2024, 3, 9, 12, tzinfo=tz))
+    after = cal.get_period(DT.datetime(2024, 3, 11, 12, tzinfo=tz))
+    assert before[0].hour == 13 and after[0].hour == 12
+    assert before[1] - before[0] == DT.timedelta(hours=23), "The period over the spring change is an hour short"
+    assert cal.index_of(DT.datetime(2024, 3, 10, 7, 59, tzinfo=tz)) == 1
+
+
+def test_month_periods_clamp_to_month_end():
+    cal = CalendarPeriod(DT.datetime(2024, 1, 31, 9, tzinfo=ZoneInfo("Europe/Berlin")), "month", 1, "Europe/Berlin")
+    assert [cal.local_start(k).date() for k in range(4)] == \
+        [DT.date(2024, 1, 31), DT.date(2024, 2, 29), DT.date(2024, 3, 31), DT.date(2024, 4, 30)]
+    assert cal.index_of(DT.datetime(2024, 3, 31, 8, tzinfo=ZoneInfo("Europe/Berlin"))) == 1
+    assert cal.index_of(DT.datetime(2024, 3, 31, 9, tzinfo=ZoneInfo("Europe/Berlin"))) == 2
+    quarterly = CalendarPeriod(DT.datetime(2024, 2, 1, tzinfo=DT.timezone.utc), "month", 3, "UTC")
+    assert quarterly.get_period(DT.datetime(2024, 6, 15, tzinfo=DT.timezone.utc)) == \
+        (DT.datetime(2024, 5, 1, tzinfo=DT.timezone.utc), DT.datetime(2024, 8, 1, tzinfo=DT.timezone.utc))
+
+
+def test_rejects_unknown_zone_and_unit():
+    anchor = DT.datetime(2024, 1, 1, tzinfo=DT.timezone.utc)
+    with pytest.raises(ValueError):
+        CalendarPeriod(anchor, "day", 1, "Nowhere/Town")
+    with pytest.raises(ValueError):
+        CalendarPeriod(anchor, "year", 1, "UTC")
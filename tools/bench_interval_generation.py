@@ -0,0 +1,82 @@
+"""
+Times interval generation by the templates against building the same intervals with the validating
+ScheduleInterval constructor and with ScheduleInterval.trusted.
+
+    python tools/bench_interval_generation.py [--days 365] [--items 3] [--repeat 5]
+"""
+import argparse
+import datetime as DT
+import time
+from collections.abc import Callable
+
+from vivia_v4.templates import ExactDateTask, FixedPeriodTask, RelativePeriodItem, ScheduleInterval
+
+
+def make_task(days: int, items: int) -> FixedPeriodTask:
+    anchor = DT.datetime(2024, 1, 1, tzinfo=DT.timezone.utc)
+    return FixedPeriodTask(
+        name="bench", mandatory=False, priority=1, period_unit_num=1, anchor_date=anchor,
+        effective_interval=(anchor, anchor + DT.timedelta(days=days)),
+        period_items=[
+            RelativePeriodItem(active_index=0,
+                               start_interval=(DT.timedelta(hours=2 + 6 * k), DT.timedelta(hours=3 + 6 * k)),
+                               end_interval=(DT.timedelta(hours=4 + 6 * k), DT.timedelta(hours=6 + 6 * k)),
+                               duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=2)))
+            for k in range(items)
+        ],
+    )
+
+
+def validated_copies(intervals: list[ScheduleInterval]) -> list[ScheduleInterval]:
+    return [ScheduleInterval(name=i.name, mandatory=i.mandatory, priority=i.priority,
+                             start_interval=i.start_interval, end_interval=i.end_interval,
+                             duration_interval=i.duration_interval) for i in intervals]
+
+
+def trusted_copies(intervals: list[ScheduleInterval]) -> list[ScheduleInterval]:
+    return [ScheduleInterval.trusted(name=i.name, mandatory=i.mandatory, priority=i.priority,
+                                     start_interval=i.start_interval, end_interval=i.end_interval,
+                                     duration_interval=i.duration_interval) for i in intervals]
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--items", type=int, default=3)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    task = make_task(args.days, args.items)
+    span = task.effective_interval
+
+    def generate() -> None:
+        make_task(args.days, args.items).get_intervals(*span)
+
+    intervals = task.get_intervals(*span)
+    anchor = span[0]
+    exact = dict(name="exact", mandatory=False, priority=1, repeatition=len(intervals),
+                 start_interval=(anchor, anchor), end_interval=(anchor, anchor + DT.timedelta(hours=2)),
+                 duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=2)))
+
+    rows = [
+        ("FixedPeriodTask.get_intervals", best_of(args.repeat, generate)),
+        ("validating constructor, same intervals", best_of(args.repeat, lambda: validated_copies(intervals))),
+        ("ScheduleInterval.trusted, same intervals", best_of(args.repeat, lambda: trusted_copies(intervals))),
+        ("ExactDateTask, same count", best_of(args.repeat, lambda: ExactDateTask(**exact))),
+    ]
+    print(f"{len(intervals)} intervals, best of {args.repeat}")
+    for label, seconds in rows:
+        print(f"{label:42s} {seconds * 1e3:9.2f} ms  {len(intervals) / seconds:12.0f} intervals/s")
+
+
+if __name__ == "__main__":
+    main()
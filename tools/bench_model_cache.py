@@ -0,0 +1,74 @@
+"""
+Times building a model against hitting the model cache in memory and on disk, for a pool of
+tasks in one NoOverlap group.
+
+    python tools/bench_model_cache.py [--tasks 300] [--repeatition 10] [--repeat 5]
+"""
+import argparse
+import datetime as DT
+import tempfile
+import time
+from collections.abc import Callable
+
+from vivia_v4.constraints import NoOverlapConstraint
+from vivia_v4.model_cache import ModelCache
+from vivia_v4.scheduler import ViviaScheduler
+from vivia_v4.task_pool import ViviaTaskPool
+from vivia_v4.templates import ExactDateTask
+
+START = DT.datetime(2024, 1, 1, tzinfo=DT.timezone.utc)
+END = START + DT.timedelta(days=30)
+
+
+def make_pool(tasks: int, repeatition: int) -> ViviaTaskPool:
+    pool = ViviaTaskPool(id=1)
+    for k in range(tasks):
+        pool.add_task(ExactDateTask(
+            name=f"task{k}", mandatory=False, priority=1 + k % 3, repeatition=repeatition,
+            start_interval=(START, END - DT.timedelta(hours=2)), end_interval=(START + DT.timedelta(hours=1), END),
+            duration_interval=(DT.timedelta(hours=1), DT.timedelta(hours=2)),
+        ), group_name="all")
+    pool.constraints.append(NoOverlapConstraint(group_name="all"))
+    return pool
+
+
+def build(pool: ViviaTaskPool, cache: ModelCache | None) -> None:
+    ViviaScheduler(task_pool=pool, schedule_range=(START, END), model_cache=cache).build_model()
+
+
+def best_of(repeat: int, fn: Callable[[], object]) -> float:
+    times = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - t0)
+    return min(times)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--tasks", type=int, default=300)
+    parser.add_argument("--repeatition", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    pool = make_pool(args.tasks, args.repeatition)
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ModelCache(directory=directory)
+        build(pool, cache)
+
+        def disk_hit() -> None:
+            build(pool, ModelCache(directory=directory))
+
+        rows = [
+            ("build, no cache", best_of(args.repeat, lambda: build(pool, None))),
+            ("memory hit", best_of(args.repeat, lambda: build(pool, cache))),
+            ("disk hit", best_of(args.repeat, disk_hit)),
+        ]
+    print(f"{args.tasks * args.repeatition} intervals, best of {args.repeat}")
+    for label, seconds in rows:
+        print(f"{label:16s} {seconds * 1e3:9.2f} ms")
+
+
+if __name__ == "__main__":
+    main()